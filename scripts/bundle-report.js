@@ -0,0 +1,189 @@
+#!/usr/bin/env node
+/**
+ * 构建产物体积报告 - 在 react-scripts build 之后运行
+ *
+ * 统计首屏入口和各页面代码块（gzip后）的体积，与 scripts/bundle-budgets.json 中的预算比较，
+ * 超出预算时以非零状态码退出，使 npm run build 失败。
+ * 报告同时写入 build/bundle-report.json。
+ *
+ * 设置 BUNDLE_BUDGET_WARN_ONLY=true 时只输出警告，不中断构建。
+ */
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const ROOT = path.resolve(__dirname, '..');
+const BUILD_DIR = path.join(ROOT, 'build');
+const BUDGET_FILE = path.join(__dirname, 'bundle-budgets.json');
+const WARN_ONLY = process.env.BUNDLE_BUDGET_WARN_ONLY === 'true';
+
+const toKB = (bytes) => Math.round((bytes / 1024) * 10) / 10;
+
+const gzipSize = (file) => zlib.gzipSync(fs.readFileSync(file), { level: 9 }).length;
+
+// 读取 static/js 或 static/css 下的产物，文件名形如 <name>.<hash>.chunk.js
+const readAssets = (type) => {
+  const dir = path.join(BUILD_DIR, 'static', type);
+  if (!fs.existsSync(dir)) return [];
+
+  return fs.readdirSync(dir)
+    .filter(file => file.endsWith(`.${type}`))
+    .map(file => {
+      const fullPath = path.join(dir, file);
+      const asset = {
+        file: `static/${type}/${file}`,
+        name: file.split('.')[0],
+        ids: [],
+        size: fs.statSync(fullPath).size,
+        gzip: gzipSize(fullPath)
+      };
+
+      if (type === 'js') {
+        // 异步代码块以 (self.webpackChunk...).push([[id,...], {...}]) 开头
+        const head = fs.readFileSync(fullPath, 'utf8').slice(0, 300);
+        const match = head.match(/\.push\(\[\[([\d,]+)\]/);
+        if (match) {
+          asset.ids = match[1].split(',').map(Number);
+        }
+      }
+      if (asset.ids.length === 0 && /^\d+$/.test(asset.name)) {
+        asset.ids = [Number(asset.name)];
+      }
+      return asset;
+    });
+};
+
+// 从 import() 编译结果中提取一起加载的代码块，如 Promise.all([r.e(123),r.e(45)]).then(...)
+const collectLoadGroups = (jsAssets) => {
+  const groups = [];
+  jsAssets.forEach(asset => {
+    const source = fs.readFileSync(path.join(BUILD_DIR, asset.file), 'utf8');
+
+    const multiple = /Promise\.all\(\[((?:[\w$]+\.e\(\d+\),?)+)\]\)/g;
+    let match;
+    while ((match = multiple.exec(source)) !== null) {
+      groups.push((match[1].match(/\d+/g) || []).map(Number));
+    }
+
+    const single = /[\w$]+\.e\((\d+)\)\.then/g;
+    while ((match = single.exec(source)) !== null) {
+      groups.push([Number(match[1])]);
+    }
+  });
+  return groups;
+};
+
+const main = () => {
+  const manifestFile = path.join(BUILD_DIR, 'asset-manifest.json');
+  if (!fs.existsSync(manifestFile)) {
+    console.error('❌ 未找到 build/asset-manifest.json，请先运行 react-scripts build');
+    process.exit(1);
+  }
+
+  const manifest = JSON.parse(fs.readFileSync(manifestFile, 'utf8'));
+  const budgets = JSON.parse(fs.readFileSync(BUDGET_FILE, 'utf8'));
+
+  const jsAssets = readAssets('js');
+  const cssAssets = readAssets('css');
+  const allAssets = [...jsAssets, ...cssAssets];
+
+  const entrypoints = new Set((manifest.entrypoints || []).map(file => file.replace(/^\//, '')));
+  const initialAssets = allAssets.filter(asset => entrypoints.has(asset.file));
+  const initialGzip = initialAssets.reduce((total, asset) => total + asset.gzip, 0);
+
+  const groups = collectLoadGroups(jsAssets);
+  const idOf = (asset) => asset.ids[0];
+
+  // 每个页面需要的代码块ID：包含页面代码块ID的所有加载组的并集
+  const routeChunkIds = {};
+  jsAssets.filter(asset => asset.name.startsWith('page-')).forEach(asset => {
+    const ids = new Set(asset.ids);
+    groups.filter(group => group.some(id => ids.has(id))).forEach(group => {
+      group.forEach(id => ids.add(id));
+    });
+    routeChunkIds[asset.name] = ids;
+  });
+
+  // 样式文件按ID或代码块名称归属
+  const assetsForIds = (ids, routeName) => allAssets.filter(asset =>
+    !entrypoints.has(asset.file) &&
+    ((asset.ids.length > 0 && ids.has(idOf(asset))) || asset.name === routeName)
+  );
+
+  const routes = Object.entries(routeChunkIds).map(([name, ids]) => {
+    const assets = assetsForIds(ids, name);
+    return {
+      name,
+      files: assets.map(asset => asset.file),
+      gzip: assets.reduce((total, asset) => total + asset.gzip, 0)
+    };
+  });
+
+  // 只被AI问答页面使用的拆分块，即聊天和markdown相关的第三方依赖
+  const chatIds = routeChunkIds['page-ai-chat'] || new Set();
+  const otherIds = new Set();
+  Object.entries(routeChunkIds)
+    .filter(([name]) => name !== 'page-ai-chat')
+    .forEach(([, ids]) => ids.forEach(id => otherIds.add(id)));
+  const chatVendorAssets = jsAssets.filter(asset =>
+    !asset.name.startsWith('page-') && chatIds.has(idOf(asset)) && !otherIds.has(idOf(asset))
+  );
+  const chatVendorGzip = chatVendorAssets.reduce((total, asset) => total + asset.gzip, 0);
+
+  // 与预算比较
+  const rows = [];
+  const failures = [];
+  const check = (label, gzip, budgetKB) => {
+    const kb = toKB(gzip);
+    const exceeded = budgetKB !== undefined && kb > budgetKB;
+    rows.push({ 项目: label, 'gzip(KB)': kb, '预算(KB)': budgetKB ?? '-', 状态: exceeded ? '❌ 超出' : '✅' });
+    if (exceeded) failures.push(`${label}: ${kb}KB > ${budgetKB}KB`);
+  };
+
+  check('首屏入口 (initial)', initialGzip, budgets.initial);
+  routes
+    .sort((a, b) => a.name.localeCompare(b.name))
+    .forEach(route => check(`页面 ${route.name}`, route.gzip, budgets.routes?.[route.name]));
+  check('聊天依赖 (chatVendor)', chatVendorGzip, budgets.chatVendor);
+
+  Object.keys(budgets.routes || {}).forEach(name => {
+    if (!routeChunkIds[name]) {
+      console.warn(`⚠️ 预算中的页面代码块 ${name} 未出现在构建产物中`);
+    }
+  });
+
+  console.log('\n📦 构建产物体积报告');
+  console.table(rows);
+
+  const report = {
+    generatedAt: new Date().toISOString(),
+    initial: {
+      gzipKB: toKB(initialGzip),
+      files: initialAssets.map(asset => asset.file)
+    },
+    routes: routes.map(route => ({ ...route, gzipKB: toKB(route.gzip) })),
+    chatVendor: {
+      gzipKB: toKB(chatVendorGzip),
+      files: chatVendorAssets.map(asset => asset.file)
+    },
+    assets: allAssets
+      .sort((a, b) => b.gzip - a.gzip)
+      .map(asset => ({ file: asset.file, sizeKB: toKB(asset.size), gzipKB: toKB(asset.gzip) })),
+    budgets,
+    failures
+  };
+  fs.writeFileSync(path.join(BUILD_DIR, 'bundle-report.json'), JSON.stringify(report, null, 2));
+  console.log('📝 详细报告已写入 build/bundle-report.json');
+
+  if (failures.length > 0) {
+    console.error(`\n❌ ${failures.length} 项超出体积预算:`);
+    failures.forEach(failure => console.error(`  - ${failure}`));
+    if (!WARN_ONLY) {
+      process.exit(1);
+    }
+  } else {
+    console.log('✅ 全部体积预算检查通过');
+  }
+};
+
+main();
@@ -0,0 +1,190 @@
+#!/usr/bin/env node
+/**
+ * 分片上传本地服务 - 在后端尚未提供分片接口时用于本地联调
+ *
+ * 实现前端 src/services/chunkedUpload.ts 使用的三个接口，返回与后端一致的 AjaxResult 格式：
+ *   POST /api/file/chunk/init       初始化上传，返回 uploadId 和已上传的分片；文件已存在时直接返回 url
+ *   PUT  /api/file/chunk?uploadId=&index=   上传单个分片，请求体为分片二进制
+ *   POST /api/file/chunk/complete   合并分片，返回文件 url
+ * 合并后的文件通过 GET /files/<fileHash>/<fileName> 访问。
+ *
+ * 使用方法：
+ *   node scripts/chunk-upload-server.js
+ *   REACT_APP_CHUNK_UPLOAD_BASE_URL=http://localhost:8090/api npm start
+ *
+ * 环境变量：
+ *   PORT               监听端口，默认 8090
+ *   UPLOAD_DIR         文件存放目录，默认系统临时目录下的 mining-safety-chunks
+ *   CHUNK_FAIL_RATE    分片请求随机失败的概率（0-1），用于验证前端重试
+ *   CHUNK_DELAY_MS     每个分片的额外延迟，用于模拟慢速网络
+ */
+const http = require('http');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const crypto = require('crypto');
+
+const PORT = Number(process.env.PORT || 8090);
+const UPLOAD_DIR = process.env.UPLOAD_DIR || path.join(os.tmpdir(), 'mining-safety-chunks');
+const FAIL_RATE = Number(process.env.CHUNK_FAIL_RATE || 0);
+const DELAY_MS = Number(process.env.CHUNK_DELAY_MS || 0);
+
+const CHUNK_DIR = path.join(UPLOAD_DIR, 'chunks');
+const FILE_DIR = path.join(UPLOAD_DIR, 'files');
+const INDEX_FILE = path.join(UPLOAD_DIR, 'index.json');
+
+fs.mkdirSync(CHUNK_DIR, { recursive: true });
+fs.mkdirSync(FILE_DIR, { recursive: true });
+
+// fileHash -> { uploadId, fileName, chunkCount, url? }，保存到磁盘以便重启后继续上传
+const index = fs.existsSync(INDEX_FILE) ? JSON.parse(fs.readFileSync(INDEX_FILE, 'utf8')) : {};
+const saveIndex = () => fs.writeFileSync(INDEX_FILE, JSON.stringify(index, null, 2));
+
+const findByUploadId = (uploadId) =>
+  Object.keys(index).map(fileHash => ({ fileHash, ...index[fileHash] })).find(entry => entry.uploadId === uploadId);
+
+const chunkPath = (uploadId, chunkIndex) => path.join(CHUNK_DIR, uploadId, String(chunkIndex));
+
+const listUploadedChunks = (uploadId) => {
+  const dir = path.join(CHUNK_DIR, uploadId);
+  return fs.existsSync(dir) ? fs.readdirSync(dir).map(Number).filter(Number.isInteger).sort((a, b) => a - b) : [];
+};
+
+const send = (res, status, body) => {
+  res.writeHead(status, { 'Content-Type': 'application/json; charset=utf-8' });
+  res.end(JSON.stringify(body));
+};
+const ok = (res, data) => send(res, 200, { code: 200, msg: '操作成功', data });
+const fail = (res, msg, status = 200) => send(res, status, { code: 500, msg, data: null });
+
+const readBody = (req) => new Promise((resolve, reject) => {
+  const chunks = [];
+  req.on('data', chunk => chunks.push(chunk));
+  req.on('end', () => resolve(Buffer.concat(chunks)));
+  req.on('error', reject);
+});
+
+const readJson = async (req) => JSON.parse((await readBody(req)).toString('utf8') || '{}');
+
+const handleInit = async (req, res, baseUrl) => {
+  const { fileHash, fileName, chunkCount } = await readJson(req);
+  if (!fileHash || !fileName || !chunkCount) {
+    return fail(res, '缺少 fileHash、fileName 或 chunkCount');
+  }
+
+  const entry = index[fileHash];
+  if (entry?.url && fs.existsSync(path.join(FILE_DIR, fileHash))) {
+    console.log(`⚡ 秒传 ${fileName}`);
+    return ok(res, { uploadId: entry.uploadId, uploadedChunks: [], url: `${baseUrl}${entry.url}` });
+  }
+
+  const uploadId = entry?.uploadId || crypto.randomUUID();
+  index[fileHash] = { uploadId, fileName, chunkCount };
+  saveIndex();
+
+  const uploadedChunks = listUploadedChunks(uploadId);
+  console.log(`📁 初始化上传 ${fileName}：${uploadedChunks.length}/${chunkCount} 个分片已存在`);
+  return ok(res, { uploadId, uploadedChunks });
+};
+
+const handleChunk = async (req, res, url) => {
+  const uploadId = url.searchParams.get('uploadId');
+  const chunkIndex = Number(url.searchParams.get('index'));
+  const entry = uploadId && findByUploadId(uploadId);
+  if (!entry || !Number.isInteger(chunkIndex) || chunkIndex < 0 || chunkIndex >= entry.chunkCount) {
+    return fail(res, '无效的 uploadId 或分片序号');
+  }
+
+  const body = await readBody(req);
+  if (DELAY_MS > 0) {
+    await new Promise(resolve => setTimeout(resolve, DELAY_MS));
+  }
+  if (Math.random() < FAIL_RATE) {
+    console.log(`💥 模拟分片 ${chunkIndex} 失败`);
+    return fail(res, '模拟的分片上传失败', 503);
+  }
+
+  fs.mkdirSync(path.dirname(chunkPath(uploadId, chunkIndex)), { recursive: true });
+  // 先写临时文件再重命名，避免中断时留下不完整的分片
+  const tmp = `${chunkPath(uploadId, chunkIndex)}.part`;
+  fs.writeFileSync(tmp, body);
+  fs.renameSync(tmp, chunkPath(uploadId, chunkIndex));
+  return ok(res, { index: chunkIndex, size: body.length });
+};
+
+const handleComplete = async (req, res, baseUrl) => {
+  const { uploadId, fileHash } = await readJson(req);
+  const entry = index[fileHash];
+  if (!entry || entry.uploadId !== uploadId) {
+    return fail(res, '上传任务不存在');
+  }
+
+  const uploadedChunks = listUploadedChunks(uploadId);
+  if (uploadedChunks.length !== entry.chunkCount) {
+    return fail(res, `分片不完整：${uploadedChunks.length}/${entry.chunkCount}`);
+  }
+
+  const target = path.join(FILE_DIR, fileHash);
+  const fd = fs.openSync(`${target}.part`, 'w');
+  for (let i = 0; i < entry.chunkCount; i++) {
+    fs.writeSync(fd, fs.readFileSync(chunkPath(uploadId, i)));
+  }
+  fs.closeSync(fd);
+  fs.renameSync(`${target}.part`, target);
+  fs.rmSync(path.join(CHUNK_DIR, uploadId), { recursive: true, force: true });
+
+  entry.url = `/files/${fileHash}/${encodeURIComponent(entry.fileName)}`;
+  saveIndex();
+  console.log(`✅ 合并完成 ${entry.fileName}`);
+  return ok(res, { url: `${baseUrl}${entry.url}` });
+};
+
+const handleFile = (res, pathname) => {
+  const [, , fileHash, fileName] = pathname.split('/');
+  const file = fileHash && path.join(FILE_DIR, path.basename(fileHash));
+  if (!file || !fs.existsSync(file)) {
+    return fail(res, '文件不存在', 404);
+  }
+  res.writeHead(200, {
+    'Content-Type': 'application/octet-stream',
+    'Content-Disposition': `inline; filename*=UTF-8''${fileName || fileHash}`
+  });
+  fs.createReadStream(file).pipe(res);
+};
+
+const server = http.createServer(async (req, res) => {
+  res.setHeader('Access-Control-Allow-Origin', req.headers.origin || '*');
+  res.setHeader('Access-Control-Allow-Methods', 'GET,POST,PUT,OPTIONS');
+  res.setHeader('Access-Control-Allow-Headers', req.headers['access-control-request-headers'] || '*');
+  if (req.method === 'OPTIONS') {
+    res.writeHead(204);
+    return res.end();
+  }
+
+  const url = new URL(req.url, `http://${req.headers.host}`);
+  const baseUrl = `http://${req.headers.host}`;
+
+  try {
+    if (req.method === 'POST' && url.pathname === '/api/file/chunk/init') {
+      return await handleInit(req, res, baseUrl);
+    }
+    if (req.method === 'PUT' && url.pathname === '/api/file/chunk') {
+      return await handleChunk(req, res, url);
+    }
+    if (req.method === 'POST' && url.pathname === '/api/file/chunk/complete') {
+      return await handleComplete(req, res, baseUrl);
+    }
+    if (req.method === 'GET' && url.pathname.startsWith('/files/')) {
+      return handleFile(res, url.pathname);
+    }
+    return fail(res, '接口不存在', 404);
+  } catch (error) {
+    console.error('❌ 请求处理失败:', error);
+    return fail(res, error.message, 500);
+  }
+});
+
+server.listen(PORT, () => {
+  console.log(`🚀 分片上传本地服务已启动: http://localhost:${PORT}/api`);
+  console.log(`📂 文件目录: ${UPLOAD_DIR}`);
+});
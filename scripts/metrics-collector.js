@@ -0,0 +1,209 @@
+#!/usr/bin/env node
+/**
+ * 性能指标本地采集服务 - 接收前端 src/services/metrics.ts 通过 sendBeacon 批量上报的指标
+ *
+ * 每批数据是上次上报以来的增量直方图和计数器，按 指标名+标签 累加分桶后即可得到全局分位数：
+ *   POST /metrics       接收一批指标（text/plain，内容为JSON）
+ *   GET  /metrics       返回聚合后的结果（次数、平均值、P50/P95/P99、最大值）
+ *   DELETE /metrics     清空聚合结果
+ *
+ * 使用方法：
+ *   node scripts/metrics-collector.js
+ *   REACT_APP_METRICS_ENDPOINT=http://localhost:8091/metrics npm start
+ *
+ * 环境变量：
+ *   PORT             监听端口，默认 8091
+ *   METRICS_FILE     原始批次追加写入的文件（每行一个JSON），默认不写入
+ *   PRINT_INTERVAL   控制台打印汇总的间隔（毫秒），默认 30000，0 表示不打印
+ */
+const http = require('http');
+const fs = require('fs');
+
+const PORT = Number(process.env.PORT || 8091);
+const METRICS_FILE = process.env.METRICS_FILE || '';
+const PRINT_INTERVAL = Number(process.env.PRINT_INTERVAL ?? 30000);
+const MAX_BODY_SIZE = 1024 * 1024;
+
+// "name|label" -> { name, label, count, sum, min, max, buckets }
+let histograms = new Map();
+// "name|label" -> { name, label, count }
+let counters = new Map();
+let bounds = [];
+let clients = new Set();
+let batchCount = 0;
+let startedAt = Date.now();
+let changedSincePrint = false;
+
+const keyOf = (name, label) => `${name}|${label}`;
+
+const mergeBatch = (batch) => {
+  if (Array.isArray(batch.bounds) && batch.bounds.length > 0) {
+    bounds = batch.bounds;
+  }
+  (batch.histograms || []).forEach(({ name, label = '', count, sum, min, max, buckets }) => {
+    const key = keyOf(name, label);
+    let entry = histograms.get(key);
+    if (!entry) {
+      entry = { name, label, count: 0, sum: 0, min: Infinity, max: 0, buckets: new Array(buckets.length).fill(0) };
+      histograms.set(key, entry);
+    }
+    entry.count += count;
+    entry.sum += sum;
+    entry.min = Math.min(entry.min, min);
+    entry.max = Math.max(entry.max, max);
+    buckets.forEach((value, index) => {
+      entry.buckets[index] = (entry.buckets[index] || 0) + value;
+    });
+  });
+  (batch.counters || []).forEach(({ name, label = '', count }) => {
+    const key = keyOf(name, label);
+    const entry = counters.get(key) || { name, label, count: 0 };
+    entry.count += count;
+    counters.set(key, entry);
+  });
+  if (batch.clientId) clients.add(batch.clientId);
+  batchCount++;
+  changedSincePrint = true;
+};
+
+// 与前端相同的分位数估算：桶内线性插值，并限制在实际最小值和最大值之间
+const percentile = (entry, q) => {
+  if (entry.count === 0) return 0;
+  const target = q * entry.count;
+  let cumulative = 0;
+  for (let i = 0; i < entry.buckets.length; i++) {
+    const bucketCount = entry.buckets[i];
+    if (bucketCount > 0 && cumulative + bucketCount >= target) {
+      const lower = i === 0 ? 0 : bounds[i - 1];
+      const upper = i < bounds.length ? bounds[i] : entry.max;
+      const estimate = lower + (upper - lower) * ((target - cumulative) / bucketCount);
+      return Math.min(entry.max, Math.max(entry.min, estimate));
+    }
+    cumulative += bucketCount;
+  }
+  return entry.max;
+};
+
+const round = (value) => Math.round(value * 10) / 10;
+
+const summarize = () => {
+  const durationMs = Date.now() - startedAt;
+  return {
+    startedAt,
+    durationMs,
+    batches: batchCount,
+    clients: clients.size,
+    histograms: [...histograms.values()]
+      .sort((a, b) => a.name.localeCompare(b.name) || a.label.localeCompare(b.label))
+      .map(entry => ({
+        name: entry.name,
+        label: entry.label,
+        count: entry.count,
+        avg: round(entry.sum / entry.count),
+        p50: round(percentile(entry, 0.5)),
+        p95: round(percentile(entry, 0.95)),
+        p99: round(percentile(entry, 0.99)),
+        max: round(entry.max)
+      })),
+    counters: [...counters.values()]
+      .sort((a, b) => a.name.localeCompare(b.name) || a.label.localeCompare(b.label))
+      .map(entry => ({
+        name: entry.name,
+        label: entry.label,
+        count: entry.count,
+        ratePerSecond: durationMs > 0 ? round((entry.count / durationMs) * 1000) : 0
+      }))
+  };
+};
+
+const reset = () => {
+  histograms = new Map();
+  counters = new Map();
+  clients = new Set();
+  batchCount = 0;
+  startedAt = Date.now();
+};
+
+const printSummary = () => {
+  if (!changedSincePrint) return;
+  changedSincePrint = false;
+  const summary = summarize();
+  console.log(`\n📊 ${new Date().toLocaleTimeString()} 共 ${summary.batches} 批，${summary.clients} 个客户端`);
+  if (summary.histograms.length > 0) {
+    console.table(Object.fromEntries(summary.histograms.map(({ name, label, ...rest }) => [`${name} ${label}`.trim(), rest])));
+  }
+  if (summary.counters.length > 0) {
+    console.table(Object.fromEntries(summary.counters.map(({ name, label, ...rest }) => [`${name} ${label}`.trim(), rest])));
+  }
+};
+
+const send = (res, status, body) => {
+  res.writeHead(status, { 'Content-Type': 'application/json; charset=utf-8' });
+  res.end(body === undefined ? '' : JSON.stringify(body));
+};
+
+const readBody = (req) => new Promise((resolve, reject) => {
+  const chunks = [];
+  let size = 0;
+  req.on('data', chunk => {
+    size += chunk.length;
+    if (size > MAX_BODY_SIZE) {
+      reject(new Error('请求体过大'));
+      req.destroy();
+      return;
+    }
+    chunks.push(chunk);
+  });
+  req.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+  req.on('error', reject);
+});
+
+const server = http.createServer(async (req, res) => {
+  res.setHeader('Access-Control-Allow-Origin', req.headers.origin || '*');
+  res.setHeader('Access-Control-Allow-Methods', 'GET,POST,DELETE,OPTIONS');
+  res.setHeader('Access-Control-Allow-Headers', req.headers['access-control-request-headers'] || '*');
+  if (req.method === 'OPTIONS') {
+    res.writeHead(204);
+    return res.end();
+  }
+
+  const { pathname } = new URL(req.url, `http://${req.headers.host}`);
+  if (pathname !== '/metrics') {
+    return send(res, 404, { msg: '接口不存在' });
+  }
+
+  try {
+    if (req.method === 'POST') {
+      const body = await readBody(req);
+      const batch = JSON.parse(body);
+      mergeBatch(batch);
+      if (METRICS_FILE) {
+        fs.appendFile(METRICS_FILE, `${JSON.stringify({ receivedAt: Date.now(), ...batch })}\n`, error => {
+          if (error) console.error('❌ 写入指标文件失败:', error.message);
+        });
+      }
+      return send(res, 204);
+    }
+    if (req.method === 'GET') {
+      return send(res, 200, summarize());
+    }
+    if (req.method === 'DELETE') {
+      reset();
+      return send(res, 204);
+    }
+    return send(res, 405, { msg: '不支持的请求方法' });
+  } catch (error) {
+    console.error('❌ 处理指标失败:', error.message);
+    return send(res, 400, { msg: error.message });
+  }
+});
+
+server.listen(PORT, () => {
+  console.log(`🚀 性能指标采集服务已启动: http://localhost:${PORT}/metrics`);
+  if (METRICS_FILE) {
+    console.log(`📂 原始批次写入: ${METRICS_FILE}`);
+  }
+  if (PRINT_INTERVAL > 0) {
+    setInterval(printSummary, PRINT_INTERVAL);
+  }
+});
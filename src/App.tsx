@@ -1,6 +1,6 @@
-import React, { useEffect } from 'react';
-import { BrowserRouter as Router, Routes, Route, Navigate } from 'react-router-dom';
-import { ConfigProvider, App as AntdApp } from 'antd';
+import React, { useEffect, useState, Suspense, lazy } from 'react';
+import { BrowserRouter as Router, Routes, Route, Navigate, useLocation } from 'react-router-dom';
+import { ConfigProvider, App as AntdApp, Spin } from 'antd';
 import zhCN from 'antd/locale/zh_CN';
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 
@@ -8,15 +8,23 @@ import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { antdTheme, cssVariables } from './config/theme';
 import { initRuntimeConfig } from './config/runtime';
 
-// 页面组件
-import LoginPage from './pages/Login';
-import DashboardPage from './pages/Dashboard/Dashboard';
-import NewAIChatPage from './pages/AIChat/NewAIChat';
-
-import FeedbackPage from './pages/Feedback/FeedbackPage';
-import DataDetailPage from './pages/DataDetail/DataDetailPage';
+// 页面组件 - 按路由懒加载
+import {
+  LoginPage,
+  DashboardPage,
+  NewAIChatPage,
+  FeedbackPage,
+  DataDetailPage,
+  prefetchRoutesOnIdle
+} from './routes';
+import { markStartup } from './reportWebVitals';
 
 import MainLayout from './components/Layout/MainLayout';
+import RenderProfiler from './components/Debug/RenderProfiler';
+
+// 性能调试面板只在打开时加载
+const MetricsPanel = lazy(() =>
+  import(/* webpackChunkName: "debug-metrics" */ './components/Debug/MetricsPanel'));
 
 // 状态管理
 import { useAuthStore } from './store/authStore';
@@ -31,9 +39,23 @@ const queryClient = new QueryClient({
   },
 });
 
+// 页面代码加载中的占位
+const PageLoading: React.FC = () => (
+  <div style={{
+    minHeight: '60vh',
+    display: 'flex',
+    alignItems: 'center',
+    justifyContent: 'center'
+  }}>
+    <Spin size="large" />
+  </div>
+);
+
 // 受保护的路由组件
 const ProtectedRoute: React.FC<{ children: React.ReactNode }> = ({ children }) => {
   const { isAuthenticated, isLoading, checkAuth } = useAuthStore();
+  // 按一级路径区分页面的渲染耗时，例如 ai-chat、data-detail
+  const pageId = useLocation().pathname.split('/')[1] || 'dashboard';
 
   useEffect(() => {
     // 只在未认证时检查认证状态，避免重复调用
@@ -60,7 +82,38 @@ const ProtectedRoute: React.FC<{ children: React.ReactNode }> = ({ children }) =
     return <Navigate to="/login" replace />;
   }
 
-  return <MainLayout>{children}</MainLayout>;
+  return (
+    <MainLayout>
+      <RenderProfiler id={pageId}>
+        <Suspense fallback={<PageLoading />}>{children}</Suspense>
+      </RenderProfiler>
+    </MainLayout>
+  );
+};
+
+// 性能调试面板 - 按 Ctrl+Shift+M 打开或关闭
+const MetricsPanelHost: React.FC = () => {
+  const [open, setOpen] = useState(false);
+  const [loaded, setLoaded] = useState(false);
+
+  useEffect(() => {
+    const handleKeyDown = (event: KeyboardEvent) => {
+      if (event.ctrlKey && event.shiftKey && event.key.toLowerCase() === 'm') {
+        setLoaded(true);
+        setOpen(visible => !visible);
+      }
+    };
+    window.addEventListener('keydown', handleKeyDown);
+    return () => window.removeEventListener('keydown', handleKeyDown);
+  }, []);
+
+  if (!loaded) return null;
+
+  return (
+    <Suspense fallback={null}>
+      <MetricsPanel open={open} onClose={() => setOpen(false)} />
+    </Suspense>
+  );
 };
 
 // 主应用组件
@@ -74,7 +127,12 @@ const App: React.FC = () => {
     style.textContent = cssVariables;
     document.head.appendChild(style);
 
+    markStartup('app-mounted');
+    // 首屏渲染完成后，在浏览器空闲时预加载其他页面
+    const cancelPrefetch = prefetchRoutesOnIdle();
+
     return () => {
+      cancelPrefetch();
       document.head.removeChild(style);
     };
   }, []);
@@ -86,55 +144,58 @@ const App: React.FC = () => {
         locale={zhCN}
       >
         <AntdApp>
+          <MetricsPanelHost />
           <Router>
-            <Routes>
-              {/* 登录页面 */}
-              <Route path="/login" element={<LoginPage />} />
-
-              {/* 受保护的路由 */}
-              <Route path="/" element={
-                <ProtectedRoute>
-                  <DashboardPage />
-                </ProtectedRoute>
-              } />
-
-
-
-              <Route path="/add-data" element={
-                <ProtectedRoute>
-                  <div>添加数据页面 - 开发中</div>
-                </ProtectedRoute>
-              } />
-
-              <Route path="/edit-data/:id" element={
-                <ProtectedRoute>
-                  <div>编辑数据页面 - 开发中</div>
-                </ProtectedRoute>
-              } />
-
-              <Route path="/ai-chat" element={
-                <ProtectedRoute>
-                  <NewAIChatPage />
-                </ProtectedRoute>
-              } />
-
-
-
-              <Route path="/feedback" element={
-                <ProtectedRoute>
-                  <FeedbackPage />
-                </ProtectedRoute>
-              } />
-
-              <Route path="/data-detail/:id" element={
-                <ProtectedRoute>
-                  <DataDetailPage />
-                </ProtectedRoute>
-              } />
-
-              {/* 默认重定向 */}
-              <Route path="*" element={<Navigate to="/" replace />} />
-            </Routes>
+            <Suspense fallback={<PageLoading />}>
+              <Routes>
+                {/* 登录页面 */}
+                <Route path="/login" element={<LoginPage />} />
+
+                {/* 受保护的路由 */}
+                <Route path="/" element={
+                  <ProtectedRoute>
+                    <DashboardPage />
+                  </ProtectedRoute>
+                } />
+
+
+
+                <Route path="/add-data" element={
+                  <ProtectedRoute>
+                    <div>添加数据页面 - 开发中</div>
+                  </ProtectedRoute>
+                } />
+
+                <Route path="/edit-data/:id" element={
+                  <ProtectedRoute>
+                    <div>编辑数据页面 - 开发中</div>
+                  </ProtectedRoute>
+                } />
+
+                <Route path="/ai-chat" element={
+                  <ProtectedRoute>
+                    <NewAIChatPage />
+                  </ProtectedRoute>
+                } />
+
+
+
+                <Route path="/feedback" element={
+                  <ProtectedRoute>
+                    <FeedbackPage />
+                  </ProtectedRoute>
+                } />
+
+                <Route path="/data-detail/:id" element={
+                  <ProtectedRoute>
+                    <DataDetailPage />
+                  </ProtectedRoute>
+                } />
+
+                {/* 默认重定向 */}
+                <Route path="*" element={<Navigate to="/" replace />} />
+              </Routes>
+            </Suspense>
           </Router>
         </AntdApp>
       </ConfigProvider>
@@ -18,7 +18,8 @@ export const API_ENDPOINTS = {
     LIST: '/safety-data/list',         // GET - 获取安全资料列表
     DETAIL: '/safety-data',            // GET - 获取安全资料详情（需要safetyDataId参数）
     UPDATE: '/safety-data',            // PUT - 修改安全资料（管理员）
-    DELETE: '/safety-data'             // DELETE - 删除安全资料（管理员，需要safetyDataId参数）
+    DELETE: '/safety-data',            // DELETE - 删除安全资料（管理员，需要safetyDataId参数）
+    STATS: '/safety-data/stats'        // GET - 获取统计汇总（总数及按安全等级、矿区类型、类别的计数）
   },
 
   // 反馈相关接口 - 对应后端 FeedbackController
@@ -31,7 +32,10 @@ export const API_ENDPOINTS = {
   // 文件相关接口 - 对应后端 FileController
   FILE: {
     UPLOAD: '/file/upload',            // POST - 上传文件
-    DOWNLOAD: '/file/download'         // GET - 下载文件（需要objectURL参数）
+    DOWNLOAD: '/file/download',        // GET - 下载文件（需要objectURL参数）
+    CHUNK_INIT: '/file/chunk/init',    // POST - 初始化分片上传，返回已上传分片；文件哈希已存在时直接返回URL
+    CHUNK: '/file/chunk',              // PUT - 上传单个分片（uploadId、index参数，请求体为分片二进制）
+    CHUNK_COMPLETE: '/file/chunk/complete' // POST - 合并分片，返回文件URL
   },
 
   // AI聊天相关接口 - 对应后端 ChatController
@@ -41,7 +45,7 @@ export const API_ENDPOINTS = {
     UPDATE_SESSION: '/chat',           // PUT - 更新会话信息
     DELETE_SESSION: '/chat',           // DELETE - 删除会话
     SAVE_MESSAGE: '/chat/messages',    // POST - 保存单个消息
-    GET_MESSAGES: '/chat/messages'     // GET - 获取会话消息历史
+    GET_MESSAGES: '/chat/messages'     // GET - 获取会话消息历史（支持beforeId游标，按id倒序返回更早的消息）
   }
 } as const;
 
@@ -1,5 +1,5 @@
 // AI聊天历史面板组件 - 在现有基础上添加的简单历史记录功能
-import React, { useState, useEffect } from 'react';
+import React, { useEffect } from 'react';
 import {
   Card,
   List,
@@ -43,43 +43,24 @@ const ChatHistoryPanel: React.FC<ChatHistoryPanelProps> = ({
     isLoading,
     error,
     loadSessions,
-    loadSessionsPaginated,
+    loadMoreSessions,
+    sessionsHasMore: hasMore,
+    isLoadingMoreSessions: loadingMore,
+    prefetchSession,
     createSession,
     deleteSession,
     clearError
   } = useChatStore();
-  
-  const [loadingMore, setLoadingMore] = useState(false);
-  const [hasMore, setHasMore] = useState(true);
-  const [currentPage, setCurrentPage] = useState(1);
 
   useEffect(() => {
-    loadInitialSessions();
-  }, [loadSessions, loadSessionsPaginated]);
+    loadSessions();
+  }, [loadSessions]);
 
-  const loadInitialSessions = async () => {
+  const loadMore = async () => {
     try {
-      setCurrentPage(1);
-      const result = await loadSessionsPaginated(1, 20);
-      setHasMore(result.hasMore);
-    } catch (error) {
-      message.error('加载会话列表失败');
-    }
-  };
-
-  const loadMoreSessions = async () => {
-    if (loadingMore || !hasMore) return;
-    
-    try {
-      setLoadingMore(true);
-      const nextPage = currentPage + 1;
-      const result = await loadSessionsPaginated(nextPage, 20);
-      setCurrentPage(nextPage);
-      setHasMore(result.hasMore);
+      await loadMoreSessions();
     } catch (error) {
       message.error('加载更多会话失败');
-    } finally {
-      setLoadingMore(false);
     }
   };
 
@@ -141,6 +122,7 @@ const ChatHistoryPanel: React.FC<ChatHistoryPanelProps> = ({
           transition: 'all 0.2s ease'
         }}
         onClick={() => onSessionSelect?.(session)}
+        onMouseEnter={() => prefetchSession(session.id)}
         actions={[
           <Popconfirm
             key="delete"
@@ -227,7 +209,7 @@ const ChatHistoryPanel: React.FC<ChatHistoryPanelProps> = ({
                 <Divider style={{ margin: '12px 0' }} />
                 <div style={{ textAlign: 'center', padding: '12px' }}>
                   <Button
-                    onClick={loadMoreSessions}
+                    onClick={loadMore}
                     loading={loadingMore}
                     icon={<DownOutlined />}
                   >
@@ -32,6 +32,9 @@ import { ChatMessage } from '../../types/ai';
 import { useChatStore } from '../../store/chatStore';
 import { aiHealthCheck } from '../../services/ai';
 import { MINING_BLUE_COLORS } from '../../config/theme';
+import VirtualMessageList from './VirtualMessageList';
+import { useLoadOlderMessages } from '../../hooks/useLoadOlderMessages';
+import { logger } from '../../services/logger';
 
 const { TextArea } = Input;
 const { Text, Paragraph } = Typography;
@@ -65,6 +68,7 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
     deleteSession,
     clearError,
     loadMoreMessages,
+    prefetchOlderMessages,
     isLoadingMoreMessages,
     messagesHasMore
   } = useChatStore();
@@ -83,7 +87,7 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
       const newSessionId = createSession(
         relatedItem ? `关于${relatedItem.title}的咨询` : '矿区安全咨询'
       );
-      console.log('创建了新会话:', newSessionId);
+      logger.debug('创建了新会话:', newSessionId);
     }
     // 如果有sessionId参数但不是当前会话，切换到指定会话
     if (sessionId && sessionId !== currentSession?.id) {
@@ -91,10 +95,12 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
     }
   }, [sessions.length, currentSession, createSession, setCurrentSession, sessionId, relatedItem]);
 
+  // 自动滚动到底部 - 只在会话切换或末尾消息变化时触发，顶部插入历史消息时不滚动
+  const messages = currentSession?.messages;
+  const lastMessage = messages && messages.length > 0 ? messages[messages.length - 1] : undefined;
   useEffect(() => {
-    // 自动滚动到底部
     scrollToBottom();
-  }, [currentSession?.messages]);
+  }, [currentSession?.id, lastMessage?.id, lastMessage?.content]);
 
   useEffect(() => {
     // 如果有相关资料，自动发送介绍消息
@@ -104,23 +110,16 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
     }
   }, [relatedItem, currentSession]);
 
-  // 滚动监听，实现加载更多历史消息
-  useEffect(() => {
-    const messagesContainer = messagesContainerRef.current;
-    if (!messagesContainer) return;
-
-    const handleScroll = () => {
-      // 当滚动到顶部附近时，加载更多消息
-      if (messagesContainer.scrollTop < 100 && messagesHasMore && !isLoadingMoreMessages && currentSession) {
-        loadMoreMessages(currentSession.id);
-      }
-    };
-
-    messagesContainer.addEventListener('scroll', handleScroll);
-    return () => {
-      messagesContainer.removeEventListener('scroll', handleScroll);
-    };
-  }, [loadMoreMessages, messagesHasMore, isLoadingMoreMessages, currentSession]);
+  // 向上滚动时预取并加载更早的消息
+  useLoadOlderMessages({
+    containerRef: messagesContainerRef,
+    sessionId: currentSession?.id,
+    firstMessageId: messages && messages.length > 0 ? messages[0].id : undefined,
+    hasMore: messagesHasMore,
+    loading: isLoadingMoreMessages,
+    onPrefetch: prefetchOlderMessages,
+    onLoadMore: loadMoreMessages
+  });
 
   // AI服务状态检查
   useEffect(() => {
@@ -223,7 +222,6 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
         style={{
           display: 'flex',
           justifyContent: isUser ? 'flex-end' : 'flex-start',
-          marginBottom: 16,
         }}
       >
         <div
@@ -525,8 +523,12 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ sessionId, relatedItem, s
           </div>
         )}
 
-        {/* 消息列表 */}
-        {currentSession?.messages.map(renderMessage)}
+        {/* 消息列表 - 消息较多时只渲染可视区域附近的消息 */}
+        <VirtualMessageList
+          messages={currentSession?.messages || []}
+          containerRef={messagesContainerRef}
+          renderMessage={renderMessage}
+        />
         
         {/* 正在输入指示器 */}
         {isStreaming && (
@@ -0,0 +1,76 @@
+// Markdown消息渲染 - 按消息ID缓存解析结果
+import React from 'react';
+import { Fragment, jsx, jsxs } from 'react/jsx-runtime';
+import { defaultUrlTransform } from 'react-markdown';
+import { unified } from 'unified';
+import remarkParse from 'remark-parse';
+import remarkRehype from 'remark-rehype';
+import { toJsxRuntime } from 'hast-util-to-jsx-runtime';
+import type { Nodes } from 'hast';
+
+// 最多缓存的消息数量
+const MAX_CACHED_MESSAGES = 500;
+
+// 需要过滤危险协议（如javascript:）的链接属性
+const URL_PROPERTIES = ['href', 'src'];
+
+// 与react-markdown默认配置相同的解析流程：不保留原始HTML
+const processor = unified().use(remarkParse).use(remarkRehype);
+
+// messageId -> 已渲染的元素树；内容未变化时直接复用，虚拟列表重新挂载也不会再次解析
+const markdownCache = new Map<string, { content: string; element: React.ReactElement }>();
+
+const sanitizeUrls = (node: Nodes) => {
+  if (node.type === 'element') {
+    URL_PROPERTIES.forEach(property => {
+      const value = node.properties[property];
+      if (typeof value === 'string') {
+        node.properties[property] = defaultUrlTransform(value);
+      }
+    });
+  }
+  if ('children' in node) {
+    node.children.forEach(sanitizeUrls);
+  }
+};
+
+const renderMarkdown = (messageId: string, content: string): React.ReactElement => {
+  const cached = markdownCache.get(messageId);
+  if (cached && cached.content === content) {
+    // 重新插入以维持LRU顺序
+    markdownCache.delete(messageId);
+    markdownCache.set(messageId, cached);
+    return cached.element;
+  }
+
+  const tree = processor.runSync(processor.parse(content));
+  sanitizeUrls(tree);
+  // 生成的只是普通的DOM元素，不含组件状态，可以在多次挂载间复用
+  const element = toJsxRuntime(tree, { Fragment, jsx, jsxs, passKeys: true, ignoreInvalidStyle: true }) as React.ReactElement;
+  markdownCache.delete(messageId);
+  markdownCache.set(messageId, { content, element });
+
+  if (markdownCache.size > MAX_CACHED_MESSAGES) {
+    const oldestKey = markdownCache.keys().next().value;
+    if (oldestKey !== undefined) {
+      markdownCache.delete(oldestKey);
+    }
+  }
+
+  return element;
+};
+
+interface MarkdownMessageProps {
+  messageId: string;
+  content: string;
+}
+
+const MarkdownMessage: React.FC<MarkdownMessageProps> = ({ messageId, content }) => {
+  return renderMarkdown(messageId, content);
+};
+
+// 按消息ID和内容比较，父组件重新渲染时跳过未变化的消息
+export default React.memo(
+  MarkdownMessage,
+  (prev, next) => prev.messageId === next.messageId && prev.content === next.content
+);
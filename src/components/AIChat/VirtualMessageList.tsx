@@ -0,0 +1,74 @@
+// 虚拟化消息列表 - 只渲染可视区域附近的消息
+import React, { useLayoutEffect, useRef, RefObject } from 'react';
+import { ChatMessage } from '../../types/ai';
+import { useVirtualList } from '../../hooks/useVirtualList';
+
+// 消息数超过该值时启用虚拟化
+const VIRTUALIZE_THRESHOLD = 50;
+
+interface MeasuredRowProps {
+  messageKey: string;
+  gap: number;
+  observe: (element: HTMLElement) => void;
+  unobserve: (element: HTMLElement) => void;
+  children: React.ReactNode;
+}
+
+// 单行容器，挂载时注册高度测量；间距使用padding以便计入测量高度
+const MeasuredRow: React.FC<MeasuredRowProps> = ({ messageKey, gap, observe, unobserve, children }) => {
+  const rowRef = useRef<HTMLDivElement>(null);
+
+  useLayoutEffect(() => {
+    const element = rowRef.current;
+    if (!element) return;
+    observe(element);
+    return () => unobserve(element);
+  }, [observe, unobserve]);
+
+  return (
+    <div ref={rowRef} data-virtual-key={messageKey} style={{ paddingBottom: gap }}>
+      {children}
+    </div>
+  );
+};
+
+interface VirtualMessageListProps {
+  messages: ChatMessage[];
+  containerRef: RefObject<HTMLElement | null>;
+  renderMessage: (message: ChatMessage) => React.ReactNode;
+  estimateHeight?: number;
+  gap?: number;
+  overscan?: number;
+}
+
+const getMessageKey = (message: ChatMessage) => message.id;
+
+const VirtualMessageList: React.FC<VirtualMessageListProps> = ({
+  messages,
+  containerRef,
+  renderMessage,
+  estimateHeight = 96,
+  gap = 16,
+  overscan = 6
+}) => {
+  const { virtualItems, paddingTop, paddingBottom, observe, unobserve } = useVirtualList({
+    items: messages,
+    containerRef,
+    getKey: getMessageKey,
+    estimateHeight: estimateHeight + gap,
+    overscan,
+    enabled: messages.length > VIRTUALIZE_THRESHOLD
+  });
+
+  return (
+    <div style={{ paddingTop, paddingBottom }}>
+      {virtualItems.map(({ item, key }) => (
+        <MeasuredRow key={key} messageKey={key} gap={gap} observe={observe} unobserve={unobserve}>
+          {renderMessage(item)}
+        </MeasuredRow>
+      ))}
+    </div>
+  );
+};
+
+export default VirtualMessageList;
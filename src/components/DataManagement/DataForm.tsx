@@ -22,8 +22,9 @@ import {
 } from '@ant-design/icons';
 import { SafetyData, UploadSafetyDataRequest } from '../../types/safety';
 import type { UploadFile } from 'antd/es/upload/interface';
-import { apiService } from '../../services/api';
+import { chunkedUploader, UploadProgress } from '../../services/chunkedUpload';
 import { DEFAULT_UPLOAD_CONFIG } from '../../api/endpoints';
+import { logger } from '../../services/logger';
 
 const { TextArea } = Input;
 const { Option } = Select;
@@ -88,11 +89,11 @@ const DataForm: React.FC<DataFormProps> = ({
           publishDate = dayjs(dateStr);
           // 验证日期是否有效
           if (!publishDate.isValid()) {
-            console.warn('无效的日期格式:', dateStr);
+            logger.warn('无效的日期格式:', dateStr);
             publishDate = null;
           }
         } catch (error) {
-          console.warn('日期格式转换失败:', dateStr, error);
+          logger.warn('日期格式转换失败:', dateStr, error);
           publishDate = null;
         }
       }
@@ -105,7 +106,7 @@ const DataForm: React.FC<DataFormProps> = ({
         district: initialData.district
       });
       
-      console.log('📅 设置表单日期值:', {
+      logger.debug('📅 设置表单日期值:', {
         原始日期: dateStr,
         转换后: publishDate?.format?.('YYYY-MM-DD') || null,
         有效性: publishDate?.isValid?.() || false
@@ -130,10 +131,10 @@ const DataForm: React.FC<DataFormProps> = ({
   const handleSubmit = async () => {
     try {
       setSubmitting(true);
-      console.log('🔄 开始表单提交，验证字段...');
+      logger.debug('🔄 开始表单提交，验证字段...');
       
       const values = await form.validateFields();
-      console.log('✅ 表单验证成功，字段值:', values);
+      logger.debug('✅ 表单验证成功，字段值:', values);
       
       // 处理文件上传
       let downloadUrl = '';
@@ -144,18 +145,18 @@ const DataForm: React.FC<DataFormProps> = ({
         downloadUrl = fileList[0].response.url;
         fileType = fileList[0].type || fileList[0].response.type || '';
         fileSize = fileList[0].size?.toString() || fileList[0].response.size?.toString() || '0';
-        console.log('📁 使用上传的文件URL:', downloadUrl);
+        logger.debug('📁 使用上传的文件URL:', downloadUrl);
       } else if (initialData?.downloadUrl) {
         downloadUrl = initialData.downloadUrl;
         fileType = initialData.fileType || '';
         fileSize = initialData.fileSize || '0';
-        console.log('📁 使用初始数据的文件URL:', downloadUrl);
+        logger.debug('📁 使用初始数据的文件URL:', downloadUrl);
       } else {
-        console.log('⚠️ 没有找到文件URL');
+        logger.debug('⚠️ 没有找到文件URL');
       }
 
       // 根据API文档，枚举值直接使用前端格式，无需映射转换
-      console.log('📋 表单原始值（按API文档格式）:', {
+      logger.debug('📋 表单原始值（按API文档格式）:', {
         safetyLevel: values.safetyLevel, // API文档: "low", "medium", "high", "critical"
         mineType: values.mineType,       // API文档: "coal", "metal", "nonmetal", "openpit"
         category: values.category        // API文档: "gas_detection", "equipment_safety", 等等
@@ -181,16 +182,16 @@ const DataForm: React.FC<DataFormProps> = ({
         tags: []
       };
 
-      console.log('🚀 准备提交数据:', submitData);
+      logger.debug('🚀 准备提交数据:', submitData);
       await onSubmit(submitData);
       message.success(initialData ? '更新成功！' : '添加成功！');
       handleCancel();
     } catch (error: any) {
-      console.error('❌ 表单提交失败:', error);
+      logger.error('❌ 表单提交失败:', error);
       
       // 区分验证错误和提交错误
       if (error.errorFields) {
-        console.error('📋 表单验证失败的字段:', error.errorFields);
+        logger.error('📋 表单验证失败的字段:', error.errorFields);
         message.error('请检查表单填写是否完整');
         // 自动滚动到第一个错误字段
         form.scrollToField(error.errorFields[0].name);
@@ -213,7 +214,7 @@ const DataForm: React.FC<DataFormProps> = ({
   const uploadProps = {
     fileList,
     onChange: ({ fileList: newFileList }: { fileList: UploadFile[] }) => {
-      console.log('📁 文件列表变化:', newFileList.map(f => ({
+      logger.debug('📁 文件列表变化:', newFileList.map(f => ({
         name: f.name,
         status: f.status,
         uid: f.uid
@@ -225,7 +226,7 @@ const DataForm: React.FC<DataFormProps> = ({
       );
       
       if (validFiles.length !== newFileList.length) {
-        console.log('🗑️ 自动删除验证失败的文件，删除数量:', newFileList.length - validFiles.length);
+        logger.debug('🗑️ 自动删除验证失败的文件，删除数量:', newFileList.length - validFiles.length);
         // 延迟一小段时间再删除，确保用户能看到错误信息
         setTimeout(() => {
           setFileList(validFiles);
@@ -236,7 +237,7 @@ const DataForm: React.FC<DataFormProps> = ({
       setFileList(newFileList);
     },
     beforeUpload: (file: File) => {
-      console.log('📁 文件上传检测:', { 
+      logger.debug('📁 文件上传检测:', { 
         fileName: file.name, 
         fileType: file.type, 
         fileSize: file.size 
@@ -288,29 +289,43 @@ const DataForm: React.FC<DataFormProps> = ({
         return false;
       }
 
-      console.log('✅ 文件检测通过');
+      logger.debug('✅ 文件检测通过');
       return true;
     },
     customRequest: async (options: any) => {
-      const { file, onSuccess, onError } = options;
+      const { file, onSuccess, onError, onProgress } = options;
+      const fileSizeText = `${(file.size / 1024 / 1024).toFixed(2)}MB`;
+      const messageKey = `upload-${file.uid}`;
       
-      // 显示开始上传提示
+      // 显示开始上传提示，上传过程中按同一个key更新进度
       const hideUploadingMessage = message.loading({
-        content: `正在上传 ${file.name} (${(file.size / 1024 / 1024).toFixed(2)}MB)...`,
+        key: messageKey,
+        content: `正在上传 ${file.name} (${fileSizeText})...`,
         duration: 0 // 不自动消失
       });
+
+      const handleProgress = (progress: UploadProgress) => {
+        onProgress?.({ percent: progress.phase === 'hashing' ? 0 : progress.percent });
+        const speed = `${(progress.bytesPerSecond / 1024 / 1024).toFixed(2)}MB/s`;
+        const content = progress.phase === 'hashing'
+          ? `正在校验 ${file.name}... ${progress.percent}%`
+          : progress.phase === 'completing'
+            ? `正在合并 ${file.name}...`
+            : `正在上传 ${file.name} (${fileSizeText}) ${progress.percent}% · ${speed}${progress.resumed ? ' · 断点续传' : ''}`;
+        message.loading({ key: messageKey, content, duration: 0 });
+      };
       
       try {
-        console.log('📁 开始通过customRequest上传文件:', {
+        logger.debug('📁 开始通过customRequest上传文件:', {
           fileName: file.name,
           fileSize: file.size,
           fileType: file.type
         });
         
-        // 调用上传API
-        const response = await apiService.uploadFile(file);
+        // 大文件分片并行上传，小文件或后端不支持分片时整文件上传
+        const response = await chunkedUploader.upload(file, { onProgress: handleProgress });
         
-        console.log('✅ customRequest文件上传成功:', response);
+        logger.debug('✅ customRequest文件上传成功:', response);
         
         // 关闭上传中提示
         hideUploadingMessage();
@@ -334,7 +349,10 @@ const DataForm: React.FC<DataFormProps> = ({
           description: (
             <div>
               <p><strong>📄 文件名：</strong>{file.name}</p>
-              <p><strong>📏 文件大小：</strong>{(file.size / 1024 / 1024).toFixed(2)}MB</p>
+              <p><strong>📏 文件大小：</strong>{fileSizeText}</p>
+              <p><strong>⚡ 上传方式：</strong>{response.mode === 'instant'
+                ? '文件已存在，秒传完成'
+                : `${response.mode === 'chunked' ? '分片上传' : '整文件上传'}，平均 ${(response.bytesPerSecond / 1024 / 1024).toFixed(2)}MB/s`}</p>
               <p><strong>✅ 状态：</strong>已准备就绪，可以提交表单</p>
             </div>
           ),
@@ -342,7 +360,7 @@ const DataForm: React.FC<DataFormProps> = ({
           placement: 'topRight',
         });
       } catch (error: any) {
-        console.error('❌ customRequest文件上传失败:', error);
+        logger.error('❌ customRequest文件上传失败:', error);
         
         // 关闭上传中提示
         hideUploadingMessage();
@@ -85,6 +85,9 @@ const safetyLevelIcons: Record<SafetyLevel, string> = {
   [SafetyLevel.CRITICAL]: '🔴'
 };
 
+// 单页行数超过该值时启用虚拟滚动，只渲染可视区域内的行
+const VIRTUAL_ROW_THRESHOLD = 100;
+
 // 访问权限颜色映射
 const accessLevelColors: Record<AccessLevel, string> = {
   [AccessLevel.PUBLIC]: 'green',
@@ -108,6 +111,8 @@ interface DataTableProps {
   onDownload?: (record: MiningLanguageItem) => void;
   onPreview?: (record: MiningLanguageItem) => void;
   onAIAnalyze?: (record: MiningLanguageItem) => void;
+  virtual?: boolean; // 是否启用虚拟滚动，默认在单页行数较多时自动启用
+  scrollHeight?: number; // 虚拟滚动时的表格可视高度
 }
 
 const DataTable: React.FC<DataTableProps> = ({
@@ -118,7 +123,9 @@ const DataTable: React.FC<DataTableProps> = ({
   onDelete,
   onDownload,
   onPreview,
-  onAIAnalyze
+  onAIAnalyze,
+  virtual,
+  scrollHeight = 600
 }) => {
   const [selectedRowKeys, setSelectedRowKeys] = useState<React.Key[]>([]);
 
@@ -343,6 +350,10 @@ const DataTable: React.FC<DataTableProps> = ({
     },
   ];
 
+  // 大数据量（如导出上万行）时启用antd虚拟表格，行高由内部按行缓存
+  const pageRowCount = pagination ? Math.min(pagination.pageSize, data.length) : data.length;
+  const isVirtual = virtual ?? pageRowCount > VIRTUAL_ROW_THRESHOLD;
+
   // 行选择配置
   const rowSelection: TableProps<MiningLanguageItem>['rowSelection'] = {
     selectedRowKeys,
@@ -426,14 +437,15 @@ const DataTable: React.FC<DataTableProps> = ({
           showQuickJumper: true,
           showTotal: (total, range) =>
             `第 ${range[0]}-${range[1]} 条，共 ${total} 条记录`,
-          pageSizeOptions: ['10', '20', '50', '100'],
+          pageSizeOptions: ['10', '20', '50', '100', '500', '1000'],
           style: {
             marginTop: '24px',
             textAlign: 'center'
           }
         } : false}
         rowSelection={rowSelection}
-        scroll={{ x: 1400 }}
+        virtual={isVirtual}
+        scroll={isVirtual ? { x: 1400, y: scrollHeight } : { x: 1400 }}
         size="middle"
         bordered={false}
         style={{
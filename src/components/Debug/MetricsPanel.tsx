@@ -0,0 +1,163 @@
+// 性能调试面板 - 查看接口耗时、流式响应、store更新频率和React提交耗时的聚合数据
+import React, { useEffect, useState } from 'react';
+import {
+  Drawer,
+  Table,
+  Space,
+  Button,
+  Select,
+  Switch,
+  Typography,
+  Descriptions,
+  message
+} from 'antd';
+import { ReloadOutlined, CloudUploadOutlined, ClearOutlined } from '@ant-design/icons';
+import type { ColumnsType } from 'antd/es/table';
+import { metrics, MetricsSnapshot, HistogramSnapshot, CounterSnapshot } from '../../services/metrics';
+import { getLogLevel, setLogLevel, LOG_LEVELS, LogLevel } from '../../services/logger';
+import { getApiMetrics } from '../../services/apiClient';
+
+const { Text } = Typography;
+
+const REFRESH_INTERVAL = 1000;
+
+const formatNumber = (value: number) => (value >= 100 ? Math.round(value).toString() : value.toFixed(1));
+
+const histogramColumns: ColumnsType<HistogramSnapshot> = [
+  { title: '指标', dataIndex: 'name', width: 150 },
+  { title: '标签', dataIndex: 'label', ellipsis: true, render: (label: string) => label || '-' },
+  { title: '次数', dataIndex: 'count', width: 70, align: 'right' },
+  { title: '平均', dataIndex: 'avg', width: 70, align: 'right', render: formatNumber },
+  { title: 'P50', dataIndex: 'p50', width: 70, align: 'right', render: formatNumber },
+  {
+    title: 'P95',
+    dataIndex: 'p95',
+    width: 70,
+    align: 'right',
+    render: formatNumber,
+    sorter: (a, b) => a.p95 - b.p95
+  },
+  { title: 'P99', dataIndex: 'p99', width: 70, align: 'right', render: formatNumber },
+  { title: '最大', dataIndex: 'max', width: 70, align: 'right', render: formatNumber }
+];
+
+const counterColumns: ColumnsType<CounterSnapshot> = [
+  { title: '指标', dataIndex: 'name', width: 150 },
+  { title: '标签', dataIndex: 'label', render: (label: string) => label || '-' },
+  { title: '次数', dataIndex: 'count', width: 90, align: 'right' },
+  {
+    title: '每秒',
+    dataIndex: 'ratePerSecond',
+    width: 90,
+    align: 'right',
+    render: formatNumber,
+    sorter: (a, b) => a.ratePerSecond - b.ratePerSecond
+  }
+];
+
+const byNameAndLabel = <T extends { name: string; label: string }>(a: T, b: T) =>
+  a.name.localeCompare(b.name) || a.label.localeCompare(b.label);
+
+interface MetricsPanelProps {
+  open: boolean;
+  onClose: () => void;
+}
+
+const MetricsPanel: React.FC<MetricsPanelProps> = ({ open, onClose }) => {
+  const [snapshot, setSnapshot] = useState<MetricsSnapshot>(() => metrics.snapshot());
+  const [logLevel, setLogLevelState] = useState<LogLevel>(getLogLevel);
+  const [enabled, setEnabled] = useState(metrics.isEnabled());
+
+  // 面板打开期间定时刷新
+  useEffect(() => {
+    if (!open) return;
+    setSnapshot(metrics.snapshot());
+    const timer = setInterval(() => setSnapshot(metrics.snapshot()), REFRESH_INTERVAL);
+    return () => clearInterval(timer);
+  }, [open]);
+
+  const handleLogLevelChange = (level: LogLevel) => {
+    setLogLevel(level);
+    setLogLevelState(level);
+  };
+
+  const handleEnabledChange = (checked: boolean) => {
+    metrics.setEnabled(checked);
+    setEnabled(checked);
+    message.info(checked ? '已开启采集，store和渲染耗时埋点刷新页面后生效' : '已关闭采集');
+  };
+
+  const handleFlush = () => {
+    if (metrics.flush()) {
+      message.success('已上报');
+    } else {
+      message.info('没有待上报的数据');
+    }
+  };
+
+  const handleReset = () => {
+    metrics.reset();
+    setSnapshot(metrics.snapshot());
+  };
+
+  const endpoint = metrics.getEndpoint();
+  const hitRate = getApiMetrics().hitRate;
+
+  return (
+    <Drawer
+      title="性能指标"
+      placement="right"
+      width={820}
+      open={open}
+      onClose={onClose}
+      extra={
+        <Space>
+          <Button icon={<ReloadOutlined />} onClick={() => setSnapshot(metrics.snapshot())}>刷新</Button>
+          <Button icon={<CloudUploadOutlined />} onClick={handleFlush} disabled={!endpoint}>立即上报</Button>
+          <Button icon={<ClearOutlined />} onClick={handleReset}>重置</Button>
+        </Space>
+      }
+    >
+      <Descriptions size="small" column={2} bordered style={{ marginBottom: 16 }}>
+        <Descriptions.Item label="采集">
+          <Switch size="small" checked={enabled} onChange={handleEnabledChange} />
+        </Descriptions.Item>
+        <Descriptions.Item label="日志级别">
+          <Select
+            size="small"
+            value={logLevel}
+            onChange={handleLogLevelChange}
+            options={LOG_LEVELS.map(level => ({ value: level, label: level }))}
+            style={{ width: 100 }}
+          />
+        </Descriptions.Item>
+        <Descriptions.Item label="采集时长">{Math.round(snapshot.durationMs / 1000)} 秒</Descriptions.Item>
+        <Descriptions.Item label="接口缓存命中率">{(hitRate * 100).toFixed(1)}%</Descriptions.Item>
+        <Descriptions.Item label="上报地址" span={2}>
+          {endpoint ? <Text code>{endpoint}</Text> : <Text type="secondary">未配置（REACT_APP_METRICS_ENDPOINT）</Text>}
+        </Descriptions.Item>
+      </Descriptions>
+
+      <Table<HistogramSnapshot>
+        size="small"
+        title={() => <Text strong>直方图（耗时单位：毫秒）</Text>}
+        columns={histogramColumns}
+        dataSource={[...snapshot.histograms].sort(byNameAndLabel)}
+        rowKey={row => `${row.name}|${row.label}`}
+        pagination={false}
+        style={{ marginBottom: 16 }}
+      />
+
+      <Table<CounterSnapshot>
+        size="small"
+        title={() => <Text strong>计数器</Text>}
+        columns={counterColumns}
+        dataSource={[...snapshot.counters].sort(byNameAndLabel)}
+        rowKey={row => `${row.name}|${row.label}`}
+        pagination={false}
+      />
+    </Drawer>
+  );
+};
+
+export default MetricsPanel;
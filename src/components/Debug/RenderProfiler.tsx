@@ -0,0 +1,31 @@
+// React提交耗时埋点 - 用Profiler包裹页面，把每次提交的实际渲染耗时记录到指标
+import React, { Profiler, ProfilerOnRenderCallback } from 'react';
+import { metrics, METRIC_NAMES } from '../../services/metrics';
+
+// 页面加载时决定是否包裹Profiler，避免运行中切换导致子树重新挂载
+const PROFILING_ENABLED = metrics.isEnabled();
+
+const handleRender: ProfilerOnRenderCallback = (id, _phase, actualDuration) => {
+  metrics.observe(METRIC_NAMES.REACT_COMMIT, actualDuration, id);
+};
+
+interface RenderProfilerProps {
+  id: string;
+  children: React.ReactNode;
+}
+
+/**
+ * 开发构建中始终生效；生产构建需使用 react-dom/profiling 才会回调onRender
+ */
+const RenderProfiler: React.FC<RenderProfilerProps> = ({ id, children }) => {
+  if (!PROFILING_ENABLED) {
+    return <>{children}</>;
+  }
+  return (
+    <Profiler id={id} onRender={handleRender}>
+      {children}
+    </Profiler>
+  );
+};
+
+export default RenderProfiler;
@@ -16,6 +16,7 @@ import { useNavigate, useLocation } from 'react-router-dom';
 import { useAuthStore } from '../../store/authStore';
 import { useAIStatus } from '../../hooks/useAIStatus';
 import { MINING_BLUE_COLORS } from '../../config/theme';
+import { preloadRoute } from '../../routes';
 
 const { Header, Sider, Content } = Layout;
 const { Title, Text } = Typography;
@@ -31,7 +32,7 @@ const MainLayout: React.FC<MainLayoutProps> = ({ children }) => {
   const { user, logout } = useAuthStore();
   const { isOnline: aiOnline, isChecking: aiChecking } = useAIStatus();
 
-  // 菜单项配置
+  // 菜单项配置 - 鼠标悬停时预加载对应页面代码
   const menuItems = [
     {
       key: '/',
@@ -48,7 +49,7 @@ const MainLayout: React.FC<MainLayoutProps> = ({ children }) => {
       icon: <BulbOutlined />,
       label: '用户建议',
     },
-  ];
+  ].map(item => ({ ...item, onMouseEnter: () => preloadRoute(item.key) }));
 
   // 用户菜单
   const userMenuItems = [
@@ -14,6 +14,50 @@ export const API_CONFIG = {
   VERSION: 'v1'
 };
 
+// 分片上传配置
+export const UPLOAD_CONFIG = {
+  // 是否启用分片上传，后端不支持时自动回退到整文件上传
+  CHUNKED_ENABLED: process.env.REACT_APP_CHUNKED_UPLOAD !== 'false',
+
+  // 分片上传接口地址，本地测试时可指向 scripts/chunk-upload-server.js
+  CHUNK_BASE_URL: process.env.REACT_APP_CHUNK_UPLOAD_BASE_URL || API_CONFIG.BASE_URL,
+
+  // 超过该大小的文件使用分片上传
+  CHUNK_THRESHOLD: 5 * 1024 * 1024,
+
+  // 分片大小
+  CHUNK_SIZE: 2 * 1024 * 1024,
+
+  // 同时上传的分片数
+  CONCURRENCY: 3,
+
+  // 单个分片失败后的重试次数
+  MAX_RETRIES: 3,
+
+  // 单个分片的请求超时时间
+  CHUNK_TIMEOUT: 60000
+};
+
+// 性能指标与日志配置
+export const METRICS_CONFIG = {
+  // 指标上报地址，本地测试时可指向 scripts/metrics-collector.js；为空时只在调试面板中查看
+  ENDPOINT: process.env.REACT_APP_METRICS_ENDPOINT || '',
+
+  // 是否采集指标：开发环境默认开启，生产环境在配置了上报地址或 localStorage.debug_metrics 为 true 时开启
+  ENABLED: process.env.NODE_ENV === 'development'
+    || Boolean(process.env.REACT_APP_METRICS_ENDPOINT)
+    || process.env.REACT_APP_METRICS_ENABLED === 'true',
+
+  // 日志级别 debug | info | warn | error | silent，生产环境默认不输出；可通过 localStorage.log_level 临时调整
+  LOG_LEVEL: process.env.REACT_APP_LOG_LEVEL || (process.env.NODE_ENV === 'development' ? 'debug' : 'silent'),
+
+  // 批量上报间隔
+  FLUSH_INTERVAL: 15000,
+
+  // 单个指标最多保留的标签数，超出的合并到 other，避免按URL产生过多序列
+  MAX_LABELS_PER_METRIC: 100
+};
+
 // 硅基流动AI配置 - 已迁移到后端，前端不再直接调用
 // export const SILICONFLOW_CONFIG = {
 //   // API基础配置 - 已移至后端安全存储
@@ -0,0 +1,71 @@
+// 向上滚动加载历史消息Hook
+import { useEffect, useLayoutEffect, useRef, RefObject } from 'react';
+
+interface UseLoadOlderMessagesOptions {
+  containerRef: RefObject<HTMLElement | null>;
+  sessionId?: string;
+  firstMessageId?: string;
+  hasMore: boolean;
+  loading: boolean;
+  onPrefetch: (sessionId: string) => void;
+  onLoadMore: (sessionId: string) => void;
+  prefetchDistance?: number;
+  loadDistance?: number;
+}
+
+/**
+ * 向上滚动加载历史消息 - 接近顶部时预取下一页，到达顶部时插入；插入后保持当前可视内容不跳动
+ * @param options.containerRef 消息滚动容器
+ * @param options.firstMessageId 当前最早一条消息的ID，变化表示顶部插入了消息
+ * @param options.prefetchDistance 距顶部多少像素时开始预取
+ * @param options.loadDistance 距顶部多少像素时加载
+ */
+export function useLoadOlderMessages({
+  containerRef,
+  sessionId,
+  firstMessageId,
+  hasMore,
+  loading,
+  onPrefetch,
+  onLoadMore,
+  prefetchDistance = 800,
+  loadDistance = 100
+}: UseLoadOlderMessagesOptions): void {
+  // 加载前的滚动位置，用于插入后还原
+  const anchorRef = useRef<{ sessionId: string; firstMessageId?: string; scrollHeight: number; scrollTop: number } | null>(null);
+
+  useEffect(() => {
+    const container = containerRef.current;
+    if (!container || !sessionId || !hasMore) return;
+
+    const handleScroll = () => {
+      if (container.scrollTop < prefetchDistance) {
+        onPrefetch(sessionId);
+      }
+      if (container.scrollTop < loadDistance && !loading) {
+        anchorRef.current = {
+          sessionId,
+          firstMessageId,
+          scrollHeight: container.scrollHeight,
+          scrollTop: container.scrollTop
+        };
+        onLoadMore(sessionId);
+      }
+    };
+
+    container.addEventListener('scroll', handleScroll, { passive: true });
+    return () => container.removeEventListener('scroll', handleScroll);
+  }, [containerRef, sessionId, firstMessageId, hasMore, loading, onPrefetch, onLoadMore, prefetchDistance, loadDistance]);
+
+  // 顶部插入历史消息后，按内容增加的高度下移滚动位置
+  useLayoutEffect(() => {
+    const container = containerRef.current;
+    const anchor = anchorRef.current;
+    if (!container || !anchor || anchor.firstMessageId === firstMessageId) return;
+
+    anchorRef.current = null;
+    if (anchor.sessionId === sessionId) {
+      container.scrollTop = anchor.scrollTop + (container.scrollHeight - anchor.scrollHeight);
+    }
+  }, [containerRef, sessionId, firstMessageId]);
+}
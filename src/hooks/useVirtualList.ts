@@ -0,0 +1,189 @@
+// 虚拟列表Hook
+import { useState, useEffect, useRef, useCallback, useMemo, RefObject } from 'react';
+
+export interface VirtualItem<T> {
+  item: T;
+  index: number;
+  key: string;
+}
+
+interface UseVirtualListOptions<T> {
+  items: T[];
+  containerRef: RefObject<HTMLElement | null>;
+  getKey: (item: T, index: number) => string;
+  estimateHeight: number;
+  overscan?: number;
+  enabled?: boolean;
+}
+
+// 找到第一个底边超过position的条目
+const findIndex = (offsets: number[], position: number): number => {
+  let low = 0;
+  let high = offsets.length - 2;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (offsets[mid + 1] <= position) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return Math.max(0, low);
+};
+
+/**
+ * 虚拟列表Hook - 只渲染可视区域及上下缓冲区内的条目
+ * 已测量的条目高度按key缓存，未测量的条目使用estimateHeight估算
+ * @param options.items 列表数据
+ * @param options.containerRef 滚动容器
+ * @param options.getKey 条目唯一key，用于高度缓存
+ * @param options.estimateHeight 未测量条目的估算高度（像素）
+ * @param options.overscan 可视区域上下额外渲染的条目数
+ * @param options.enabled 为false时渲染全部条目
+ */
+export function useVirtualList<T>({
+  items,
+  containerRef,
+  getKey,
+  estimateHeight,
+  overscan = 5,
+  enabled = true
+}: UseVirtualListOptions<T>) {
+  const heightCache = useRef(new Map<string, number>());
+  const getKeyRef = useRef(getKey);
+  getKeyRef.current = getKey;
+
+  const [measureVersion, setMeasureVersion] = useState(0);
+  const [viewport, setViewport] = useState({ scrollTop: 0, height: 0 });
+  const frameRef = useRef<number | null>(null);
+  const pendingMeasure = useRef(false);
+  const observerRef = useRef<ResizeObserver | null>(null);
+  const mountedElements = useRef(new Set<HTMLElement>());
+
+  // 滚动、尺寸变化和高度测量合并到同一帧处理
+  const scheduleUpdate = useCallback(() => {
+    if (frameRef.current !== null) return;
+    frameRef.current = requestAnimationFrame(() => {
+      frameRef.current = null;
+      const container = containerRef.current;
+      if (container) {
+        setViewport(prev =>
+          prev.scrollTop === container.scrollTop && prev.height === container.clientHeight
+            ? prev
+            : { scrollTop: container.scrollTop, height: container.clientHeight }
+        );
+      }
+      if (pendingMeasure.current) {
+        pendingMeasure.current = false;
+        setMeasureVersion(version => version + 1);
+      }
+    });
+  }, [containerRef]);
+
+  const recordHeight = useCallback((element: Element, height: number) => {
+    const key = element.getAttribute('data-virtual-key');
+    if (!key || height <= 0) return;
+    if (heightCache.current.get(key) !== height) {
+      heightCache.current.set(key, height);
+      pendingMeasure.current = true;
+      scheduleUpdate();
+    }
+  }, [scheduleUpdate]);
+
+  useEffect(() => {
+    if (!enabled) return;
+    const container = containerRef.current;
+    if (!container) return;
+
+    const observer = typeof ResizeObserver !== 'undefined'
+      ? new ResizeObserver(entries => {
+          entries.forEach(entry => {
+            if (entry.target === container) {
+              scheduleUpdate();
+            } else {
+              recordHeight(entry.target, entry.target.getBoundingClientRect().height);
+            }
+          });
+        })
+      : null;
+    observerRef.current = observer;
+    observer?.observe(container);
+    // 条目可能先于容器完成挂载，补充监听已挂载的条目
+    mountedElements.current.forEach(element => observer?.observe(element));
+
+    container.addEventListener('scroll', scheduleUpdate, { passive: true });
+    scheduleUpdate();
+
+    return () => {
+      container.removeEventListener('scroll', scheduleUpdate);
+      observer?.disconnect();
+      observerRef.current = null;
+      if (frameRef.current !== null) {
+        cancelAnimationFrame(frameRef.current);
+        frameRef.current = null;
+      }
+    };
+  }, [enabled, containerRef, scheduleUpdate, recordHeight]);
+
+  // 条目挂载时开始测量，元素需带有data-virtual-key属性
+  const observe = useCallback((element: HTMLElement) => {
+    mountedElements.current.add(element);
+    if (observerRef.current) {
+      observerRef.current.observe(element);
+    } else {
+      recordHeight(element, element.getBoundingClientRect().height);
+    }
+  }, [recordHeight]);
+
+  const unobserve = useCallback((element: HTMLElement) => {
+    mountedElements.current.delete(element);
+    observerRef.current?.unobserve(element);
+  }, []);
+
+  // 每个条目的起始偏移量，只在数据或测量结果变化时重新计算
+  const offsets = useMemo(() => {
+    const result = new Array<number>(items.length + 1);
+    result[0] = 0;
+    for (let i = 0; i < items.length; i++) {
+      const height = heightCache.current.get(getKeyRef.current(items[i], i)) ?? estimateHeight;
+      result[i + 1] = result[i] + height;
+    }
+    return result;
+    // measureVersion变化表示高度缓存已更新
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [items, estimateHeight, measureVersion]);
+
+  const totalHeight = offsets[items.length];
+
+  if (!enabled || items.length === 0) {
+    return {
+      virtualItems: items.map((item, index) => ({ item, index, key: getKey(item, index) })),
+      paddingTop: 0,
+      paddingBottom: 0,
+      totalHeight,
+      observe,
+      unobserve,
+      isVirtual: false
+    };
+  }
+
+  // 首次渲染时容器高度未知，按估算高度渲染一屏
+  const viewportHeight = viewport.height || estimateHeight * 10;
+  const start = Math.max(0, findIndex(offsets, viewport.scrollTop) - overscan);
+  const end = Math.min(items.length, findIndex(offsets, viewport.scrollTop + viewportHeight) + 1 + overscan);
+
+  const virtualItems: VirtualItem<T>[] = [];
+  for (let index = start; index < end; index++) {
+    virtualItems.push({ item: items[index], index, key: getKey(items[index], index) });
+  }
+
+  return {
+    virtualItems,
+    paddingTop: offsets[start],
+    paddingBottom: totalHeight - offsets[end],
+    totalHeight,
+    observe,
+    unobserve,
+    isVirtual: true
+  };
+}
@@ -2,7 +2,9 @@ import React from 'react';
 import ReactDOM from 'react-dom/client';
 import './index.css';
 import App from './App';
-import reportWebVitals from './reportWebVitals';
+import { markStartup, reportStartupTiming } from './reportWebVitals';
+
+markStartup('app-start');
 
 const root = ReactDOM.createRoot(
   document.getElementById('root') as HTMLElement
@@ -13,7 +15,7 @@ root.render(
   </React.StrictMode>
 );
 
-// 如果您想开始测量应用程序的性能，请传递一个函数
-// 来记录结果（例如：reportWebVitals(console.log)）
-// 或发送到分析端点。了解更多： https://bit.ly/CRA-vitals
-reportWebVitals();
+// 启动性能报告：开发环境输出到控制台，生产环境保存在 window.__STARTUP_TIMING__
+// 如需上报，可传入回调（例如：reportStartupTiming(report => navigator.sendBeacon(url, JSON.stringify(report)))）
+// Web Vitals说明： https://bit.ly/CRA-vitals
+reportStartupTiming();
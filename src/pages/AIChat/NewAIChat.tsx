@@ -25,8 +25,12 @@ import {
   DeleteOutlined
 } from '@ant-design/icons';
 import { MINING_BLUE_COLORS } from '../../config/theme';
-import ReactMarkdown from 'react-markdown';
 import { useChatStore } from '../../store/chatStore';
+import { ChatMessage } from '../../types/ai';
+import MarkdownMessage from '../../components/AIChat/MarkdownMessage';
+import VirtualMessageList from '../../components/AIChat/VirtualMessageList';
+import { useLoadOlderMessages } from '../../hooks/useLoadOlderMessages';
+import { logger } from '../../services/logger';
 
 const { Title, Text, Paragraph } = Typography;
 const { TextArea } = Input;
@@ -42,7 +46,14 @@ const NewAIChatPage: React.FC = () => {
     setCurrentSession,
     deleteSession,
     sendMessage,
-    initialize
+    initialize,
+    isLoadingMoreMessages,
+    messagesHasMore,
+    loadMoreMessages,
+    prefetchOlderMessages,
+    sessionsHasMore,
+    loadMoreSessions,
+    prefetchSession
   } = useChatStore();
 
   // 本地UI状态
@@ -52,10 +63,10 @@ const NewAIChatPage: React.FC = () => {
 
   // 初始化聊天store - 确保用户认证后再执行
   useEffect(() => {
-    console.log('🎯 [NewAIChat] 检查是否需要初始化chatStore');
+    logger.debug('🎯 [NewAIChat] 检查是否需要初始化chatStore');
     // 添加小延迟确保authStore已经完成初始化
     const timer = setTimeout(() => {
-      console.log('🎯 [NewAIChat] 开始执行chatStore初始化');
+      logger.debug('🎯 [NewAIChat] 开始执行chatStore初始化');
       initialize();
     }, 100);
     return () => clearTimeout(timer);
@@ -68,9 +79,100 @@ const NewAIChatPage: React.FC = () => {
     }
   }, []);
 
+  // 只在会话切换或末尾消息变化时滚动到底部，顶部插入历史消息时不滚动
+  const messages = currentSession?.messages;
+  const lastMessage = messages && messages.length > 0 ? messages[messages.length - 1] : undefined;
   useEffect(() => {
     scrollToBottom();
-  }, [currentSession?.messages, scrollToBottom]);
+  }, [currentSession?.id, lastMessage?.id, lastMessage?.content, scrollToBottom]);
+
+  // 向上滚动时预取并加载更早的消息
+  useLoadOlderMessages({
+    containerRef: chatContainerRef,
+    sessionId: currentSession?.id,
+    firstMessageId: messages && messages.length > 0 ? messages[0].id : undefined,
+    hasMore: messagesHasMore,
+    loading: isLoadingMoreMessages,
+    onPrefetch: prefetchOlderMessages,
+    onLoadMore: loadMoreMessages
+  });
+
+  // 会话列表滚动到底部附近时加载下一页
+  const handleSessionListScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const target = e.currentTarget;
+    if (sessionsHasMore && target.scrollHeight - target.scrollTop - target.clientHeight < 200) {
+      loadMoreSessions().catch(error => logger.warn('⚠️ 加载更多会话失败:', error));
+    }
+  };
+
+  // 渲染单条消息，助手消息的Markdown按消息ID缓存解析结果
+  const renderMessage = useCallback((message: ChatMessage) => (
+    <div
+      style={{
+        display: 'flex',
+        justifyContent: message.role === 'user' ? 'flex-end' : 'flex-start'
+      }}
+    >
+      <div
+        style={{
+          maxWidth: '80%',
+          display: 'flex',
+          alignItems: 'flex-start',
+          gap: '8px',
+          flexDirection: message.role === 'user' ? 'row-reverse' : 'row'
+        }}
+      >
+        <Avatar
+          icon={message.role === 'user' ? <UserOutlined /> : <RobotOutlined />}
+          style={{
+            backgroundColor: message.role === 'user' 
+              ? MINING_BLUE_COLORS.primary 
+              : MINING_BLUE_COLORS.secondary,
+            flexShrink: 0
+          }}
+        />
+        <div
+          style={{
+            padding: '12px 16px',
+            borderRadius: '12px',
+            backgroundColor: message.role === 'user' 
+              ? MINING_BLUE_COLORS.primary 
+              : 'white',
+            color: message.role === 'user' ? 'white' : 'black',
+            border: message.role === 'assistant' ? '1px solid #e8e8e8' : 'none',
+            boxShadow: '0 2px 4px rgba(0,0,0,0.1)'
+          }}
+        >
+          {message.role === 'user' ? (
+            <Paragraph 
+              style={{ 
+                margin: 0, 
+                color: 'white',
+                whiteSpace: 'pre-wrap'
+              }}
+            >
+              {message.content}
+            </Paragraph>
+          ) : (
+            <div style={{ 
+              color: 'black',
+              lineHeight: '1.6'
+            }}>
+              <MarkdownMessage messageId={message.id} content={message.content} />
+            </div>
+          )}
+          <div style={{ 
+            fontSize: '11px', 
+            marginTop: '8px',
+            opacity: 0.7,
+            color: message.role === 'user' ? 'rgba(255,255,255,0.8)' : '#999'
+          }}>
+            {message.timestamp.toLocaleTimeString()}
+          </div>
+        </div>
+      </div>
+    </div>
+  ), []);
 
   // 创建新会话
   const createNewSession = async () => {
@@ -137,7 +239,7 @@ const NewAIChatPage: React.FC = () => {
     try {
       await sendMessage(messageContent);
     } catch (error) {
-      console.error('发送消息失败:', error);
+      logger.error('发送消息失败:', error);
       message.error('发送消息失败，请稍后再试');
     }
   };
@@ -235,11 +337,14 @@ const NewAIChatPage: React.FC = () => {
                 </div>
 
                 {/* 会话列表 */}
-                <div style={{
-                  padding: '20px',
-                  flex: 1,
-                  overflow: 'auto'
-                }}>
+                <div
+                  style={{
+                    padding: '20px',
+                    flex: 1,
+                    overflow: 'auto'
+                  }}
+                  onScroll={handleSessionListScroll}
+                >
                   {sessions.length === 0 ? (
                     <Empty
                       description="暂无对话记录"
@@ -260,6 +365,7 @@ const NewAIChatPage: React.FC = () => {
                             transition: 'all 0.3s ease'
                           }}
                           onClick={() => switchSession(session.id)}
+                          onMouseEnter={() => prefetchSession(session.id)}
                           actions={[
                             <Popconfirm
                               title="确定删除这个会话吗？"
@@ -390,78 +496,16 @@ const NewAIChatPage: React.FC = () => {
                   minHeight: 0
                 }}
               >
-                <Space direction="vertical" size={16} style={{ width: '100%' }}>
-                  {currentSession?.messages?.map((message) => (
-                    <div
-                      key={message.id}
-                      style={{
-                        display: 'flex',
-                        justifyContent: message.role === 'user' ? 'flex-end' : 'flex-start'
-                      }}
-                    >
-                      <div
-                        style={{
-                          maxWidth: '80%',
-                          display: 'flex',
-                          alignItems: 'flex-start',
-                          gap: '8px',
-                          flexDirection: message.role === 'user' ? 'row-reverse' : 'row'
-                        }}
-                      >
-                        <Avatar
-                          icon={message.role === 'user' ? <UserOutlined /> : <RobotOutlined />}
-                          style={{
-                            backgroundColor: message.role === 'user' 
-                              ? MINING_BLUE_COLORS.primary 
-                              : MINING_BLUE_COLORS.secondary,
-                            flexShrink: 0
-                          }}
-                        />
-                        <div
-                          style={{
-                            padding: '12px 16px',
-                            borderRadius: '12px',
-                            backgroundColor: message.role === 'user' 
-                              ? MINING_BLUE_COLORS.primary 
-                              : 'white',
-                            color: message.role === 'user' ? 'white' : 'black',
-                            border: message.role === 'assistant' ? '1px solid #e8e8e8' : 'none',
-                            boxShadow: '0 2px 4px rgba(0,0,0,0.1)'
-                          }}
-                        >
-                          {message.role === 'user' ? (
-                            <Paragraph 
-                              style={{ 
-                                margin: 0, 
-                                color: 'white',
-                                whiteSpace: 'pre-wrap'
-                              }}
-                            >
-                              {message.content}
-                            </Paragraph>
-                          ) : (
-                            <div style={{ 
-                              color: 'black',
-                              lineHeight: '1.6'
-                            }}>
-                              <ReactMarkdown>
-                                {message.content}
-                              </ReactMarkdown>
-                            </div>
-                          )}
-                          <div style={{ 
-                            fontSize: '11px', 
-                            marginTop: '8px',
-                            opacity: 0.7,
-                            color: message.role === 'user' ? 'rgba(255,255,255,0.8)' : '#999'
-                          }}>
-                            {message.timestamp.toLocaleTimeString()}
-                          </div>
-                        </div>
-                      </div>
-                    </div>
-                  ))}
-                </Space>
+                {isLoadingMoreMessages && (
+                  <div style={{ textAlign: 'center', paddingBottom: 12 }}>
+                    <Spin size="small" />
+                  </div>
+                )}
+                <VirtualMessageList
+                  messages={currentSession?.messages || []}
+                  containerRef={chatContainerRef}
+                  renderMessage={renderMessage}
+                />
               </div>
 
               {/* 输入区域 */}
@@ -1,5 +1,5 @@
 // 主数据展示页面 - 整合数据管理功能
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   Layout,
@@ -31,11 +31,14 @@ import {
   SearchOutlined,
   FilterOutlined
 } from '@ant-design/icons';
-import { SafetyData, UploadSafetyDataRequest } from '../../types/safety';
+import { SafetyData, SafetyLevel, MineType, SafetyCategory, UploadSafetyDataRequest } from '../../types/safety';
 import { useSafetyDataStore } from '../../store/safetyDataStore';
 import { useAuthStore } from '../../store/authStore';
+import { useDebounce } from '../../hooks/useDebounce';
+import { preloadRoute } from '../../routes';
 import DataForm from '../../components/DataManagement/DataForm';
 import { MINING_BLUE_COLORS } from '../../config/theme';
+import { logger } from '../../services/logger';
 
 const { Content } = Layout;
 const { Title, Text } = Typography;
@@ -68,41 +71,65 @@ const categoryConfig = {
   environmental_protection: { color: 'lime', label: '环境保护' }
 };
 
+// 单页行数超过该值时启用虚拟滚动
+const VIRTUAL_ROW_THRESHOLD = 100;
+
 const Dashboard: React.FC = () => {
   const navigate = useNavigate();
   
   // 状态管理
   const [formVisible, setFormVisible] = useState(false);
   const [editingData, setEditingData] = useState<SafetyData | null>(null);
-  const [searchKeyword, setSearchKeyword] = useState('');
-  const [selectedCategory, setSelectedCategory] = useState<string>('');
-  const [selectedLevel, setSelectedLevel] = useState<string>('');
   
   const { 
-    data, 
+    data,
+    stats: summary,
+    pagination,
+    searchTerm,
+    filters,
+    setSearchTerm,
+    setFilters,
+    setPagination,
     addData, 
     updateData, 
     deleteData, 
     fetchData,
+    fetchStats,
     loading: storeLoading 
   } = useSafetyDataStore();
 
+  // 输入框立即响应，停止输入后再向后端查询
+  const [searchKeyword, setSearchKeyword] = useState(searchTerm);
+  const debouncedKeyword = useDebounce(searchKeyword, 300);
+
+  useEffect(() => {
+    if (debouncedKeyword !== useSafetyDataStore.getState().searchTerm) {
+      setSearchTerm(debouncedKeyword);
+    }
+  }, [debouncedKeyword, setSearchTerm]);
+
   // 获取认证状态和persist恢复状态
   const { isAuthenticated, hasHydrated, user } = useAuthStore();
 
+  // 已为哪个用户加载过数据，认证状态重复恢复时不再重复请求
+  const loadedUserId = useRef<number | null>(null);
+
   // 初始化数据加载 - 等待persist恢复完成后判断认证状态
   useEffect(() => {
     if (hasHydrated) {
-      if (isAuthenticated && !storeLoading) {
-        console.log('🔄 Dashboard认证恢复完成，开始加载数据');
+      if (isAuthenticated && user && loadedUserId.current !== user.id) {
+        loadedUserId.current = user.id;
+        logger.debug('🔄 Dashboard认证恢复完成，开始加载数据');
         fetchData();
+        fetchStats();
       } else if (!isAuthenticated) {
-        console.log('⚠️ 用户未认证，跳过数据加载');
+        loadedUserId.current = null;
+        logger.debug('⚠️ 用户未认证，跳过数据加载');
       }
     } else {
-      console.log('⏳ 等待认证状态恢复...');
+      logger.debug('⏳ 等待认证状态恢复...');
     }
-  }, [hasHydrated, isAuthenticated, fetchData]); // 添加hasHydrated依赖
+  }, [hasHydrated, isAuthenticated, user, fetchData, fetchStats]);
 
   // 处理添加数据
   const handleAdd = () => {
@@ -160,27 +187,38 @@ const Dashboard: React.FC = () => {
     }
   };
 
-  // 筛选数据
-  const filteredData = data.filter(item => {
-    const matchKeyword = !searchKeyword || 
-      item.title.toLowerCase().includes(searchKeyword.toLowerCase()) ||
-      item.description.toLowerCase().includes(searchKeyword.toLowerCase());
-    
-    const matchCategory = !selectedCategory || item.category === selectedCategory;
-    const matchLevel = !selectedLevel || item.safetyLevel === selectedLevel;
-    
-    return matchKeyword && matchCategory && matchLevel;
-  });
+  // 单页行数较多时启用antd虚拟表格，只渲染可视区域内的行
+  const isVirtualTable = data.length > VIRTUAL_ROW_THRESHOLD;
+
+  // 翻页和修改每页条数都向后端请求对应的一页，修改每页条数时回到第一页
+  const handleTableChange = (page: number, size: number) => {
+    setPagination({ current: size !== pagination.pageSize ? 1 : page, pageSize: size });
+    fetchData();
+  };
 
-  // 统计数据
+  // 统计数据 - 来自后端聚合的全库计数，统计尚未返回时总数先使用列表接口的total
+  const levelCounts: Partial<Record<SafetyLevel, number>> = summary?.safetyLevelCounts || {};
   const stats = {
-    total: data.length,
-    low: data.filter(item => item.safetyLevel === 'low').length,
-    medium: data.filter(item => item.safetyLevel === 'medium').length,
-    high: data.filter(item => item.safetyLevel === 'high').length,
-    critical: data.filter(item => item.safetyLevel === 'critical').length
+    total: summary?.totalItems ?? pagination.total,
+    low: levelCounts.low || 0,
+    medium: levelCounts.medium || 0,
+    high: levelCounts.high || 0,
+    critical: levelCounts.critical || 0
   };
 
+  // 按矿区类型和安全类别的分布，悬停总资料数时显示
+  const breakdownTooltip = summary && (
+    <div>
+      {Object.entries(mineTypeConfig).map(([key, config]) => (
+        <div key={key}>{config.label}：{summary.mineTypeCounts[key as MineType] || 0}</div>
+      ))}
+      <div style={{ borderTop: '1px solid rgba(255,255,255,0.3)', margin: '4px 0' }} />
+      {Object.entries(categoryConfig).map(([key, config]) => (
+        <div key={key}>{config.label}：{summary.categoryCounts[key as SafetyCategory] || 0}</div>
+      ))}
+    </div>
+  );
+
   // 表格列配置
   const columns = [
     {
@@ -248,6 +286,7 @@ const Dashboard: React.FC = () => {
               size="small"
               icon={<EyeOutlined />}
               onClick={() => handleView(record)}
+              onMouseEnter={() => preloadRoute('/data-detail')}
             >
               详情
             </Button>
@@ -306,17 +345,19 @@ const Dashboard: React.FC = () => {
         {/* 统计卡片 */}
         <Row gutter={16} style={{ marginBottom: 24 }}>
           <Col span={6}>
-            <Card>
-              <div style={{ display: 'flex', alignItems: 'center' }}>
-                <FileTextOutlined style={{ fontSize: 24, color: MINING_BLUE_COLORS.primary, marginRight: 12 }} />
-                <div>
-                  <Text type="secondary">总资料数</Text>
-                  <div style={{ fontSize: 24, fontWeight: 'bold', color: MINING_BLUE_COLORS.primary }}>
-                    {stats.total}
+            <Tooltip title={breakdownTooltip} placement="bottom">
+              <Card>
+                <div style={{ display: 'flex', alignItems: 'center' }}>
+                  <FileTextOutlined style={{ fontSize: 24, color: MINING_BLUE_COLORS.primary, marginRight: 12 }} />
+                  <div>
+                    <Text type="secondary">总资料数</Text>
+                    <div style={{ fontSize: 24, fontWeight: 'bold', color: MINING_BLUE_COLORS.primary }}>
+                      {stats.total}
+                    </div>
                   </div>
                 </div>
-              </div>
-            </Card>
+              </Card>
+            </Tooltip>
           </Col>
           <Col span={6}>
             <Card>
@@ -402,8 +443,8 @@ const Dashboard: React.FC = () => {
                   placeholder="安全类别"
                   allowClear
                   style={{ width: 120 }}
-                  value={selectedCategory}
-                  onChange={setSelectedCategory}
+                  value={filters.category}
+                  onChange={(value?: SafetyCategory) => setFilters({ category: value })}
                 >
                   {Object.entries(categoryConfig).map(([key, config]) => (
                     <Option key={key} value={key}>
@@ -415,8 +456,8 @@ const Dashboard: React.FC = () => {
                   placeholder="安全等级"
                   allowClear
                   style={{ width: 120 }}
-                  value={selectedLevel}
-                  onChange={setSelectedLevel}
+                  value={filters.safetyLevel}
+                  onChange={(value?: SafetyLevel) => setFilters({ safetyLevel: value })}
                 >
                   {Object.entries(safetyLevelConfig).map(([key, config]) => (
                     <Option key={key} value={key}>
@@ -433,18 +474,22 @@ const Dashboard: React.FC = () => {
         <Card>
           <Table
             columns={columns}
-            dataSource={filteredData}
+            dataSource={data}
             rowKey="id"
             loading={storeLoading}
             pagination={{
-              total: filteredData.length,
-              pageSize: 10,
+              current: pagination.current,
+              pageSize: pagination.pageSize,
+              total: pagination.total,
+              pageSizeOptions: ['10', '20', '50', '100', '500', '1000'],
+              onChange: handleTableChange,
               showSizeChanger: true,
               showQuickJumper: true,
               showTotal: (total, range) => 
                 `第 ${range[0]}-${range[1]} 条，共 ${total} 条资料`
             }}
-            scroll={{ x: 1200 }}
+            virtual={isVirtualTable}
+            scroll={isVirtualTable ? { x: 1200, y: 600 } : { x: 1200 }}
           />
         </Card>
 
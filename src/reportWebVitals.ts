@@ -13,3 +13,125 @@ const reportWebVitals = (onPerfEntry?: ReportHandler) => {
 };
 
 export default reportWebVitals;
+
+// ================================
+// 启动性能报告
+// ================================
+
+export interface StartupTimingReport {
+  // 导航阶段（毫秒，相对页面开始加载）
+  ttfb: number | null;
+  domContentLoaded: number | null;
+  load: number | null;
+  // Web Vitals
+  fcp: number | null;
+  lcp: number | null;
+  fid: number | null;
+  cls: number | null;
+  // 应用阶段标记，如 app-start、app-mounted
+  marks: Record<string, number>;
+  // 各页面代码块的加载耗时
+  routeChunks: Record<string, number>;
+  // 首屏期间下载的脚本
+  scripts: { count: number; transferKB: number };
+}
+
+// 页面加载完成后等待一段时间再生成报告，以便收集到LCP
+const REPORT_DELAY = 3000;
+
+const vitals: Record<string, number> = {};
+const marks: Record<string, number> = {};
+
+/**
+ * 记录应用启动阶段的时间点
+ */
+export const markStartup = (name: string) => {
+  if (typeof performance === 'undefined') return;
+  if (marks[name] === undefined) {
+    marks[name] = performance.now();
+    performance.mark?.(name);
+  }
+};
+
+const roundMs = (value: number | undefined) => (value === undefined ? null : Math.round(value));
+
+const buildReport = (): StartupTimingReport => {
+  const navigation = performance.getEntriesByType?.('navigation')[0] as PerformanceNavigationTiming | undefined;
+
+  const routeChunks: Record<string, number> = {};
+  performance.getEntriesByType?.('measure')
+    .filter(entry => entry.name.startsWith('route-chunk:'))
+    .forEach(entry => {
+      routeChunks[entry.name.replace('route-chunk:', '')] = Math.round(entry.duration);
+    });
+
+  const scripts = (performance.getEntriesByType?.('resource') as PerformanceResourceTiming[] || [])
+    .filter(entry => entry.initiatorType === 'script' || entry.name.endsWith('.js'));
+
+  return {
+    ttfb: roundMs(navigation?.responseStart),
+    domContentLoaded: roundMs(navigation?.domContentLoadedEventEnd),
+    load: roundMs(navigation?.loadEventEnd || undefined),
+    fcp: roundMs(vitals.FCP),
+    lcp: roundMs(vitals.LCP),
+    fid: roundMs(vitals.FID),
+    cls: vitals.CLS === undefined ? null : Number(vitals.CLS.toFixed(3)),
+    marks: Object.fromEntries(Object.entries(marks).map(([name, time]) => [name, Math.round(time)])),
+    routeChunks,
+    scripts: {
+      count: scripts.length,
+      transferKB: Math.round(scripts.reduce((total, entry) => total + (entry.transferSize || 0), 0) / 1024)
+    }
+  };
+};
+
+/**
+ * 生成启动性能报告 - 基于reportWebVitals收集Web Vitals，结合导航计时和应用阶段标记
+ * 开发环境输出到控制台；生产环境保存在 window.__STARTUP_TIMING__，并通过onReport回调上报
+ */
+export const reportStartupTiming = (onReport?: (report: StartupTimingReport) => void) => {
+  if (typeof window === 'undefined' || typeof performance === 'undefined') return;
+
+  reportWebVitals(metric => {
+    vitals[metric.name] = metric.value;
+  });
+
+  let reported = false;
+  const report = () => {
+    if (reported) return;
+    reported = true;
+    document.removeEventListener('visibilitychange', onHidden);
+
+    const result = buildReport();
+    (window as any).__STARTUP_TIMING__ = result;
+
+    if (process.env.NODE_ENV === 'development') {
+      console.log('🚀 启动性能报告');
+      console.table({
+        TTFB: result.ttfb,
+        DOMContentLoaded: result.domContentLoaded,
+        Load: result.load,
+        FCP: result.fcp,
+        LCP: result.lcp,
+        ...Object.fromEntries(Object.entries(result.marks).map(([name, time]) => [`mark:${name}`, time])),
+        ...Object.fromEntries(Object.entries(result.routeChunks).map(([name, time]) => [`chunk:${name}`, time]))
+      });
+      console.log(`📦 首屏脚本 ${result.scripts.count} 个，共 ${result.scripts.transferKB}KB`);
+    }
+
+    onReport?.(result);
+  };
+
+  // 用户在报告生成前离开页面时，立即生成报告
+  const onHidden = () => {
+    if (document.visibilityState === 'hidden') report();
+  };
+  document.addEventListener('visibilitychange', onHidden);
+
+  const scheduleReport = () => window.setTimeout(report, REPORT_DELAY);
+  if (document.readyState === 'complete') {
+    scheduleReport();
+  } else {
+    window.addEventListener('load', scheduleReport, { once: true });
+  }
+};
@@ -0,0 +1,119 @@
+// 路由级代码分割 - 页面按需加载，并支持悬停或空闲时预加载
+import React, { lazy } from 'react';
+import { logger } from './services/logger';
+
+type PageModule = { default: React.ComponentType<any> };
+
+export type PreloadableComponent = React.LazyExoticComponent<React.ComponentType<any>> & {
+  preload: () => Promise<PageModule>;
+};
+
+/**
+ * 创建可预加载的懒加载组件，同一页面只会请求一次
+ * 加载耗时以 route-chunk:<name> 记录到Performance Timeline，供启动性能报告使用
+ */
+const lazyWithPreload = (name: string, factory: () => Promise<PageModule>): PreloadableComponent => {
+  let loading: Promise<PageModule> | null = null;
+
+  const load = () => {
+    if (!loading) {
+      const startMark = `route-chunk:${name}:start`;
+      performance.mark?.(startMark);
+      loading = factory()
+        .then(module => {
+          performance.measure?.(`route-chunk:${name}`, startMark);
+          return module;
+        })
+        .catch(error => {
+          // 加载失败（如网络中断）时允许下次重试
+          loading = null;
+          throw error;
+        });
+    }
+    return loading;
+  };
+
+  const component = lazy(load) as PreloadableComponent;
+  component.preload = load;
+  return component;
+};
+
+export const LoginPage = lazyWithPreload('login', () =>
+  import(/* webpackChunkName: "page-login" */ './pages/Login'));
+
+export const DashboardPage = lazyWithPreload('dashboard', () =>
+  import(/* webpackChunkName: "page-dashboard" */ './pages/Dashboard/Dashboard'));
+
+// AI问答页面包含react-markdown等聊天依赖，只在进入或预加载该页面时下载
+export const NewAIChatPage = lazyWithPreload('ai-chat', () =>
+  import(/* webpackChunkName: "page-ai-chat" */ './pages/AIChat/NewAIChat'));
+
+export const FeedbackPage = lazyWithPreload('feedback', () =>
+  import(/* webpackChunkName: "page-feedback" */ './pages/Feedback/FeedbackPage'));
+
+export const DataDetailPage = lazyWithPreload('data-detail', () =>
+  import(/* webpackChunkName: "page-data-detail" */ './pages/DataDetail/DataDetailPage'));
+
+// 路径前缀 -> 页面组件，用于菜单悬停预加载
+const ROUTE_COMPONENTS: Array<[string, PreloadableComponent]> = [
+  ['/login', LoginPage],
+  ['/ai-chat', NewAIChatPage],
+  ['/feedback', FeedbackPage],
+  ['/data-detail', DataDetailPage],
+  ['/', DashboardPage]
+];
+
+/**
+ * 预加载指定路径对应的页面代码
+ */
+export const preloadRoute = (path: string) => {
+  const match = ROUTE_COMPONENTS.find(([prefix]) =>
+    prefix === '/' ? path === '/' : path === prefix || path.startsWith(`${prefix}/`)
+  );
+  match?.[1].preload().catch(error => {
+    logger.warn('⚠️ 页面预加载失败:', path, error);
+  });
+};
+
+// 省流量模式或慢速网络下不做空闲预加载
+const shouldPrefetchOnIdle = (): boolean => {
+  const connection = (navigator as any).connection;
+  if (!connection) return true;
+  if (connection.saveData) return false;
+  return !['slow-2g', '2g'].includes(connection.effectiveType);
+};
+
+/**
+ * 浏览器空闲时依次预加载常用页面，返回取消函数
+ */
+export const prefetchRoutesOnIdle = (paths: string[] = ['/', '/data-detail', '/feedback', '/ai-chat']) => {
+  if (typeof window === 'undefined' || !shouldPrefetchOnIdle()) {
+    return () => {};
+  }
+
+  const queue = [...paths];
+  let handle: number | null = null;
+  const w = window as any;
+  const schedule = (callback: () => void) =>
+    typeof w.requestIdleCallback === 'function'
+      ? w.requestIdleCallback(callback, { timeout: 5000 })
+      : window.setTimeout(callback, 2000);
+  const cancel = (id: number) =>
+    typeof w.cancelIdleCallback === 'function' ? w.cancelIdleCallback(id) : window.clearTimeout(id);
+
+  // 每次空闲只加载一个页面，避免与首屏请求争抢带宽
+  const next = () => {
+    const path = queue.shift();
+    if (!path) {
+      handle = null;
+      return;
+    }
+    preloadRoute(path);
+    handle = schedule(next);
+  };
+
+  handle = schedule(next);
+  return () => {
+    if (handle !== null) cancel(handle);
+  };
+};
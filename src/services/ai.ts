@@ -10,6 +10,8 @@ import {
   FeedbackStats
 } from '../types/ai';
 import { API_CONFIG } from '../config/api';
+import { metrics, METRIC_NAMES } from './metrics';
+import { logger } from './logger';
 
 // AI服务状态检查
 export const aiHealthCheck = {
@@ -31,6 +33,7 @@ export const aiHealthCheck = {
       } as any);
 
       const latency = Date.now() - startTime;
+      metrics.observe(METRIC_NAMES.API_LATENCY, latency, 'GET /chat/health');
 
       if (response.ok) {
         const data = await response.json();
@@ -47,7 +50,7 @@ export const aiHealthCheck = {
         };
       }
     } catch (error) {
-      console.error('❌ [aiHealthCheck] AI服务健康检查失败:', error);
+      logger.error('❌ [aiHealthCheck] AI服务健康检查失败:', error);
       
       if (error instanceof TypeError && error.message.includes('fetch')) {
         return {
@@ -130,9 +133,13 @@ export const aiApi = {
     onError: (error: string) => void
   ): Promise<void> => {
     try {
-      console.log('🔗 [aiApi] 准备调用后端SSE聊天接口');
-      console.log('🔗 [aiApi] 参数:', { message: message.substring(0, 50) + '...', sessionId });
+      logger.debug('🔗 [aiApi] 准备调用后端SSE聊天接口');
+      logger.debug('🔗 [aiApi] 参数:', { message: message.substring(0, 50) + '...', sessionId });
       
+      // 首字节耗时从发起请求开始计算，包含后端排队和模型首次输出的时间
+      const requestStartTime = performance.now();
+      let firstByteReceived = false;
+
       // 发送POST请求到后端AI接口
       const response = await fetch(`${API_CONFIG.BASE_URL}/chat/ai`, {
         method: 'POST',
@@ -148,7 +155,7 @@ export const aiApi = {
 
       if (!response.ok) {
         const errorText = await response.text();
-        console.error('❌ [aiApi] 后端API请求失败:', response.status, response.statusText);
+        logger.error('❌ [aiApi] 后端API请求失败:', response.status, response.statusText);
         onError(`后端服务错误: ${response.status} ${response.statusText}\n${errorText}`);
         return;
       }
@@ -156,7 +163,7 @@ export const aiApi = {
       // 检查响应是否为SSE流
       const contentType = response.headers.get('content-type');
       if (!contentType || !contentType.includes('text/plain')) {
-        console.warn('⚠️ [aiApi] 响应Content-Type不是text/plain，可能不是SSE格式');
+        logger.warn('⚠️ [aiApi] 响应Content-Type不是text/plain，可能不是SSE格式');
       }
 
       const reader = response.body?.getReader();
@@ -169,22 +176,22 @@ export const aiApi = {
       let buffer = '';
       let completed = false;
 
-      console.log('✅ [aiApi] 开始处理SSE流式响应');
+      logger.debug('✅ [aiApi] 开始处理SSE流式响应');
 
       // 包装onComplete以确保只调用一次
       const wrappedOnComplete = async () => {
         if (completed) return;
         completed = true;
         
-        console.log('🔗 [aiApi] 流式响应完成，调用onComplete');
+        logger.debug('🔗 [aiApi] 流式响应完成，调用onComplete');
         try {
           const result = onComplete();
           if (result && typeof result.then === 'function') {
             await result;
           }
-          console.log('✅ [aiApi] onComplete执行完成');
+          logger.debug('✅ [aiApi] onComplete执行完成');
         } catch (error) {
-          console.error('❌ [aiApi] onComplete回调执行失败:', error);
+          logger.error('❌ [aiApi] onComplete回调执行失败:', error);
           throw error;
         }
       };
@@ -194,11 +201,16 @@ export const aiApi = {
           const { done, value } = await reader.read();
 
           if (done) {
-            console.log('📥 [aiApi] 流式响应自然结束');
+            logger.debug('📥 [aiApi] 流式响应自然结束');
             await wrappedOnComplete();
             return;
           }
 
+          if (!firstByteReceived) {
+            firstByteReceived = true;
+            metrics.observe(METRIC_NAMES.SSE_TTFB, performance.now() - requestStartTime, 'POST /chat/ai');
+          }
+
           buffer += decoder.decode(value, { stream: true });
           const lines = buffer.split('\n');
           buffer = lines.pop() || ''; // 保留最后一行不完整的内容
@@ -207,8 +219,6 @@ export const aiApi = {
             const trimmedLine = line.trim();
             if (!trimmedLine) continue;
 
-            console.log('🔍 [aiApi] SSE原始行:', trimmedLine);
-
             // 解析SSE格式: id:xxx event:xxx data:xxx
             try {
               // 简化的SSE解析，假设每行都是完整的事件
@@ -217,10 +227,10 @@ export const aiApi = {
                 continue;
               } else if (trimmedLine.startsWith('event:')) {
                 const event = trimmedLine.substring(6).trim();
-                console.log('📧 [aiApi] SSE事件类型:', event);
+                logger.debug('📧 [aiApi] SSE事件类型:', event);
                 
                 if (event === 'done') {
-                  console.log('🎯 [aiApi] 收到done事件，结束流式响应');
+                  logger.debug('🎯 [aiApi] 收到done事件，结束流式响应');
                   await wrappedOnComplete();
                   return;
                 }
@@ -228,32 +238,30 @@ export const aiApi = {
                 const data = trimmedLine.substring(5).trim();
                 
                 if (data === 'done') {
-                  console.log('🎯 [aiApi] 收到done数据，结束流式响应');
+                  logger.debug('🎯 [aiApi] 收到done数据，结束流式响应');
                   await wrappedOnComplete();
                   return;
                 }
                 
                 if (data && data.length > 0) {
-                  console.log('📝 [aiApi] 收到数据块:', data.length, '字符');
                   onChunk(data);
                 }
               } else {
                 // 可能是没有前缀的纯数据
-                console.log('📝 [aiApi] 收到纯数据:', trimmedLine.length, '字符');
                 onChunk(trimmedLine);
               }
             } catch (parseError) {
-              console.warn('⚠️ [aiApi] SSE行解析失败:', trimmedLine, parseError);
+              logger.warn('⚠️ [aiApi] SSE行解析失败:', trimmedLine, parseError);
             }
           }
         }
       } catch (streamError) {
-        console.error('❌ [aiApi] 流处理异常:', streamError);
+        logger.error('❌ [aiApi] 流处理异常:', streamError);
         await wrappedOnComplete(); // 确保即使出错也调用完成回调
         throw streamError;
       }
     } catch (error) {
-      console.error('❌ [aiApi] AI流式对话失败:', error);
+      logger.error('❌ [aiApi] AI流式对话失败:', error);
       onError(error instanceof Error ? error.message : '聊天服务异常');
     }
   },
@@ -264,7 +272,7 @@ export const aiApi = {
       // 后端只支持流式响应，非流式聊天已废弃
       throw new Error('非流式聊天已废弃，请使用chatStream方法');
     } catch (error) {
-      console.error('AI对话失败:', error);
+      logger.error('AI对话失败:', error);
       return handleApiError(error);
     }
   },
@@ -273,10 +281,10 @@ export const aiApi = {
   saveSession: async (sessionId: string, messages: ChatMessage[]): Promise<void> => {
     try {
       // 这里可以调用后端API保存会话
-      console.log('保存会话:', sessionId, '消息数量:', messages.length);
+      logger.debug('保存会话:', sessionId, '消息数量:', messages.length);
       // await apiClient.post('/ai/sessions', { sessionId, messages });
     } catch (error) {
-      console.warn('保存会话失败:', error);
+      logger.warn('保存会话失败:', error);
     }
   },
 
@@ -284,12 +292,12 @@ export const aiApi = {
   getSessions: async (userId: number): Promise<ChatSession[]> => {
     try {
       // 这里可以从后端API获取会话列表
-      console.log('获取用户会话:', userId);
+      logger.debug('获取用户会话:', userId);
       // const response = await apiClient.get(`/ai/sessions?userId=${userId}`);
       // return handleApiResponse<ChatSession[]>(response);
       return [];
     } catch (error) {
-      console.warn('获取会话失败:', error);
+      logger.warn('获取会话失败:', error);
       return [];
     }
   },
@@ -298,7 +306,7 @@ export const aiApi = {
   getSession: async (sessionId: string): Promise<ChatSession> => {
     try {
       // 这里可以从后端API获取会话详情
-      console.log('获取会话详情:', sessionId);
+      logger.debug('获取会话详情:', sessionId);
       // const response = await apiClient.get(`/ai/sessions/${sessionId}`);
       // return handleApiResponse<ChatSession>(response);
       throw new Error('会话不存在');
@@ -311,10 +319,10 @@ export const aiApi = {
   deleteSession: async (sessionId: string): Promise<void> => {
     try {
       // 这里可以调用后端API删除会话
-      console.log('删除会话:', sessionId);
+      logger.debug('删除会话:', sessionId);
       // await apiClient.delete(`/ai/sessions/${sessionId}`);
     } catch (error) {
-      console.warn('删除会话失败:', error);
+      logger.warn('删除会话失败:', error);
     }
   },
 
@@ -324,7 +332,7 @@ export const aiApi = {
       const response = await fetch(`${API_CONFIG.BASE_URL}/health`);
       return response.ok;
     } catch (error) {
-      console.warn('AI服务状态检查失败:', error);
+      logger.warn('AI服务状态检查失败:', error);
       return false;
     }
   }
@@ -1,47 +1,10 @@
 // API服务层 - 统一管理所有API调用
-import axios, { AxiosInstance, AxiosResponse } from 'axios';
-import { Modal } from 'antd';
+import { AxiosInstance } from 'axios';
 import { SafetyData, SafetyLevel, MineType, SafetyCategory, UploadSafetyDataRequest } from '../types/safety';
-
-const isLoginRoute = () => typeof window !== 'undefined' && window.location.pathname === '/login';
-
-const isSessionModalVisible = () => typeof window !== 'undefined' && Boolean((window as any).__SESSION_EXPIRED_MODAL__);
-
-const setSessionModalVisible = (visible: boolean) => {
-  if (typeof window === 'undefined') return;
-  (window as any).__SESSION_EXPIRED_MODAL__ = visible;
-};
-
-const showSessionExpiredModal = () => {
-  if (typeof window === 'undefined' || isLoginRoute() || isSessionModalVisible()) {
-    return;
-  }
-
-  setSessionModalVisible(true);
-
-  Modal.warning({
-    title: '登录状态已过期',
-    content: '当前登录凭证已失效，请重新登录后继续使用矿区安全数据库。',
-    okText: '重新登录',
-    centered: true,
-    closable: false,
-    maskClosable: false,
-    onOk: () => {
-      setSessionModalVisible(false);
-      if (typeof window !== 'undefined') {
-        window.location.href = '/login';
-      }
-    },
-    afterClose: () => {
-      if (isSessionModalVisible()) {
-        setSessionModalVisible(false);
-      }
-      if (typeof window !== 'undefined' && window.location.pathname !== '/login') {
-        window.location.href = '/login';
-      }
-    }
-  });
-};
+import { apiClient, cachedGet } from './apiClient';
+import { requestCache, CacheOptions } from './requestCache';
+import { API_ENDPOINTS, API_ERROR_CODES, SAFETY_LEVELS, MINING_TYPES, SAFETY_CATEGORIES } from '../api/endpoints';
+import { logger } from './logger';
 
 // API响应基础接口 - 匹配后端AjaxResult格式
 interface ApiResponse<T = any> {
@@ -83,7 +46,7 @@ interface DashboardStats {
   safetyLevelCounts: Record<SafetyLevel, number>;
   mineTypeCounts: Record<MineType, number>;
   categoryCounts: Record<SafetyCategory, number>;
-  recentActivity: {
+  recentActivity?: {
     newItemsThisWeek: number;
     totalDownloadsThisMonth: number;
     mostViewedItems: string[];
@@ -95,146 +58,149 @@ interface UploadResponse {
   url: string;            // MinIO文件访问URL
 }
 
+// 缓存标签
+const CACHE_TAGS = {
+  SAFETY_LIST: 'safety-data:list',
+  safetyItem: (id: number) => `safety-data:${id}`,
+  SAFETY_STATS: 'safety-data:stats',
+  FEEDBACK: 'feedback',
+  PROFILE: 'user:profile'
+};
+
+// 缓存时间配置（毫秒）
+const CACHE_TTL = {
+  SAFETY_LIST: 30 * 1000,
+  SAFETY_ITEM: 60 * 1000,
+  SAFETY_STATS: 5 * 60 * 1000,
+  FEEDBACK: 15 * 1000,
+  PROFILE: 5 * 60 * 1000
+};
+
 class ApiService {
-  private client: AxiosInstance;
-  private baseURL: string;
+  // 与apiClient共用同一个axios实例，认证、错误处理和耗时统计统一在apiClient中完成
+  private client: AxiosInstance = apiClient;
+  // 后端没有统计接口时，本次会话内不再请求，直接使用降级方案
+  private statsEndpointMissing = false;
 
-  constructor() {
-    this.baseURL = process.env.REACT_APP_API_BASE_URL || 'http://117.72.145.157:8081/api';
-    
-    this.client = axios.create({
-      baseURL: this.baseURL,
-      timeout: 10000,
-      headers: {
-        'Content-Type': 'application/json',
-        'Accept': 'application/json',
-        'X-Client-Version': '1.0.0'
-      }
+  // 安全资料相关API
+  // 列表按查询参数缓存，过期后先返回旧数据并在后台刷新，刷新结果通过options.onRevalidated通知
+  async getSafetyData(
+    query?: SafetyDataQuery,
+    options: Pick<CacheOptions<PaginatedResponse<SafetyData>>, 'force' | 'onRevalidated'> = {}
+  ): Promise<PaginatedResponse<SafetyData>> {
+    return cachedGet<PaginatedResponse<SafetyData>>('/safety-data/list', query, {
+      ...options,
+      ttl: CACHE_TTL.SAFETY_LIST,
+      tags: [CACHE_TAGS.SAFETY_LIST]
     });
-
-    this.setupInterceptors();
   }
 
-  // 设置请求和响应拦截器
-  private setupInterceptors() {
-    // 请求拦截器 - 添加认证token
-    this.client.interceptors.request.use(
-      (config) => {
-        // 调试日志：显示请求的完整信息
-        console.log('🚀 发送API请求:', config.method?.toUpperCase(), config.url);
-        console.log('🚀 Base URL:', config.baseURL);
-        console.log('🚀 完整URL:', (config.baseURL || '') + (config.url || ''));
-        
-        const token = localStorage.getItem('auth_token');
-        if (token) {
-          config.headers.Authorization = `Bearer ${token}`;
-          // 🔍 详细JWT调试 - 对比Apifox格式
-          console.log('🔐 JWT Token详情:', {
-            tokenExists: true,
-            tokenLength: token.length,
-            tokenPrefix: token.substring(0, 20) + '...',
-            authorizationHeader: `Bearer ${token.substring(0, 20)}...`,
-            fullAuthHeader: config.headers.Authorization
-          });
-        } else {
-          console.log('❌ 缺少JWT Token');
-        }
-        return config;
-      },
-      (error) => {
-        return Promise.reject(error);
-      }
-    );
+  // 详情接口会增加浏览次数，只合并同时发出的相同请求，不缓存结果
+  async getSafetyDataById(id: number): Promise<SafetyData> {
+    return cachedGet<SafetyData>('/safety-data', { safetyDataId: id }, {
+      ttl: 0,
+      staleTime: 0,
+      tags: [CACHE_TAGS.safetyItem(id)]
+    });
+  }
 
-    // 响应拦截器 - 统一处理错误
-    this.client.interceptors.response.use(
-      (response: AxiosResponse<ApiResponse>) => {
-        const { data } = response;
-        console.log('📥 收到API响应:', response.config.url);
-        console.log('- HTTP状态:', response.status);
-        console.log('- 业务代码:', data.code);
-        console.log('- 消息:', data.msg);
-        console.log('- 数据:', data.data);
-        
-        // 检查业务逻辑错误 - 兼容两种后端响应格式
-        // 成功: code === 0 或 code === 200
-        // 失败: code !== 0 && code !== 200
-        if (data.code !== 0 && data.code !== 200) {
-          console.error('❌ 业务逻辑错误 - 响应拦截器:', {
-            url: response.config.url,
-            httpStatus: response.status,
-            businessCode: data.code,
-            message: data.msg,
-            data: data.data
-          });
-          const error = new Error(data.msg || '请求失败');
-          return Promise.reject(error);
+  // 统计汇总 - 后端聚合，不下载资料记录；增删改由调用方通过patchDashboardStats在本地修正计数
+  // 后端未提供统计接口时降级为countByListTotals，每次缓存过期需要约15个列表请求
+  async getDashboardStats(
+    options: Pick<CacheOptions<DashboardStats>, 'force' | 'onRevalidated'> = {}
+  ): Promise<DashboardStats> {
+    return requestCache.get<DashboardStats>(
+      CACHE_TAGS.SAFETY_STATS,
+      async () => {
+        if (this.statsEndpointMissing) {
+          return this.countByListTotals();
         }
-        return response;
-      },
-      (error) => {
-        if (error.response?.status === 401) {
-          if (!isLoginRoute()) {
-            console.log('检测到401错误，触发登出流程');
-            import('../store/authStore').then(({ useAuthStore }) => {
-              const authStore = useAuthStore.getState();
-              authStore.logout();
-            });
-            showSessionExpiredModal();
+        try {
+          const response = await this.client.get<ApiResponse<DashboardStats>>(API_ENDPOINTS.SAFETY_DATA.STATS);
+          return response.data.data;
+        } catch (error: any) {
+          if (error.response?.status !== API_ERROR_CODES.NOT_FOUND && error.code !== API_ERROR_CODES.NOT_FOUND_ERROR) {
+            throw error;
           }
-        } else if (error.response?.status >= 500) {
-          // 服务器错误，显示友好提示
-          console.error('服务器错误:', error.response?.status);
-        } else if (!error.response) {
-          // 网络错误，不触发登出
-          console.error('网络连接错误:', error.message);
+          logger.warn('⚠️ 后端未提供统计接口，本次会话改用列表接口的总数汇总');
+          this.statsEndpointMissing = true;
+          return this.countByListTotals();
         }
-        return Promise.reject(error);
+      },
+      {
+        ...options,
+        ttl: CACHE_TTL.SAFETY_STATS,
+        tags: [CACHE_TAGS.SAFETY_STATS]
       }
     );
   }
 
-  // 安全资料相关API
-  async getSafetyData(query?: SafetyDataQuery): Promise<PaginatedResponse<SafetyData>> {
-    const response = await this.client.get<ApiResponse<PaginatedResponse<SafetyData>>>(
-      '/safety-data/list',
-      { params: query }
-    );
-    return response.data.data;
+  // 本地修正缓存中的统计数据，使重新进入页面时读到的缓存与本地修正一致
+  patchDashboardStats(updater: (stats: DashboardStats) => DashboardStats): void {
+    requestCache.update<DashboardStats>(CACHE_TAGS.SAFETY_STATS, updater);
   }
 
-  async getSafetyDataById(id: number): Promise<SafetyData> {
-    const response = await this.client.get<ApiResponse<SafetyData>>(
-      '/safety-data',
-      { params: { safetyDataId: id } }
-    );
-    return response.data.data;
+  // 降级方案：每个筛选值只请求一条记录，读取列表响应中的total
+  // 请求数为 1（总数）+ 安全等级数 + 矿区类型数 + 安全类别数，目前为 1 + 4 + 4 + 6 = 15 个并行请求，
+  // 结果与统计接口一样按CACHE_TTL.SAFETY_STATS缓存，增删改在本地修正，不会额外触发这些请求
+  private async countByListTotals(): Promise<DashboardStats> {
+    const countTotal = async (params: Record<string, string> = {}) => {
+      const response = await this.client.get<ApiResponse<PaginatedResponse<SafetyData>>>(
+        API_ENDPOINTS.SAFETY_DATA.LIST,
+        { params: { page: 1, pageSize: 1, ...params } }
+      );
+      return response.data.data.total || 0;
+    };
+    const countEach = async <K extends string>(field: string, values: K[]) => {
+      const totals = await Promise.all(values.map(value => countTotal({ [field]: value })));
+      return values.reduce((counts, value, index) => {
+        counts[value] = totals[index];
+        return counts;
+      }, {} as Record<K, number>);
+    };
+
+    const [totalItems, safetyLevelCounts, mineTypeCounts, categoryCounts] = await Promise.all([
+      countTotal(),
+      countEach('safetyLevel', Object.values(SAFETY_LEVELS) as SafetyLevel[]),
+      countEach('mineType', Object.values(MINING_TYPES) as MineType[]),
+      countEach('category', Object.values(SAFETY_CATEGORIES) as SafetyCategory[])
+    ]);
+    return { totalItems, safetyLevelCounts, mineTypeCounts, categoryCounts };
   }
 
   async createSafetyData(data: UploadSafetyDataRequest | Omit<SafetyData, 'id'>): Promise<SafetyData> {
     const response = await this.client.post<ApiResponse<SafetyData>>('/safety-data', data);
+    // 新数据会改变列表的分页和总数
+    requestCache.invalidate(CACHE_TAGS.SAFETY_LIST);
     return response.data.data;
   }
 
   async updateSafetyData(data: SafetyData): Promise<void> {
     await this.client.put('/safety-data', data);
+    // 原位更新缓存中的列表，分页和总数不受影响
+    requestCache.update<PaginatedResponse<SafetyData>>(CACHE_TAGS.SAFETY_LIST, page => ({
+      ...page,
+      list: page.list.map(item => (item.id === data.id ? { ...item, ...data } : item))
+    }));
+    requestCache.invalidate(CACHE_TAGS.safetyItem(data.id));
   }
 
   async deleteSafetyData(id: number): Promise<void> {
     await this.client.delete('/safety-data', {
       params: { safetyDataId: id }
     });
+    requestCache.invalidate(CACHE_TAGS.SAFETY_LIST, CACHE_TAGS.safetyItem(id));
   }
 
   // 文件上传API
   async uploadFile(file: File): Promise<UploadResponse> {
-    console.log(`📁 开始上传文件: ${file.name}, 大小: ${(file.size / 1024 / 1024).toFixed(2)}MB`);
+    logger.debug(`📁 开始上传文件: ${file.name}, 大小: ${(file.size / 1024 / 1024).toFixed(2)}MB`);
     
     const formData = new FormData();
     formData.append('file', file);
     
     // FormData调试信息
-    console.log('📋 FormData信息:', {
+    logger.debug('📋 FormData信息:', {
       fieldName: 'file',
       fileName: file.name,
       fileSize: file.size,
@@ -255,11 +221,11 @@ class ApiService {
       
       // 验证响应数据完整性
       if (!response.data.data || !response.data.data.url) {
-        console.error('❌ 文件上传响应数据不完整:', response.data);
+        logger.error('❌ 文件上传响应数据不完整:', response.data);
         throw new Error('服务器返回的文件URL为空，上传可能失败');
       }
       
-      console.log('✅ 文件上传成功:', {
+      logger.debug('✅ 文件上传成功:', {
         fileName: file.name,
         fileSize: file.size,
         url: response.data.data.url,
@@ -269,13 +235,13 @@ class ApiService {
       
       return response.data.data;
     } catch (error: any) {
-      console.error('❌ 文件上传失败 - 详细信息:');
-      console.error('- 文件名:', file.name);
-      console.error('- 文件大小:', file.size);
-      console.error('- HTTP状态码:', error.response?.status);
-      console.error('- 响应头:', error.response?.headers);
-      console.error('- 响应数据:', JSON.stringify(error.response?.data, null, 2));
-      console.error('- 原始错误:', error.message);
+      logger.error('❌ 文件上传失败 - 详细信息:');
+      logger.error('- 文件名:', file.name);
+      logger.error('- 文件大小:', file.size);
+      logger.error('- HTTP状态码:', error.response?.status);
+      logger.error('- 响应头:', error.response?.headers);
+      logger.error('- 响应数据:', error.response?.data);
+      logger.error('- 原始错误:', error.message);
       
       // 提供更友好的错误信息
       if (error.response?.status === 413) {
@@ -298,6 +264,7 @@ class ApiService {
     contactInfo?: string;
   }): Promise<void> {
     await this.client.post('/feedback', feedback);
+    requestCache.invalidate(CACHE_TAGS.FEEDBACK);
   }
 
   async getFeedbackList(query?: {
@@ -306,15 +273,16 @@ class ApiService {
     status: 'all' | 'pending' | 'resolved' | 'closed';
     order: 'desc' | 'asc';
   }): Promise<PaginatedResponse<any>> {
-    const response = await this.client.get<ApiResponse<PaginatedResponse<any>>>(
-      '/feedback/list',
-      { params: query }
-    );
-    return response.data.data;
+    return cachedGet<PaginatedResponse<any>>('/feedback/list', query, {
+      ttl: CACHE_TTL.FEEDBACK,
+      tags: [CACHE_TAGS.FEEDBACK]
+    });
   }
 
   // 用户认证API
   async login(username: string, password: string): Promise<any> {
+    // 切换用户前清空缓存，避免读到上一个用户的数据
+    requestCache.clear();
     const response = await this.client.post<ApiResponse<any>>('/user/login', {
       username,
       password
@@ -332,15 +300,19 @@ class ApiService {
   }
 
   async getProfile(): Promise<any> {
-    const response = await this.client.get<ApiResponse<any>>('/user/profile');
-    return response.data.data;
+    return cachedGet<any>('/user/profile', undefined, {
+      ttl: CACHE_TTL.PROFILE,
+      tags: [CACHE_TAGS.PROFILE]
+    });
   }
 
   async updateProfile(profile: any): Promise<void> {
     await this.client.post('/user/profile', profile);
+    requestCache.invalidate(CACHE_TAGS.PROFILE);
   }
 
   async logout(): Promise<void> {
+    requestCache.clear();
     // 登出API调用（可选）
     // await this.client.post('/user/logout');
   }
@@ -351,25 +323,25 @@ class ApiService {
       await this.client.get('/file/download', {
         params: { objectURL }
       });
-      console.log('✅ 下载统计成功');
+      logger.debug('✅ 下载统计成功');
     } catch (error) {
-      console.warn('⚠️ 下载统计失败:', error);
+      logger.warn('⚠️ 下载统计失败:', error);
       // 统计失败不抛出错误，不影响实际下载
     }
   }
 
   // 获取反馈详情
   async getFeedbackDetail(feedbackId: number): Promise<any> {
-    const response = await this.client.get<ApiResponse<any>>('/feedback', {
-      params: { feedbackId }
+    return cachedGet<any>('/feedback', { feedbackId }, {
+      ttl: CACHE_TTL.FEEDBACK,
+      tags: [CACHE_TAGS.FEEDBACK]
     });
-    return response.data.data;
   }
 
   // 处理反馈
   async handleFeedback(feedbackId: number, status: string, reply: string): Promise<void> {
-    console.log('🔧 处理反馈请求参数:', { feedbackId, status, reply });
-    console.log('🔍 feedbackId详细信息:', {
+    logger.debug('🔧 处理反馈请求参数:', { feedbackId, status, reply });
+    logger.debug('🔍 feedbackId详细信息:', {
       '原始值': feedbackId,
       '类型': typeof feedbackId,
       '字符串形式': feedbackId.toString(),
@@ -384,11 +356,12 @@ class ApiService {
         reply
       });
       
-      console.log('✅ 反馈处理成功:', response.data);
+      logger.debug('✅ 反馈处理成功:', response.data);
+      requestCache.invalidate(CACHE_TAGS.FEEDBACK);
       return response.data.data;
     } catch (error: any) {
       // 特殊处理200008错误码 - 反馈已处理过
-      if (error.response?.data?.code === 200008) {
+      if (error.code === 200008 || error.response?.data?.code === 200008) {
         // 抛出特殊的错误对象，包含错误码信息
         const specialError = new Error('该反馈已经被处理过了');
         (specialError as any).code = 200008;
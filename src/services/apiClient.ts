@@ -1,7 +1,29 @@
-// API客户端配置
-import axios, { AxiosInstance } from 'axios';
+// API客户端配置 - 全部后端请求共用同一个axios实例
+import axios, { AxiosInstance, InternalAxiosRequestConfig } from 'axios';
 import { Modal } from 'antd';
 import { API_CONFIG } from '../config/api';
+import { requestCache, buildCacheKey, CacheOptions } from './requestCache';
+import { metrics, METRIC_NAMES } from './metrics';
+import { logger } from './logger';
+
+// 请求开始时间，用于统计接口耗时
+const requestStartTimes = new WeakMap<InternalAxiosRequestConfig, number>();
+
+const endpointOf = (config?: InternalAxiosRequestConfig) =>
+  `${(config?.method || 'get').toUpperCase()} ${config?.url || ''}`;
+
+const recordRequestEnd = (config: InternalAxiosRequestConfig | undefined, failed: boolean) => {
+  const startTime = config ? requestStartTimes.get(config) : undefined;
+  if (config && startTime !== undefined) {
+    const endpoint = endpointOf(config);
+    const durationMs = performance.now() - startTime;
+    metrics.observe(METRIC_NAMES.API_LATENCY, durationMs, endpoint);
+    if (failed) {
+      metrics.increment(METRIC_NAMES.API_ERRORS, endpoint);
+    }
+    requestStartTimes.delete(config);
+  }
+};
 
 const isLoginRoute = () => typeof window !== 'undefined' && window.location.pathname === '/login';
 
@@ -50,7 +72,9 @@ const createApiClient = (): AxiosInstance => {
     timeout: API_CONFIG.TIMEOUT,
     headers: {
       'Content-Type': 'application/json',
-      'X-Requested-With': 'XMLHttpRequest'
+      'Accept': 'application/json',
+      'X-Requested-With': 'XMLHttpRequest',
+      'X-Client-Version': '1.0.0'
     }
   });
 
@@ -63,11 +87,9 @@ const createApiClient = (): AxiosInstance => {
         config.headers.Authorization = `Bearer ${token}`;
       }
       
-      // 开发环境日志
-      if (process.env.NODE_ENV === 'development') {
-        console.log('🚀 API Request:', config.method?.toUpperCase(), config.url);
-      }
+      logger.debug('🚀 API Request:', config.method?.toUpperCase(), config.url);
       
+      requestStartTimes.set(config, performance.now());
       return config;
     },
     (error) => Promise.reject(error)
@@ -76,17 +98,29 @@ const createApiClient = (): AxiosInstance => {
   // 响应拦截器
   client.interceptors.response.use(
     (response) => {
-      // 开发环境日志
-      if (process.env.NODE_ENV === 'development') {
-        console.log('✅ API Response:', response.status, response.config.url);
+      logger.debug('✅ API Response:', response.status, response.config.url);
+
+      // 检查业务逻辑错误 - 兼容两种后端响应格式
+      // 成功: code === 0 或 code === 200
+      const code = response.data?.code;
+      if (typeof code === 'number' && code !== 0 && code !== 200) {
+        recordRequestEnd(response.config, true);
+        logger.error('❌ 业务逻辑错误:', response.config.url, code, response.data.msg);
+        const businessError = new Error(response.data.msg || '请求失败');
+        (businessError as any).code = code;
+        return Promise.reject(businessError);
       }
+
+      recordRequestEnd(response.config, false);
       return response;
     },
     (error) => {
+      recordRequestEnd(error.config, true);
+
       // 统一错误处理
       if (error.response?.status === 401) {
         if (!isLoginRoute()) {
-          console.log('检测到401错误，触发登出流程');
+          logger.debug('检测到401错误，触发登出流程');
           import('../store/authStore').then(({ useAuthStore }) => {
             const authStore = useAuthStore.getState();
             authStore.logout();
@@ -95,12 +129,12 @@ const createApiClient = (): AxiosInstance => {
         }
       } else if (error.response?.status >= 500) {
         // 服务器错误，显示友好提示
-        console.error('❌ 服务器错误:', error.response?.status, error.config?.url);
+        logger.error('❌ 服务器错误:', error.response?.status, error.config?.url);
       } else if (!error.response) {
         // 网络错误，不触发登出
-        console.error('❌ 网络连接错误:', error.message, error.config?.url);
+        logger.error('❌ 网络连接错误:', error.message, error.config?.url);
       } else {
-        console.error('❌ API Error:', error.response?.status, error.config?.url);
+        logger.error('❌ API Error:', error.response?.status, error.config?.url);
       }
       
       return Promise.reject(error);
@@ -112,6 +146,30 @@ const createApiClient = (): AxiosInstance => {
 
 export const apiClient = createApiClient();
 
+/**
+ * 带缓存的GET请求 - 相同参数的进行中请求会被合并，结果按TTL缓存
+ * @returns 后端AjaxResult中的data字段
+ */
+export const cachedGet = <T>(
+  url: string,
+  params?: Record<string, any>,
+  options: CacheOptions<T> = {}
+): Promise<T> => {
+  return requestCache.get<T>(
+    buildCacheKey(url, params),
+    async () => {
+      const response = await apiClient.get(url, { params });
+      return response.data.data as T;
+    },
+    options
+  );
+};
+
+/**
+ * 获取缓存命中率统计，接口耗时见metrics中的api.latency
+ */
+export const getApiMetrics = () => requestCache.getMetrics();
+
 // 通用API响应处理
 export const handleApiResponse = <T>(response: any): T => {
   if (response.data.code === 0) {
@@ -135,3 +193,8 @@ export const handleApiError = (error: any): never => {
     throw new Error(error.message || '未知错误');
   }
 };
+
+// 开发环境下可在浏览器控制台调用 getApiMetrics() 查看缓存命中率
+if (typeof window !== 'undefined' && process.env.NODE_ENV === 'development') {
+  (window as any).getApiMetrics = getApiMetrics;
+}
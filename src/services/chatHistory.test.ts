@@ -0,0 +1,14 @@
+import { compareMessageIds } from './chatHistory';
+
+describe('compareMessageIds', () => {
+  it('超过2^53的雪花ID按数值大小比较', () => {
+    expect(compareMessageIds('1870000000000000001', '1870000000000000002')).toBeLessThan(0);
+    expect(compareMessageIds('1870000000000000002', '1870000000000000001')).toBeGreaterThan(0);
+    expect(compareMessageIds('1870000000000000001', '1870000000000000001')).toBe(0);
+  });
+
+  it('位数不同时位数少的更小', () => {
+    expect(compareMessageIds('99', '100')).toBeLessThan(0);
+    expect(compareMessageIds(100, '99')).toBeGreaterThan(0);
+  });
+});
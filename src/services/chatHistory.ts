@@ -1,6 +1,7 @@
 // 聊天历史管理服务 - 与后端API交互，严格按照后端API文档
 import { apiClient } from './apiClient';
 import { API_ENDPOINTS } from '../api/endpoints';
+import { logger } from './logger';
 
 // 后端ChatSessionResponse接口 - 完全匹配后端返回格式
 export interface ChatSession {
@@ -35,8 +36,31 @@ export interface SaveMessageRequest {
   modelName?: string;
 }
 
+// 按游标加载的一页消息，list按时间正序排列
+export interface MessagePage {
+  list: ChatMessage[];
+  total: number;
+  hasMore: boolean;
+}
+
+// 后端消息接口每页最多20条
+const MAX_MESSAGE_PAGE_SIZE = 20;
+
+// 比较两个消息ID：雪花ID可能超过2^53，转成number会丢失精度，按十进制字符串比较
+export const compareMessageIds = (a: number | string, b: number | string): number => {
+  const left = String(a);
+  const right = String(b);
+  if (left.length !== right.length) {
+    return left.length - right.length;
+  }
+  return left < right ? -1 : left > right ? 1 : 0;
+};
+
 // 聊天历史服务类 - 严格按照后端API文档
 export class ChatHistoryService {
+  // 后端是否支持beforeId游标；未知时先按游标请求，返回结果不符合游标条件时改用页码
+  private cursorSupported: boolean | null = null;
+
   /**
    * 创建新的聊天会话
    * POST /api/chat
@@ -60,16 +84,16 @@ export class ChatHistoryService {
     total: number;
     list: ChatSession[];
   }> {
-    console.log('📡 [chatHistoryService] 开始获取会话列表');
-    console.log('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.GET_SESSIONS);
-    console.log('📡 [chatHistoryService] 请求参数:', params);
+    logger.debug('📡 [chatHistoryService] 开始获取会话列表');
+    logger.debug('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.GET_SESSIONS);
+    logger.debug('📡 [chatHistoryService] 请求参数:', params);
     
     try {
       const response = await apiClient.get(API_ENDPOINTS.CHAT.GET_SESSIONS, { params });
       
-      console.log('✅ [chatHistoryService] getSessions API响应成功');
-      console.log('📡 [chatHistoryService] 响应状态:', response.status);
-      console.log('📡 [chatHistoryService] 响应数据概要:', {
+      logger.debug('✅ [chatHistoryService] getSessions API响应成功');
+      logger.debug('📡 [chatHistoryService] 响应状态:', response.status);
+      logger.debug('📡 [chatHistoryService] 响应数据概要:', {
         code: response.data.code,
         msg: response.data.msg,
         hasData: !!response.data.data,
@@ -77,7 +101,7 @@ export class ChatHistoryService {
       });
       
       const result = response.data.data;
-      console.log('🔍 [chatHistoryService] 解析结果分析:', {
+      logger.debug('🔍 [chatHistoryService] 解析结果分析:', {
         hasResult: !!result,
         hasListField: !!result?.list,
         sessionCount: result?.list?.length || 0,
@@ -87,11 +111,11 @@ export class ChatHistoryService {
       
       return result;
     } catch (error) {
-      console.error('❌ [chatHistoryService] getSessions API调用失败:', error);
+      logger.error('❌ [chatHistoryService] getSessions API调用失败:', error);
       if (error && typeof error === 'object' && 'response' in error) {
         const apiError = error as any;
-        console.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
-        console.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
+        logger.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
+        logger.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
       }
       throw error;
     }
@@ -124,20 +148,20 @@ export class ChatHistoryService {
    * POST /api/chat/messages
    */
   async saveMessage(request: SaveMessageRequest): Promise<void> {
-    console.log('📡 [chatHistoryService] 开始保存消息到后端');
-    console.log('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.SAVE_MESSAGE);
-    console.log('📡 [chatHistoryService] 请求参数:', request);
+    logger.debug('📡 [chatHistoryService] 开始保存消息到后端');
+    logger.debug('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.SAVE_MESSAGE);
+    logger.debug('📡 [chatHistoryService] 请求参数:', request);
     
     try {
       const response = await apiClient.post(API_ENDPOINTS.CHAT.SAVE_MESSAGE, request);
-      console.log('✅ [chatHistoryService] 消息保存成功，响应:', response.data);
+      logger.debug('✅ [chatHistoryService] 消息保存成功，响应:', response.data);
       return response.data;
     } catch (error) {
-      console.error('❌ [chatHistoryService] 保存消息失败:', error);
+      logger.error('❌ [chatHistoryService] 保存消息失败:', error);
       if (error && typeof error === 'object' && 'response' in error) {
         const apiError = error as any;
-        console.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
-        console.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
+        logger.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
+        logger.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
       }
       throw error;
     }
@@ -157,9 +181,9 @@ export class ChatHistoryService {
     total: number;
     list: ChatMessage[];
   }> {
-    console.log('📡 [chatHistoryService] 开始获取消息，sessionId:', sessionId);
-    console.log('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.GET_MESSAGES);
-    console.log('📡 [chatHistoryService] 请求参数:', { ...params, sessionId });
+    logger.debug('📡 [chatHistoryService] 开始获取消息，sessionId:', sessionId);
+    logger.debug('📡 [chatHistoryService] API端点:', API_ENDPOINTS.CHAT.GET_MESSAGES);
+    logger.debug('📡 [chatHistoryService] 请求参数:', { ...params, sessionId });
     
     try {
       const response = await apiClient.get(API_ENDPOINTS.CHAT.GET_MESSAGES, { 
@@ -169,9 +193,9 @@ export class ChatHistoryService {
         } 
       });
       
-      console.log('✅ [chatHistoryService] getMessages API响应成功');
-      console.log('📡 [chatHistoryService] 响应状态:', response.status);
-      console.log('📡 [chatHistoryService] 响应数据概要:', {
+      logger.debug('✅ [chatHistoryService] getMessages API响应成功');
+      logger.debug('📡 [chatHistoryService] 响应状态:', response.status);
+      logger.debug('📡 [chatHistoryService] 响应数据概要:', {
         code: response.data.code,
         msg: response.data.msg,
         hasData: !!response.data.data,
@@ -179,7 +203,7 @@ export class ChatHistoryService {
       });
       
       const result = response.data.data;
-      console.log('🔍 [chatHistoryService] 解析结果分析:', {
+      logger.debug('🔍 [chatHistoryService] 解析结果分析:', {
         hasResult: !!result,
         resultIsNull: result === null,
         hasListField: !!result?.list,
@@ -192,28 +216,86 @@ export class ChatHistoryService {
       
       // 特别处理data为null的情况
       if (result === null) {
-        console.warn('⚠️ [chatHistoryService] 后端返回data为null，可能原因:');
-        console.warn('  1. 该会话没有任何消息记录');
-        console.warn('  2. sessionId在数据库中不存在');  
-        console.warn('  3. 用户权限问题，无法查看该会话消息');
-        console.warn('  4. 后端查询SQL出错');
-        console.warn('  sessionId:', sessionId, '类型:', typeof sessionId);
+        logger.warn('⚠️ [chatHistoryService] 后端返回data为null，可能原因:');
+        logger.warn('  1. 该会话没有任何消息记录');
+        logger.warn('  2. sessionId在数据库中不存在');  
+        logger.warn('  3. 用户权限问题，无法查看该会话消息');
+        logger.warn('  4. 后端查询SQL出错');
+        logger.warn('  sessionId:', sessionId, '类型:', typeof sessionId);
         
         return { list: [], total: 0, page: 1, pageSize: 100 };
       }
       
       return result;
     } catch (error) {
-      console.error('❌ [chatHistoryService] getMessages API调用失败:', error);
+      logger.error('❌ [chatHistoryService] getMessages API调用失败:', error);
       if (error && typeof error === 'object' && 'response' in error) {
         const apiError = error as any;
-        console.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
-        console.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
+        logger.error('❌ [chatHistoryService] API错误状态:', apiError.response?.status);
+        logger.error('❌ [chatHistoryService] API错误数据:', apiError.response?.data);
       }
       throw error;
     }
   }
 
+  /**
+   * 按游标加载更早的消息
+   * GET /api/chat/messages?sessionId=123&beforeId=456&pageSize=20&order=desc
+   * 后端不支持beforeId时，根据已加载的消息数量换算页码（倒序分页），并丢弃与已加载消息重叠的部分
+   * @param beforeId 当前已加载的最早一条消息ID；不传时加载最新的一页
+   * @param loadedCount 当前已加载的连续消息数量，仅在页码降级时使用
+   */
+  async getMessagesBefore(sessionId: number, params: {
+    beforeId?: string;
+    loadedCount?: number;
+    pageSize?: number;
+  } = {}): Promise<MessagePage> {
+    const { beforeId, loadedCount = 0 } = params;
+    const pageSize = Math.min(params.pageSize || MAX_MESSAGE_PAGE_SIZE, MAX_MESSAGE_PAGE_SIZE);
+    const isOlder = (message: ChatMessage) => beforeId === undefined || compareMessageIds(message.id, beforeId) < 0;
+    const toPage = (list: ChatMessage[], total: number, hasMore: boolean): MessagePage => ({
+      list: list.filter(isOlder).sort((a, b) => compareMessageIds(a.id, b.id)),
+      total,
+      hasMore
+    });
+
+    if (beforeId === undefined) {
+      const result = await this.getMessages(sessionId, { page: 1, pageSize, order: 'desc' });
+      const list = result.list || [];
+      return toPage(list, result.total || 0, list.length >= pageSize && (result.total || 0) > list.length);
+    }
+
+    if (this.cursorSupported !== false) {
+      const response = await apiClient.get(API_ENDPOINTS.CHAT.GET_MESSAGES, {
+        params: { sessionId, beforeId, page: 1, pageSize, order: 'desc' }
+      });
+      const result = response.data.data || { list: [], total: 0 };
+      const list: ChatMessage[] = result.list || [];
+
+      if (list.every(isOlder)) {
+        if (list.length > 0) {
+          this.cursorSupported = true;
+        }
+        return toPage(list, result.total || 0, list.length >= pageSize);
+      }
+      logger.warn('⚠️ [chatHistoryService] 后端未识别beforeId游标，改用页码加载历史消息');
+      this.cursorSupported = false;
+    }
+
+    // 倒序分页下，新消息只会让旧消息向后移动，按已加载数量换算的页码只会重叠不会遗漏
+    let page = Math.floor(loadedCount / pageSize) + 1;
+    for (let attempt = 0; attempt < 3; attempt++, page++) {
+      const result = await this.getMessages(sessionId, { page, pageSize, order: 'desc' });
+      const list = result.list || [];
+      const total = result.total || 0;
+      const hasMore = page * pageSize < total;
+      if (list.some(isOlder) || !hasMore) {
+        return toPage(list, total, hasMore);
+      }
+    }
+    return { list: [], total: 0, hasMore: true };
+  }
+
 }
 
 // 导出服务实例
@@ -0,0 +1,63 @@
+import { ChatMessage } from '../types/ai';
+import { diffMessages } from './chatStorage';
+
+const createMessages = (count: number, start = 0): ChatMessage[] =>
+  Array.from({ length: count }, (_, i) => ({
+    id: String(start + i),
+    sessionId: '1',
+    role: i % 2 === 0 ? 'user' : 'assistant',
+    content: `消息 ${start + i}`,
+    timestamp: new Date(0)
+  } as ChatMessage));
+
+describe('diffMessages', () => {
+  it('内容未变化时返回-1', () => {
+    const messages = createMessages(10);
+    expect(diffMessages(messages, 0, messages)).toEqual({ offset: 0, changedFrom: -1 });
+  });
+
+  it('追加消息时从追加的位置开始变化', () => {
+    const messages = createMessages(10);
+    const next = [...messages, ...createMessages(1, 10)];
+    expect(diffMessages(messages, 0, next)).toEqual({ offset: 0, changedFrom: 10 });
+  });
+
+  it('替换中间一条消息时从该位置开始变化', () => {
+    const messages = createMessages(10);
+    const next = messages.slice();
+    next[4] = { ...next[4], content: '已修改' };
+    expect(diffMessages(messages, 0, next).changedFrom).toBe(4);
+  });
+
+  it('只裁剪头部时视为未变化，不覆盖缓存中的更早消息', () => {
+    const messages = createMessages(120);
+    const window = messages.slice(-60);
+    expect(diffMessages(messages, 0, window)).toEqual({ offset: 60, changedFrom: -1 });
+  });
+
+  it('裁剪后追加消息时按已持久化位置计算变化', () => {
+    const messages = createMessages(120);
+    const window = messages.slice(-60);
+    const next = [...window, ...createMessages(1, 120)];
+    expect(diffMessages(window, 60, next)).toEqual({ offset: 60, changedFrom: 120 });
+  });
+
+  it('头部插入已持久化范围内的更早消息时视为未变化', () => {
+    const messages = createMessages(120);
+    const window = messages.slice(-60);
+    // 从后端重新加载的更早消息是新的对象
+    const older = createMessages(20, 40);
+    expect(diffMessages(window, 60, [...older, ...window])).toEqual({ offset: 40, changedFrom: -1 });
+  });
+
+  it('插入的消息超出已持久化范围时整体重写', () => {
+    const messages = createMessages(30);
+    const older = createMessages(10, 100);
+    expect(diffMessages(messages, 0, [...older, ...messages])).toEqual({ offset: 0, changedFrom: 0 });
+  });
+
+  it('无法对齐时整体重写', () => {
+    const messages = createMessages(10);
+    expect(diffMessages(messages.slice(5), 5, createMessages(3, 50))).toEqual({ offset: 0, changedFrom: 0 });
+  });
+});
@@ -0,0 +1,550 @@
+// 聊天记录本地存储引擎 - 基于IndexedDB，按会话和消息分页增量写入
+import { ChatMessage, ChatSession } from '../types/ai';
+import { logger } from './logger';
+
+const DB_NAME = 'mining-safety-chat';
+const DB_VERSION = 1;
+
+const SESSION_STORE = 'sessions';
+const PAGE_STORE = 'messagePages';
+const META_STORE = 'meta';
+
+// 每页消息数量，只重写发生变化的页
+export const MESSAGE_PAGE_SIZE = 50;
+// 最多缓存消息内容的会话数量（按最近访问时间淘汰）
+const MAX_SESSIONS_WITH_MESSAGES = 30;
+// 最多保留的会话元数据数量
+const MAX_SESSIONS = 200;
+// 写入合并延迟
+const WRITE_DELAY = 200;
+
+type SessionMeta = Omit<ChatSession, 'messages'>;
+
+// 会话记录 - 一个会话一条，不包含消息
+interface SessionRecord {
+  userId: number;
+  sessionId: string;
+  session: SessionMeta;
+  updatedAt: number;
+  lastAccessedAt: number;
+  pageCount: number;
+}
+
+// 消息分页记录
+interface MessagePageRecord {
+  userId: number;
+  sessionId: string;
+  pageIndex: number;
+  messages: ChatMessage[];
+  updatedAt: number;
+}
+
+// 用户级元数据
+interface MetaRecord {
+  userId: number;
+  currentSessionId: string | null;
+}
+
+// 已持久化内容的内存快照，用于计算差异
+interface SessionSnapshot {
+  meta: SessionMeta;
+  messages: ChatMessage[];
+  offset: number;     // messages[0]在已持久化消息中的位置；store只保留最新一段消息时前面的部分不在内存中
+  pageCount: number;
+  lastAccessedAt: number;
+  evicted?: boolean;  // 消息缓存已被淘汰，只有再次打开时才重新写入
+}
+
+interface PendingWrite {
+  sessions: ChatSession[];
+  currentSessionId: string | null;
+}
+
+const promisifyRequest = <T>(request: IDBRequest<T>): Promise<T> =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+const transactionDone = (tx: IDBTransaction): Promise<void> =>
+  new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+
+const snapshotKey = (userId: number, sessionId: string) => `${userId}:${sessionId}`;
+
+const toSessionMeta = ({ messages, ...meta }: ChatSession): SessionMeta => meta;
+
+const toTime = (date: Date | undefined): number | undefined =>
+  date instanceof Date ? date.getTime() : undefined;
+
+const sessionMetaChanged = (prev: SessionMeta, next: SessionMeta): boolean =>
+  prev.title !== next.title ||
+  prev.description !== next.description ||
+  prev.status !== next.status ||
+  prev.messageCount !== next.messageCount ||
+  prev.totalTokens !== next.totalTokens ||
+  toTime(prev.updatedAt) !== toTime(next.updatedAt) ||
+  toTime(prev.lastMessageAt) !== toTime(next.lastMessageAt);
+
+// 找到第一条发生变化的消息；store中的消息对象不可变，按引用比较即可
+const firstChangedIndex = (prev: ChatMessage[], next: ChatMessage[]): number => {
+  const length = Math.min(prev.length, next.length);
+  for (let i = 0; i < length; i++) {
+    if (prev[i] !== next[i]) {
+      return i;
+    }
+  }
+  return prev.length === next.length ? -1 : length;
+};
+
+export interface MessageDiff {
+  offset: number;       // next[0]在已持久化消息中的位置
+  changedFrom: number;  // 第一条变化消息在已持久化消息中的位置，-1表示没有变化
+}
+
+/**
+ * 计算store中的消息相对已持久化消息的变化
+ * store只保留最新一段消息（头部被裁剪）时，裁掉的部分视为未变化，不会覆盖缓存中的更早消息；
+ * 头部插入的更早消息若落在已持久化范围内，同样视为缓存中已有
+ * @param prev 快照中的消息，从已持久化消息的prevOffset处开始
+ */
+export const diffMessages = (prev: ChatMessage[], prevOffset: number, next: ChatMessage[]): MessageDiff => {
+  if (prev.length > 0 && next.length > 0) {
+    // 头部被裁剪或未变：next从快照中间开始
+    const start = prev.indexOf(next[0]);
+    if (start >= 0) {
+      const changed = firstChangedIndex(prev.slice(start), next);
+      const offset = prevOffset + start;
+      return { offset, changedFrom: changed === -1 ? -1 : offset + changed };
+    }
+
+    // 头部插入了更早的消息：以快照第一条对齐
+    const inserted = next.indexOf(prev[0]);
+    if (inserted > 0 && inserted <= prevOffset) {
+      const changed = firstChangedIndex(prev, next.slice(inserted));
+      return { offset: prevOffset - inserted, changedFrom: changed === -1 ? -1 : prevOffset + changed };
+    }
+  }
+
+  // 无法对齐时整体替换
+  if (prevOffset > 0) {
+    return { offset: 0, changedFrom: next.length > 0 || prev.length > 0 ? 0 : -1 };
+  }
+  return { offset: 0, changedFrom: firstChangedIndex(prev, next) };
+};
+
+export class ChatStorage {
+  private dbPromise: Promise<IDBDatabase | null> | null = null;
+  private snapshots = new Map<string, SessionSnapshot>();
+  private pending = new Map<number, PendingWrite>();
+  private writeTimer: ReturnType<typeof setTimeout> | null = null;
+  private writing: Promise<void> = Promise.resolve();
+
+  private openDB(): Promise<IDBDatabase | null> {
+    if (this.dbPromise) {
+      return this.dbPromise;
+    }
+
+    if (typeof indexedDB === 'undefined') {
+      logger.warn('⚠️ [chatStorage] 当前环境不支持IndexedDB，聊天记录不会缓存到本地');
+      this.dbPromise = Promise.resolve(null);
+      return this.dbPromise;
+    }
+
+    this.dbPromise = new Promise<IDBDatabase | null>((resolve) => {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+      request.onupgradeneeded = () => {
+        const db = request.result;
+
+        const sessions = db.createObjectStore(SESSION_STORE, { keyPath: ['userId', 'sessionId'] });
+        sessions.createIndex('userId', 'userId');
+        sessions.createIndex('updatedAt', 'updatedAt');
+        sessions.createIndex('userId_lastAccessedAt', ['userId', 'lastAccessedAt']);
+
+        const pages = db.createObjectStore(PAGE_STORE, { keyPath: ['userId', 'sessionId', 'pageIndex'] });
+        pages.createIndex('userId', 'userId');
+        pages.createIndex('userId_sessionId', ['userId', 'sessionId']);
+        pages.createIndex('updatedAt', 'updatedAt');
+
+        db.createObjectStore(META_STORE, { keyPath: 'userId' });
+      };
+
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        logger.error('❌ [chatStorage] 打开IndexedDB失败:', request.error);
+        resolve(null);
+      };
+      request.onblocked = () => {
+        logger.warn('⚠️ [chatStorage] IndexedDB升级被其他标签页阻塞');
+      };
+    });
+
+    return this.dbPromise;
+  }
+
+  /**
+   * 加载用户的会话列表（不含消息内容），以及上次打开的会话ID
+   */
+  async loadSessions(userId: number): Promise<{ sessions: ChatSession[]; currentSessionId: string | null }> {
+    const db = await this.openDB();
+    if (!db) {
+      return { sessions: [], currentSessionId: null };
+    }
+
+    await this.migrateLegacyData(db, userId);
+
+    const tx = db.transaction([SESSION_STORE, META_STORE], 'readonly');
+    const [records, meta] = await Promise.all([
+      promisifyRequest<SessionRecord[]>(tx.objectStore(SESSION_STORE).index('userId').getAll(IDBKeyRange.only(userId))),
+      promisifyRequest<MetaRecord | undefined>(tx.objectStore(META_STORE).get(userId))
+    ]);
+
+    records.sort((a, b) => b.updatedAt - a.updatedAt);
+
+    const sessions = records.map(record => {
+      const existing = this.snapshots.get(snapshotKey(userId, record.sessionId));
+      this.snapshots.set(snapshotKey(userId, record.sessionId), {
+        meta: record.session,
+        messages: existing?.messages || [],
+        offset: existing?.offset || 0,
+        pageCount: record.pageCount,
+        lastAccessedAt: record.lastAccessedAt
+      });
+      return { ...record.session, messages: [] };
+    });
+
+    return { sessions, currentSessionId: meta?.currentSessionId ?? null };
+  }
+
+  /**
+   * 按需加载单个会话的缓存消息；没有缓存时返回null
+   */
+  async loadMessages(userId: number, sessionId: string): Promise<ChatMessage[] | null> {
+    const db = await this.openDB();
+    if (!db) {
+      return null;
+    }
+
+    const tx = db.transaction([SESSION_STORE, PAGE_STORE], 'readwrite');
+    const sessionStore = tx.objectStore(SESSION_STORE);
+    const [pages, record] = await Promise.all([
+      promisifyRequest<MessagePageRecord[]>(
+        tx.objectStore(PAGE_STORE).index('userId_sessionId').getAll(IDBKeyRange.only([userId, sessionId]))
+      ),
+      promisifyRequest<SessionRecord | undefined>(sessionStore.get([userId, sessionId]))
+    ]);
+
+    // 记录访问时间，供LRU淘汰使用
+    const accessedAt = Date.now();
+    if (record) {
+      sessionStore.put({ ...record, lastAccessedAt: accessedAt });
+    }
+    await transactionDone(tx);
+
+    if (pages.length === 0) {
+      return null;
+    }
+
+    pages.sort((a, b) => a.pageIndex - b.pageIndex);
+    const messages = pages.reduce<ChatMessage[]>((all, page) => all.concat(page.messages), []);
+
+    if (record) {
+      this.snapshots.set(snapshotKey(userId, sessionId), {
+        meta: record.session,
+        messages,
+        offset: 0,
+        pageCount: pages.length,
+        lastAccessedAt: accessedAt
+      });
+    }
+
+    return messages;
+  }
+
+  /**
+   * 释放内存快照中某个会话的消息，IndexedDB中的缓存页保留，再次打开时由loadMessages重新读取
+   */
+  releaseMessages(userId: number, sessionId: string): void {
+    const key = snapshotKey(userId, sessionId);
+    const snapshot = this.snapshots.get(key);
+    if (snapshot && snapshot.messages.length > 0) {
+      this.snapshots.set(key, { ...snapshot, messages: [], offset: 0 });
+    }
+  }
+
+  /**
+   * 保存会话状态；短时间内的多次调用会被合并，只写入发生变化的会话和消息页
+   */
+  saveSessions(userId: number, sessions: ChatSession[], currentSessionId: string | null): void {
+    this.pending.set(userId, { sessions, currentSessionId });
+
+    if (!this.writeTimer) {
+      this.writeTimer = setTimeout(() => {
+        this.writeTimer = null;
+        this.flush();
+      }, WRITE_DELAY);
+    }
+  }
+
+  /**
+   * 立即写入所有待保存的数据
+   */
+  flush(): Promise<void> {
+    if (this.writeTimer) {
+      clearTimeout(this.writeTimer);
+      this.writeTimer = null;
+    }
+
+    const pending = Array.from(this.pending.entries());
+    this.pending.clear();
+
+    this.writing = this.writing
+      .then(async () => {
+        for (const [userId, write] of pending) {
+          await this.writeSessions(userId, write);
+        }
+      })
+      .catch(error => {
+        logger.error('❌ [chatStorage] 保存聊天记录失败:', error);
+      });
+
+    return this.writing;
+  }
+
+  private async writeSessions(userId: number, { sessions, currentSessionId }: PendingWrite): Promise<void> {
+    const db = await this.openDB();
+    if (!db) {
+      return;
+    }
+
+    const tx = db.transaction([SESSION_STORE, PAGE_STORE, META_STORE], 'readwrite');
+    const sessionStore = tx.objectStore(SESSION_STORE);
+    const pageStore = tx.objectStore(PAGE_STORE);
+    const now = Date.now();
+    let pagesWritten = 0;
+
+    sessions.forEach(session => {
+      const key = snapshotKey(userId, session.id);
+      const snapshot = this.snapshots.get(key);
+      const meta = toSessionMeta(session);
+
+      const isCurrent = session.id === currentSessionId;
+      const metaChanged = !snapshot || sessionMetaChanged(snapshot.meta, meta);
+
+      // 消息为空表示尚未加载或已释放，保留已有的缓存页
+      const loaded = session.messages.length > 0;
+      const messages = loaded ? session.messages : snapshot?.messages || [];
+      let offset = loaded ? 0 : snapshot?.offset || 0;
+      let changedFrom: number;
+      if (!snapshot) {
+        changedFrom = messages.length > 0 ? 0 : -1;
+      } else if (snapshot.evicted) {
+        changedFrom = isCurrent && messages.length > 0 ? 0 : -1;
+      } else if (!loaded) {
+        changedFrom = -1;
+      } else {
+        ({ offset, changedFrom } = diffMessages(snapshot.messages, snapshot.offset, messages));
+      }
+
+      // 变化所在的页包含不在内存中的更早消息时无法重写，丢弃该会话的缓存页，再次打开时从后端加载
+      if (changedFrom !== -1 && Math.floor(changedFrom / MESSAGE_PAGE_SIZE) * MESSAGE_PAGE_SIZE < offset) {
+        logger.debug('🔄 [chatStorage] 无法增量更新会话缓存，丢弃缓存页:', session.id);
+        pageStore.delete(IDBKeyRange.bound([userId, session.id, 0], [userId, session.id, Infinity]));
+        offset = 0;
+        changedFrom = 0;
+      }
+
+      if (changedFrom === -1 && !metaChanged && !isCurrent) {
+        return;
+      }
+
+      const previousPageCount = snapshot?.pageCount || 0;
+      let pageCount = previousPageCount;
+
+      if (changedFrom !== -1) {
+        pageCount = Math.ceil((offset + messages.length) / MESSAGE_PAGE_SIZE);
+        const firstPage = Math.floor(changedFrom / MESSAGE_PAGE_SIZE);
+
+        for (let pageIndex = firstPage; pageIndex < pageCount; pageIndex++) {
+          const record: MessagePageRecord = {
+            userId,
+            sessionId: session.id,
+            pageIndex,
+            messages: messages.slice(pageIndex * MESSAGE_PAGE_SIZE - offset, (pageIndex + 1) * MESSAGE_PAGE_SIZE - offset),
+            updatedAt: now
+          };
+          pageStore.put(record);
+          pagesWritten++;
+        }
+
+        if (previousPageCount > pageCount) {
+          pageStore.delete(IDBKeyRange.bound(
+            [userId, session.id, pageCount],
+            [userId, session.id, previousPageCount]
+          ));
+        }
+      }
+
+      const updatedAt = toTime(session.updatedAt) ?? now;
+      const lastAccessedAt = isCurrent ? now : snapshot?.lastAccessedAt ?? updatedAt;
+      const record: SessionRecord = {
+        userId,
+        sessionId: session.id,
+        session: meta,
+        updatedAt,
+        lastAccessedAt,
+        pageCount
+      };
+      sessionStore.put(record);
+
+      // 缓存已被淘汰且未重新写入的会话不在快照中保留消息
+      const evicted = Boolean(snapshot?.evicted) && changedFrom === -1;
+      this.snapshots.set(key, {
+        meta,
+        messages: evicted ? [] : messages,
+        offset: evicted ? 0 : offset,
+        pageCount,
+        lastAccessedAt,
+        evicted
+      });
+    });
+
+    tx.objectStore(META_STORE).put({ userId, currentSessionId } as MetaRecord);
+    await transactionDone(tx);
+
+    if (pagesWritten > 0) {
+      await this.evict(db, userId, currentSessionId);
+    }
+  }
+
+  /**
+   * LRU淘汰：超出上限的会话先丢弃消息缓存，再丢弃会话记录
+   */
+  private async evict(db: IDBDatabase, userId: number, currentSessionId: string | null): Promise<void> {
+    const tx = db.transaction([SESSION_STORE, PAGE_STORE], 'readwrite');
+    const sessionStore = tx.objectStore(SESSION_STORE);
+    const pageStore = tx.objectStore(PAGE_STORE);
+    const range = IDBKeyRange.bound([userId, -Infinity], [userId, Infinity]);
+    const request = sessionStore.index('userId_lastAccessedAt').openCursor(range, 'prev');
+
+    let sessionCount = 0;
+    let cachedCount = 0;
+
+    request.onsuccess = () => {
+      const cursor = request.result;
+      if (!cursor) return;
+
+      const record = cursor.value as SessionRecord;
+      const key = snapshotKey(userId, record.sessionId);
+      sessionCount++;
+
+      if (record.sessionId !== currentSessionId) {
+        if (sessionCount > MAX_SESSIONS) {
+          pageStore.delete(IDBKeyRange.bound([userId, record.sessionId, 0], [userId, record.sessionId, Infinity]));
+          cursor.delete();
+          this.snapshots.delete(key);
+        } else if (record.pageCount > 0 && ++cachedCount > MAX_SESSIONS_WITH_MESSAGES) {
+          pageStore.delete(IDBKeyRange.bound([userId, record.sessionId, 0], [userId, record.sessionId, Infinity]));
+          cursor.update({ ...record, pageCount: 0 });
+          // 同时释放内存中的消息，LRU才能真正约束内存占用
+          const snapshot = this.snapshots.get(key);
+          if (snapshot) {
+            this.snapshots.set(key, { ...snapshot, messages: [], offset: 0, pageCount: 0, evicted: true });
+          }
+        }
+      } else if (record.pageCount > 0) {
+        cachedCount++;
+      }
+
+      cursor.continue();
+    };
+
+    await transactionDone(tx);
+  }
+
+  /**
+   * 删除单个会话及其消息
+   */
+  async deleteSession(userId: number, sessionId: string): Promise<void> {
+    this.snapshots.delete(snapshotKey(userId, sessionId));
+    const db = await this.openDB();
+    if (!db) {
+      return;
+    }
+
+    const tx = db.transaction([SESSION_STORE, PAGE_STORE], 'readwrite');
+    tx.objectStore(SESSION_STORE).delete([userId, sessionId]);
+    tx.objectStore(PAGE_STORE).delete(IDBKeyRange.bound([userId, sessionId, 0], [userId, sessionId, Infinity]));
+    await transactionDone(tx);
+  }
+
+  /**
+   * 清除某个用户的全部本地聊天记录
+   */
+  async clearUser(userId: number): Promise<void> {
+    this.pending.delete(userId);
+    const prefix = `${userId}:`;
+    Array.from(this.snapshots.keys())
+      .filter(key => key.startsWith(prefix))
+      .forEach(key => this.snapshots.delete(key));
+
+    const db = await this.openDB();
+    if (!db) {
+      return;
+    }
+
+    const tx = db.transaction([SESSION_STORE, PAGE_STORE, META_STORE], 'readwrite');
+    [SESSION_STORE, PAGE_STORE].forEach(storeName => {
+      const request = tx.objectStore(storeName).index('userId').openKeyCursor(IDBKeyRange.only(userId));
+      request.onsuccess = () => {
+        const cursor = request.result;
+        if (!cursor) return;
+        tx.objectStore(storeName).delete(cursor.primaryKey);
+        cursor.continue();
+      };
+    });
+    tx.objectStore(META_STORE).delete(userId);
+    await transactionDone(tx);
+  }
+
+  // 迁移旧版本保存在localStorage中的整库JSON，迁移后删除旧数据
+  private async migrateLegacyData(db: IDBDatabase, userId: number): Promise<void> {
+    const legacyKey = `chat-store-user-${userId}`;
+    let stored: string | null = null;
+    try {
+      stored = localStorage.getItem(legacyKey);
+    } catch {
+      return;
+    }
+    if (!stored) {
+      return;
+    }
+
+    try {
+      const data = JSON.parse(stored);
+      const toMessage = (msg: any): ChatMessage => ({ ...msg, timestamp: new Date(msg.timestamp) });
+      const sessions: ChatSession[] = (data.sessions || []).map((session: any) => ({
+        ...session,
+        createdAt: new Date(session.createdAt),
+        updatedAt: new Date(session.updatedAt),
+        messages: (session.messages || []).map(toMessage)
+      }));
+
+      logger.debug('🔄 [chatStorage] 迁移localStorage聊天记录到IndexedDB，会话数量:', sessions.length);
+      await this.writeSessions(userId, {
+        sessions,
+        currentSessionId: data.currentSession?.id ?? null
+      });
+      localStorage.removeItem(legacyKey);
+    } catch (error) {
+      logger.error('❌ [chatStorage] 迁移旧聊天记录失败:', error);
+    }
+  }
+}
+
+// 导出存储实例
+export const chatStorage = new ChatStorage();
@@ -0,0 +1,125 @@
+import { ChunkedUploader, UploadProgress } from './chunkedUpload';
+import { apiClient } from './apiClient';
+import { apiService } from './api';
+import { uploadStorage } from './uploadStorage';
+import { computeFileHash } from './fileHash';
+import { UPLOAD_CONFIG } from '../config/api';
+import { API_ENDPOINTS } from '../api/endpoints';
+
+jest.mock('./apiClient', () => ({ apiClient: { post: jest.fn(), put: jest.fn() } }));
+jest.mock('./api', () => ({ apiService: { uploadFile: jest.fn() } }));
+jest.mock('./uploadStorage', () => ({ uploadStorage: { get: jest.fn(), put: jest.fn() } }));
+jest.mock('./fileHash', () => ({ computeFileHash: jest.fn() }));
+jest.mock('./fileHashWorkerFactory', () => ({ createFileHashWorker: jest.fn() }));
+
+const post = apiClient.post as jest.Mock;
+const put = apiClient.put as jest.Mock;
+
+const originalConfig = { ...UPLOAD_CONFIG };
+
+// 10字节、每片4字节，共3个分片
+const createFile = () => new File(['0123456789'], 'test.pdf', { type: 'application/pdf' });
+
+const mockServer = (init: Record<string, unknown>) => {
+  post.mockImplementation((url: string) => Promise.resolve({
+    data: {
+      data: url === API_ENDPOINTS.FILE.CHUNK_INIT ? init : { url: 'http://minio/test.pdf' }
+    }
+  }));
+};
+
+const uploadedIndexes = () => put.mock.calls.map(([, , config]) => config.params.index).sort();
+
+describe('ChunkedUploader', () => {
+  beforeAll(() => {
+    Object.assign(UPLOAD_CONFIG, { CHUNKED_ENABLED: true, CHUNK_THRESHOLD: 0, CHUNK_SIZE: 4, MAX_RETRIES: 2 });
+  });
+
+  afterAll(() => {
+    Object.assign(UPLOAD_CONFIG, originalConfig);
+  });
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    (computeFileHash as jest.Mock).mockResolvedValue({ fileHash: 'hash', chunkHashes: [] });
+    (uploadStorage.get as jest.Mock).mockResolvedValue(null);
+    (uploadStorage.put as jest.Mock).mockResolvedValue(undefined);
+    put.mockResolvedValue({ data: {} });
+    // 重试等待立即结束
+    jest.spyOn(window, 'setTimeout').mockImplementation(((callback: () => void) => {
+      callback();
+      return 0;
+    }) as unknown as typeof setTimeout);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('上传全部分片后合并', async () => {
+    mockServer({ uploadId: 'u1', uploadedChunks: [] });
+
+    const result = await new ChunkedUploader().upload(createFile());
+
+    expect(uploadedIndexes()).toEqual([0, 1, 2]);
+    expect(post).toHaveBeenLastCalledWith(
+      API_ENDPOINTS.FILE.CHUNK_COMPLETE,
+      { uploadId: 'u1', fileHash: 'hash' },
+      expect.anything()
+    );
+    expect(result).toMatchObject({ url: 'http://minio/test.pdf', fileHash: 'hash', mode: 'chunked' });
+    expect(uploadStorage.put).toHaveBeenLastCalledWith(expect.objectContaining({ url: 'http://minio/test.pdf' }));
+  });
+
+  it('断点续传时只上传缺少的分片', async () => {
+    (uploadStorage.get as jest.Mock).mockResolvedValue({ fileHash: 'hash', uploadId: 'u1', uploadedChunks: [0] });
+    mockServer({ uploadId: 'u1', uploadedChunks: [0, 2] });
+    const progress: UploadProgress[] = [];
+
+    await new ChunkedUploader().upload(createFile(), { onProgress: event => progress.push(event) });
+
+    expect(post.mock.calls[0][1]).toMatchObject({ uploadId: 'u1', chunkCount: 3 });
+    expect(uploadedIndexes()).toEqual([1]);
+    expect(progress[progress.length - 1]).toMatchObject({ phase: 'done', percent: 100, resumed: true });
+  });
+
+  it('分片失败后重试', async () => {
+    mockServer({ uploadId: 'u1', uploadedChunks: [0, 1] });
+    put.mockRejectedValueOnce(new Error('网络错误')).mockRejectedValueOnce(new Error('网络错误'));
+
+    const result = await new ChunkedUploader().upload(createFile());
+
+    expect(put).toHaveBeenCalledTimes(3);
+    expect(result.mode).toBe('chunked');
+  });
+
+  it('超过重试次数后失败且不合并分片', async () => {
+    mockServer({ uploadId: 'u1', uploadedChunks: [0, 1] });
+    put.mockRejectedValue(new Error('网络错误'));
+
+    await expect(new ChunkedUploader().upload(createFile())).rejects.toThrow('网络错误');
+    expect(put).toHaveBeenCalledTimes(UPLOAD_CONFIG.MAX_RETRIES + 1);
+    expect(post).not.toHaveBeenCalledWith(API_ENDPOINTS.FILE.CHUNK_COMPLETE, expect.anything(), expect.anything());
+  });
+
+  it('本地已有上传结果时秒传', async () => {
+    (uploadStorage.get as jest.Mock).mockResolvedValue({ fileHash: 'hash', url: 'http://minio/old.pdf' });
+
+    const result = await new ChunkedUploader().upload(createFile());
+
+    expect(result).toMatchObject({ url: 'http://minio/old.pdf', mode: 'instant' });
+    expect(post).not.toHaveBeenCalled();
+  });
+
+  it('后端不支持分片接口时回退到整文件上传，之后不再尝试', async () => {
+    post.mockRejectedValue({ response: { status: 404 } });
+    (apiService.uploadFile as jest.Mock).mockResolvedValue({ url: 'http://minio/single.pdf' });
+    const uploader = new ChunkedUploader();
+
+    await expect(uploader.upload(createFile())).resolves.toMatchObject({ mode: 'single' });
+    await uploader.upload(createFile());
+
+    expect(post).toHaveBeenCalledTimes(1);
+    expect(apiService.uploadFile).toHaveBeenCalledTimes(2);
+  });
+});
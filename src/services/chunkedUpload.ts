@@ -0,0 +1,370 @@
+// 分片上传服务 - 大文件在Worker中计算哈希后分片并行上传，支持失败重试、断点续传和秒传
+// 后端不支持分片接口时自动回退到整文件上传
+import { apiClient } from './apiClient';
+import { apiService } from './api';
+import type { UploadResponse } from './api';
+import { computeFileHash } from './fileHash';
+import type { FileHashResult } from './fileHash';
+import { createFileHashWorker } from './fileHashWorkerFactory';
+import { uploadStorage } from './uploadStorage';
+import type { UploadRecord } from './uploadStorage';
+import { API_ENDPOINTS } from '../api/endpoints';
+import { UPLOAD_CONFIG } from '../config/api';
+import { logger } from './logger';
+
+export type HashRequest = { id: number; file: Blob; chunkSize: number };
+
+export type HashResponse =
+  | { id: number; type: 'progress'; loaded: number }
+  | { id: number; type: 'done'; result: FileHashResult }
+  | { id: number; type: 'error'; error: string };
+
+export type UploadPhase = 'hashing' | 'uploading' | 'completing' | 'done';
+
+export interface UploadProgress {
+  phase: UploadPhase;
+  loaded: number;            // 当前阶段已处理的字节数
+  total: number;
+  percent: number;           // 0-100
+  uploadedChunks: number;
+  chunkCount: number;
+  bytesPerSecond: number;    // 本次上传的平均吞吐量，不含断点前已上传的部分
+  resumed: boolean;          // 是否从断点继续
+}
+
+export interface ChunkedUploadOptions {
+  onProgress?: (progress: UploadProgress) => void;
+  signal?: AbortSignal;
+}
+
+export interface ChunkedUploadResult extends UploadResponse {
+  fileHash?: string;
+  mode: 'chunked' | 'single' | 'instant';  // instant表示文件已存在，跳过上传
+  durationMs: number;
+  bytesPerSecond: number;
+}
+
+interface InitResponse {
+  uploadId: string;
+  uploadedChunks?: number[];
+  url?: string;
+}
+
+// 进度回调的最小间隔
+const PROGRESS_INTERVAL = 150;
+// 重试的基础等待时间，按2的指数退避
+const RETRY_BASE_DELAY = 500;
+
+const sleep = (ms: number, signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal?.addEventListener('abort', () => {
+      clearTimeout(timer);
+      reject(new Error('上传已取消'));
+    }, { once: true });
+  });
+
+const isUnsupported = (error: any) => [404, 405, 501].includes(error?.response?.status);
+
+export class ChunkedUploader {
+  private worker: Worker | null | undefined;
+  private hashRequests = new Map<number, {
+    resolve: (result: FileHashResult) => void;
+    reject: (error: Error) => void;
+    onProgress?: (loaded: number) => void;
+  }>();
+  private nextHashId = 1;
+  // 后端不支持分片接口时，本次会话内不再尝试
+  private chunkedUnsupported = false;
+
+  private getWorker(): Worker | null {
+    if (this.worker !== undefined) {
+      return this.worker;
+    }
+    if (typeof Worker === 'undefined') {
+      this.worker = null;
+      return null;
+    }
+
+    try {
+      const worker = createFileHashWorker();
+      worker.onmessage = (event: MessageEvent<HashResponse>) => {
+        const message = event.data;
+        const request = this.hashRequests.get(message.id);
+        if (!request) return;
+
+        if (message.type === 'progress') {
+          request.onProgress?.(message.loaded);
+        } else {
+          this.hashRequests.delete(message.id);
+          if (message.type === 'done') {
+            request.resolve(message.result);
+          } else {
+            request.reject(new Error(message.error));
+          }
+        }
+      };
+      worker.onerror = (event) => {
+        logger.error('❌ 文件哈希Worker出错，改为在主线程计算:', event.message);
+        worker.terminate();
+        this.worker = null;
+        const error = new Error(event.message || '文件哈希计算失败');
+        this.hashRequests.forEach(request => request.reject(error));
+        this.hashRequests.clear();
+      };
+      this.worker = worker;
+    } catch (error) {
+      logger.warn('⚠️ 无法创建文件哈希Worker，改为在主线程计算:', error);
+      this.worker = null;
+    }
+    return this.worker;
+  }
+
+  /**
+   * 计算文件哈希，优先在Worker中进行
+   */
+  hashFile(file: Blob, chunkSize: number, onProgress?: (loaded: number) => void): Promise<FileHashResult> {
+    const worker = this.getWorker();
+    if (!worker) {
+      return computeFileHash(file, chunkSize, onProgress);
+    }
+
+    const id = this.nextHashId++;
+    return new Promise((resolve, reject) => {
+      this.hashRequests.set(id, { resolve, reject, onProgress });
+      worker.postMessage({ id, file, chunkSize } as HashRequest);
+    });
+  }
+
+  /**
+   * 上传文件 - 小文件或后端不支持分片时整文件上传，否则分片上传
+   */
+  async upload(file: File, options: ChunkedUploadOptions = {}): Promise<ChunkedUploadResult> {
+    const startTime = performance.now();
+
+    if (!UPLOAD_CONFIG.CHUNKED_ENABLED || this.chunkedUnsupported || file.size < UPLOAD_CONFIG.CHUNK_THRESHOLD) {
+      return this.uploadSingle(file, startTime);
+    }
+
+    try {
+      return await this.uploadChunked(file, options, startTime);
+    } catch (error) {
+      if (isUnsupported(error)) {
+        logger.warn('⚠️ 后端不支持分片上传，回退到整文件上传');
+        this.chunkedUnsupported = true;
+        return this.uploadSingle(file, startTime);
+      }
+      throw error;
+    }
+  }
+
+  private async uploadSingle(file: File, startTime: number): Promise<ChunkedUploadResult> {
+    const response = await apiService.uploadFile(file);
+    const durationMs = performance.now() - startTime;
+    return {
+      ...response,
+      mode: 'single',
+      durationMs,
+      bytesPerSecond: durationMs > 0 ? file.size / (durationMs / 1000) : 0
+    };
+  }
+
+  private async uploadChunked(file: File, options: ChunkedUploadOptions, startTime: number): Promise<ChunkedUploadResult> {
+    const { onProgress, signal } = options;
+    const chunkSize = UPLOAD_CONFIG.CHUNK_SIZE;
+    const chunkCount = Math.max(1, Math.ceil(file.size / chunkSize));
+
+    // 1. 计算哈希
+    const { fileHash } = await this.hashFile(file, chunkSize, loaded => {
+      onProgress?.({
+        phase: 'hashing',
+        loaded,
+        total: file.size,
+        percent: Math.round((loaded / file.size) * 100),
+        uploadedChunks: 0,
+        chunkCount,
+        bytesPerSecond: 0,
+        resumed: false
+      });
+    });
+    if (signal?.aborted) throw new Error('上传已取消');
+
+    const finish = (url: string, mode: ChunkedUploadResult['mode'], uploadedBytes: number, uploadStart: number) => {
+      const durationMs = performance.now() - startTime;
+      const uploadMs = performance.now() - uploadStart;
+      const bytesPerSecond = uploadMs > 0 ? uploadedBytes / (uploadMs / 1000) : 0;
+      onProgress?.({
+        phase: 'done',
+        loaded: file.size,
+        total: file.size,
+        percent: 100,
+        uploadedChunks: chunkCount,
+        chunkCount,
+        bytesPerSecond,
+        resumed: mode !== 'instant' && uploadedBytes < file.size
+      });
+      return { url, fileHash, mode, durationMs, bytesPerSecond };
+    };
+
+    // 2. 本地已有该文件的上传结果，直接复用
+    const local = await uploadStorage.get(fileHash);
+    if (local?.url) {
+      logger.debug('⚡ 文件已上传过，直接复用:', file.name);
+      return finish(local.url, 'instant', 0, performance.now());
+    }
+
+    // 3. 初始化，后端返回已上传的分片；文件已存在时直接返回URL
+    const initResponse = await apiClient.post(API_ENDPOINTS.FILE.CHUNK_INIT, {
+      fileHash,
+      fileName: file.name,
+      fileSize: file.size,
+      contentType: file.type,
+      chunkSize,
+      chunkCount,
+      uploadId: local?.uploadId
+    }, { baseURL: UPLOAD_CONFIG.CHUNK_BASE_URL, signal });
+    const init: InitResponse = initResponse.data.data;
+
+    const record: UploadRecord = {
+      fileHash,
+      fileName: file.name,
+      fileSize: file.size,
+      chunkSize,
+      chunkCount,
+      uploadId: init.uploadId,
+      uploadedChunks: init.uploadedChunks || [],
+      updatedAt: Date.now()
+    };
+
+    if (init.url) {
+      await uploadStorage.put({ ...record, uploadedChunks: [], url: init.url });
+      logger.debug('⚡ 后端已存在相同文件，跳过上传:', file.name);
+      return finish(init.url, 'instant', 0, performance.now());
+    }
+
+    // 4. 并行上传剩余分片
+    const uploaded = new Set(record.uploadedChunks);
+    const resumed = uploaded.size > 0;
+    const sizeOf = (index: number) => Math.min(file.size, (index + 1) * chunkSize) - index * chunkSize;
+    const resumedBytes = Array.from(uploaded).reduce((total, index) => total + sizeOf(index), 0);
+    const pending = Array.from({ length: chunkCount }, (_, index) => index).filter(index => !uploaded.has(index));
+    const resumedChunks = chunkCount - pending.length;
+    const inflightBytes = new Map<number, number>();
+    let sessionBytes = 0;
+    let lastProgressAt = 0;
+    const uploadStart = performance.now();
+
+    if (resumed) {
+      logger.debug(`🔁 断点续传 ${file.name}：已完成 ${uploaded.size}/${chunkCount} 个分片`);
+    }
+    await uploadStorage.put(record);
+
+    const reportUpload = (force = false) => {
+      const now = performance.now();
+      if (!onProgress || (!force && now - lastProgressAt < PROGRESS_INTERVAL)) return;
+      lastProgressAt = now;
+
+      let inflight = 0;
+      inflightBytes.forEach(bytes => { inflight += bytes; });
+      const loaded = Math.min(file.size, resumedBytes + sessionBytes + inflight);
+      const elapsed = (now - uploadStart) / 1000;
+      onProgress({
+        phase: 'uploading',
+        loaded,
+        total: file.size,
+        percent: Math.min(99, Math.floor((loaded / file.size) * 100)),
+        uploadedChunks: uploaded.size,
+        chunkCount,
+        bytesPerSecond: elapsed > 0 ? (sessionBytes + inflight) / elapsed : 0,
+        resumed
+      });
+    };
+
+    // 任一分片最终失败时，停止其余分片
+    const controller = new AbortController();
+    signal?.addEventListener('abort', () => controller.abort(), { once: true });
+
+    const uploadChunk = async (index: number) => {
+      const blob = file.slice(index * chunkSize, index * chunkSize + sizeOf(index));
+
+      for (let attempt = 0; ; attempt++) {
+        try {
+          await apiClient.put(API_ENDPOINTS.FILE.CHUNK, blob, {
+            baseURL: UPLOAD_CONFIG.CHUNK_BASE_URL,
+            params: { uploadId: record.uploadId, index },
+            headers: { 'Content-Type': 'application/octet-stream' },
+            timeout: UPLOAD_CONFIG.CHUNK_TIMEOUT,
+            signal: controller.signal,
+            onUploadProgress: (event) => {
+              inflightBytes.set(index, event.loaded);
+              reportUpload();
+            }
+          });
+          break;
+        } catch (error) {
+          inflightBytes.delete(index);
+          if (controller.signal.aborted || isUnsupported(error) || attempt >= UPLOAD_CONFIG.MAX_RETRIES) {
+            throw error;
+          }
+          const delay = RETRY_BASE_DELAY * 2 ** attempt + Math.random() * RETRY_BASE_DELAY;
+          logger.warn(`⚠️ 分片 ${index + 1}/${chunkCount} 上传失败，${Math.round(delay)}ms后第${attempt + 1}次重试`);
+          await sleep(delay, controller.signal);
+        }
+      }
+
+      inflightBytes.delete(index);
+      sessionBytes += sizeOf(index);
+      uploaded.add(index);
+      record.uploadedChunks = Array.from(uploaded);
+      uploadStorage.put(record);
+      reportUpload(true);
+    };
+
+    const runWorker = async () => {
+      while (pending.length > 0 && !controller.signal.aborted) {
+        await uploadChunk(pending.shift()!);
+      }
+    };
+
+    try {
+      await Promise.all(
+        Array.from({ length: Math.min(UPLOAD_CONFIG.CONCURRENCY, pending.length) }, runWorker)
+      );
+    } catch (error) {
+      controller.abort();
+      throw signal?.aborted ? new Error('上传已取消') : error;
+    }
+
+    // 5. 合并分片
+    onProgress?.({
+      phase: 'completing',
+      loaded: file.size,
+      total: file.size,
+      percent: 99,
+      uploadedChunks: chunkCount,
+      chunkCount,
+      bytesPerSecond: sessionBytes / Math.max(0.001, (performance.now() - uploadStart) / 1000),
+      resumed
+    });
+    const completeResponse = await apiClient.post(API_ENDPOINTS.FILE.CHUNK_COMPLETE, {
+      uploadId: record.uploadId,
+      fileHash
+    }, { baseURL: UPLOAD_CONFIG.CHUNK_BASE_URL, signal });
+    const url: string | undefined = completeResponse.data.data?.url;
+    if (!url) {
+      throw new Error('服务器返回的文件URL为空，上传可能失败');
+    }
+
+    await uploadStorage.put({ ...record, uploadedChunks: [], url });
+    const result = finish(url, 'chunked', sessionBytes, uploadStart);
+    logger.debug('✅ 分片上传完成:', {
+      fileName: file.name,
+      chunks: chunkCount,
+      resumedChunks,
+      throughput: `${(result.bytesPerSecond / 1024 / 1024).toFixed(2)}MB/s`
+    });
+    return result;
+  }
+}
+
+export const chunkedUploader = new ChunkedUploader();
@@ -0,0 +1,49 @@
+/**
+ * @jest-environment node
+ */
+import { Blob } from 'buffer';
+import { createHash } from 'crypto';
+import { computeFileHash, sha256 } from './fileHash';
+
+const encode = (text: string) => new TextEncoder().encode(text);
+
+const nodeSha256 = (data: string | Uint8Array) => createHash('sha256').update(data).digest('hex');
+
+describe('sha256', () => {
+  it.each([
+    ['', 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'],
+    ['abc', 'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad'],
+    [
+      'abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq',
+      '248d6a61d20638b8e5c026930c3e6039a33ce45964ff2167f6ecedd419db06c1'
+    ],
+    ['a'.repeat(1000000), 'cdc76e5c9914fb9281a1c7e284d73e67f1809a48a497200e046d39ccc7112cd0']
+  ])('标准测试向量 %#', (input, expected) => {
+    expect(sha256(encode(input))).toBe(expected);
+  });
+
+  it('填充边界附近的长度与Node实现一致', () => {
+    [55, 56, 63, 64, 65, 119, 120].forEach(length => {
+      const data = encode('x'.repeat(length));
+      expect(sha256(data)).toBe(nodeSha256(data));
+    });
+  });
+});
+
+describe('computeFileHash', () => {
+  it('按分片计算哈希，文件哈希由大小、分片大小和分片哈希得出', async () => {
+    const onProgress = jest.fn();
+    const file = new Blob(['a'.repeat(10)]) as unknown as globalThis.Blob;
+
+    const result = await computeFileHash(file, 4, onProgress);
+
+    expect(result.chunkHashes).toEqual([nodeSha256('aaaa'), nodeSha256('aaaa'), nodeSha256('aa')]);
+    expect(result.fileHash).toBe(nodeSha256(`10:4:${result.chunkHashes.join('')}`));
+    expect(onProgress.mock.calls).toEqual([[4], [8], [10]]);
+  });
+
+  it('空文件也有一个分片', async () => {
+    const result = await computeFileHash(new Blob([]) as unknown as globalThis.Blob, 4);
+    expect(result.chunkHashes).toEqual([nodeSha256('')]);
+  });
+});
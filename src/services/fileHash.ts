@@ -0,0 +1,130 @@
+// 文件哈希计算 - 按分片计算SHA-256，文件哈希为各分片哈希拼接后的SHA-256
+// 该模块不依赖DOM，既可在Web Worker中运行，也可在主线程中作为降级方案使用
+
+export interface FileHashResult {
+  fileHash: string;
+  chunkHashes: string[];
+}
+
+// SHA-256轮常量
+const K = new Uint32Array([
+  0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+  0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+  0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+  0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+  0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+  0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+  0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+  0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+]);
+
+const toHex = (bytes: Uint8Array): string => {
+  let hex = '';
+  for (let i = 0; i < bytes.length; i++) {
+    hex += bytes[i].toString(16).padStart(2, '0');
+  }
+  return hex;
+};
+
+/**
+ * 纯JS实现的SHA-256，在非安全上下文（HTTP访问时crypto.subtle不可用）中使用
+ */
+export const sha256 = (data: Uint8Array): string => {
+  const hash = new Uint32Array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+  ]);
+
+  // 填充：0x80 + 若干0 + 64位消息长度（位）
+  const paddedLength = Math.ceil((data.length + 9) / 64) * 64;
+  const padded = new Uint8Array(paddedLength);
+  padded.set(data);
+  padded[data.length] = 0x80;
+  const view = new DataView(padded.buffer);
+  const bitLength = data.length * 8;
+  view.setUint32(paddedLength - 8, Math.floor(bitLength / 0x100000000));
+  view.setUint32(paddedLength - 4, bitLength >>> 0);
+
+  const w = new Uint32Array(64);
+  for (let offset = 0; offset < paddedLength; offset += 64) {
+    for (let i = 0; i < 16; i++) {
+      w[i] = view.getUint32(offset + i * 4);
+    }
+    for (let i = 16; i < 64; i++) {
+      const w15 = w[i - 15];
+      const w2 = w[i - 2];
+      const s0 = ((w15 >>> 7) | (w15 << 25)) ^ ((w15 >>> 18) | (w15 << 14)) ^ (w15 >>> 3);
+      const s1 = ((w2 >>> 17) | (w2 << 15)) ^ ((w2 >>> 19) | (w2 << 13)) ^ (w2 >>> 10);
+      w[i] = (w[i - 16] + s0 + w[i - 7] + s1) | 0;
+    }
+
+    let a = hash[0], b = hash[1], c = hash[2], d = hash[3];
+    let e = hash[4], f = hash[5], g = hash[6], h = hash[7];
+    for (let i = 0; i < 64; i++) {
+      const s1 = ((e >>> 6) | (e << 26)) ^ ((e >>> 11) | (e << 21)) ^ ((e >>> 25) | (e << 7));
+      const ch = (e & f) ^ (~e & g);
+      const t1 = (h + s1 + ch + K[i] + w[i]) | 0;
+      const s0 = ((a >>> 2) | (a << 30)) ^ ((a >>> 13) | (a << 19)) ^ ((a >>> 22) | (a << 10));
+      const maj = (a & b) ^ (a & c) ^ (b & c);
+      const t2 = (s0 + maj) | 0;
+      h = g;
+      g = f;
+      f = e;
+      e = (d + t1) | 0;
+      d = c;
+      c = b;
+      b = a;
+      a = (t1 + t2) | 0;
+    }
+
+    hash[0] += a;
+    hash[1] += b;
+    hash[2] += c;
+    hash[3] += d;
+    hash[4] += e;
+    hash[5] += f;
+    hash[6] += g;
+    hash[7] += h;
+  }
+
+  const result = new Uint8Array(32);
+  const resultView = new DataView(result.buffer);
+  hash.forEach((word, i) => resultView.setUint32(i * 4, word));
+  return toHex(result);
+};
+
+const digest = async (buffer: ArrayBuffer): Promise<string> => {
+  const subtle = typeof crypto !== 'undefined' ? crypto.subtle : undefined;
+  if (subtle) {
+    return toHex(new Uint8Array(await subtle.digest('SHA-256', buffer)));
+  }
+  return sha256(new Uint8Array(buffer));
+};
+
+const readBlob = (blob: Blob): Promise<ArrayBuffer> =>
+  typeof blob.arrayBuffer === 'function' ? blob.arrayBuffer() : new Response(blob).arrayBuffer();
+
+/**
+ * 计算文件哈希，每次只读取一个分片，大文件不会一次性载入内存
+ * @param file 文件
+ * @param chunkSize 分片大小，需与上传时一致
+ * @param onProgress 已处理的字节数
+ */
+export const computeFileHash = async (
+  file: Blob,
+  chunkSize: number,
+  onProgress?: (loaded: number) => void
+): Promise<FileHashResult> => {
+  const chunkCount = Math.max(1, Math.ceil(file.size / chunkSize));
+  const chunkHashes: string[] = [];
+
+  for (let index = 0; index < chunkCount; index++) {
+    const start = index * chunkSize;
+    const end = Math.min(file.size, start + chunkSize);
+    chunkHashes.push(await digest(await readBlob(file.slice(start, end))));
+    onProgress?.(end);
+  }
+
+  const summary = new TextEncoder().encode(`${file.size}:${chunkSize}:${chunkHashes.join('')}`);
+  const fileHash = await digest(summary.buffer as ArrayBuffer);
+  return { fileHash, chunkHashes };
+};
@@ -0,0 +1,31 @@
+/* eslint-disable no-restricted-globals */
+// 文件哈希Worker - 在后台线程中读取文件并计算哈希，避免大文件阻塞界面
+import { computeFileHash } from './fileHash';
+import type { HashRequest, HashResponse } from './chunkedUpload';
+
+// 进度消息的最小间隔
+const PROGRESS_INTERVAL = 100;
+
+self.onmessage = async (event: MessageEvent<HashRequest>) => {
+  const { id, file, chunkSize } = event.data;
+  let lastProgressAt = 0;
+
+  try {
+    const result = await computeFileHash(file, chunkSize, loaded => {
+      const now = Date.now();
+      if (now - lastProgressAt >= PROGRESS_INTERVAL) {
+        lastProgressAt = now;
+        self.postMessage({ id, type: 'progress', loaded } as HashResponse);
+      }
+    });
+    self.postMessage({ id, type: 'done', result } as HashResponse);
+  } catch (error) {
+    self.postMessage({
+      id,
+      type: 'error',
+      error: error instanceof Error ? error.message : String(error)
+    } as HashResponse);
+  }
+};
+
+export {};
@@ -0,0 +1,4 @@
+// 文件哈希Worker的创建入口 - import.meta只能在ES模块中使用，单独放在这里，
+// 使Jest等以CommonJS方式加载chunkedUpload的环境可以替换掉该模块
+export const createFileHashWorker = (): Worker =>
+  new Worker(new URL('./fileHash.worker.ts', import.meta.url));
@@ -0,0 +1,73 @@
+// 分级日志 - 低于当前级别的方法替换为空函数，生产环境默认不产生控制台开销
+import { METRICS_CONFIG } from '../config/api';
+
+export type LogLevel = 'debug' | 'info' | 'warn' | 'error' | 'silent';
+
+type LogMethod = (...args: unknown[]) => void;
+
+export interface Logger {
+  debug: LogMethod;
+  info: LogMethod;
+  warn: LogMethod;
+  error: LogMethod;
+}
+
+export const LOG_LEVELS: LogLevel[] = ['debug', 'info', 'warn', 'error', 'silent'];
+
+const LOG_LEVEL_STORAGE_KEY = 'log_level';
+
+const noop: LogMethod = () => {};
+
+const isLogLevel = (value: unknown): value is LogLevel =>
+  typeof value === 'string' && LOG_LEVELS.includes(value as LogLevel);
+
+const readInitialLevel = (): LogLevel => {
+  try {
+    const stored = typeof localStorage !== 'undefined' ? localStorage.getItem(LOG_LEVEL_STORAGE_KEY) : null;
+    if (isLogLevel(stored)) return stored;
+  } catch {
+    // 隐私模式下读取localStorage可能抛错，使用默认级别
+  }
+  return isLogLevel(METRICS_CONFIG.LOG_LEVEL) ? METRICS_CONFIG.LOG_LEVEL : 'silent';
+};
+
+let currentLevel: LogLevel = readInitialLevel();
+
+export const logger: Logger = {
+  debug: noop,
+  info: noop,
+  warn: noop,
+  error: noop
+};
+
+/**
+ * 判断某个级别的日志当前是否输出，参数需要额外计算时可先判断
+ */
+export const isLogEnabled = (level: Exclude<LogLevel, 'silent'>): boolean =>
+  LOG_LEVELS.indexOf(level) >= LOG_LEVELS.indexOf(currentLevel);
+
+// 直接绑定console方法，浏览器控制台中显示的仍是调用处的位置
+const applyLevel = () => {
+  logger.debug = isLogEnabled('debug') ? console.log.bind(console) : noop;
+  logger.info = isLogEnabled('info') ? console.info.bind(console) : noop;
+  logger.warn = isLogEnabled('warn') ? console.warn.bind(console) : noop;
+  logger.error = isLogEnabled('error') ? console.error.bind(console) : noop;
+};
+
+applyLevel();
+
+export const getLogLevel = (): LogLevel => currentLevel;
+
+/**
+ * 修改日志级别，默认保存到localStorage，刷新后仍然生效
+ */
+export const setLogLevel = (level: LogLevel, persist = true) => {
+  currentLevel = level;
+  applyLevel();
+  if (!persist) return;
+  try {
+    localStorage.setItem(LOG_LEVEL_STORAGE_KEY, level);
+  } catch {
+    // 忽略存储失败
+  }
+};
@@ -0,0 +1,82 @@
+import { MetricsRegistry, METRIC_NAMES } from './metrics';
+import { METRICS_CONFIG } from '../config/api';
+
+const histogramOf = (registry: MetricsRegistry, name: string, label = '') =>
+  registry.snapshot().histograms.find(item => item.name === name && item.label === label);
+
+describe('MetricsRegistry', () => {
+  it('均匀分布时分位数估算准确', () => {
+    const registry = new MetricsRegistry(true, '');
+    for (let value = 1; value <= 100; value++) {
+      registry.observe('test', value);
+    }
+
+    expect(histogramOf(registry, 'test')).toMatchObject({
+      count: 100,
+      min: 1,
+      max: 100,
+      avg: 50.5,
+      p50: 50,
+      p95: 95,
+      p99: 99
+    });
+  });
+
+  it('分位数限制在实际最小值和最大值之间', () => {
+    const registry = new MetricsRegistry(true, '');
+    registry.observe('test', 3);
+
+    expect(histogramOf(registry, 'test')).toMatchObject({ p50: 3, p95: 3, p99: 3 });
+  });
+
+  it('超过最大上界的值按实际最大值插值', () => {
+    const registry = new MetricsRegistry(true, '');
+    registry.observe('test', 70000);
+    registry.observe('test', 80000);
+
+    const histogram = histogramOf(registry, 'test');
+    expect(histogram?.p50).toBe(70000);
+    expect(histogram?.p99).toBeCloseTo(79800);
+  });
+
+  it('关闭采集或数值无效时不记录', () => {
+    const registry = new MetricsRegistry(false, '');
+    registry.observe('test', 1);
+    registry.increment('count');
+    expect(registry.snapshot()).toMatchObject({ histograms: [], counters: [] });
+
+    registry.setEnabled(true);
+    registry.observe('test', NaN);
+    registry.observe('test', Infinity);
+    expect(registry.snapshot().histograms).toEqual([]);
+  });
+
+  it('标签数超过上限后归入other', () => {
+    const registry = new MetricsRegistry(true, '');
+    for (let i = 0; i < METRICS_CONFIG.MAX_LABELS_PER_METRIC + 2; i++) {
+      registry.increment(METRIC_NAMES.STORE_SET, `store-${i}`);
+    }
+
+    const counters = registry.snapshot().counters;
+    expect(counters).toHaveLength(METRICS_CONFIG.MAX_LABELS_PER_METRIC + 1);
+    expect(counters.find(item => item.label === 'other')?.count).toBe(2);
+  });
+
+  it('上报后清空增量，累计数据保留', () => {
+    const sendBeacon = jest.fn().mockReturnValue(true);
+    Object.defineProperty(navigator, 'sendBeacon', { value: sendBeacon, configurable: true });
+    const registry = new MetricsRegistry(true, 'http://localhost:8091/metrics');
+
+    expect(registry.flush()).toBe(false);
+    registry.observe('test', 10);
+    expect(registry.flush()).toBe(true);
+    expect(sendBeacon).toHaveBeenCalledWith('http://localhost:8091/metrics', expect.any(Blob));
+    expect(registry.flush()).toBe(false);
+    expect(histogramOf(registry, 'test')?.count).toBe(1);
+
+    sendBeacon.mockReturnValue(false);
+    registry.increment('count');
+    expect(registry.flush()).toBe(false);
+    expect(registry.snapshot().counters.find(item => item.name === METRIC_NAMES.BEACON_DROPPED)?.count).toBe(1);
+  });
+});
@@ -0,0 +1,383 @@
+// 性能指标 - 以固定分桶直方图聚合接口耗时、流式响应、store更新频率和React提交耗时
+// 供调试面板查看，并按固定间隔通过sendBeacon批量上报到采集服务
+import { METRICS_CONFIG, APP_CONFIG } from '../config/api';
+import { logger } from './logger';
+
+export const METRIC_NAMES = {
+  API_LATENCY: 'api.latency',                      // 接口耗时（毫秒），标签为 "METHOD url"
+  API_ERRORS: 'api.errors',                        // 失败的接口请求次数，标签同上
+  SSE_TTFB: 'sse.ttfb',                            // 流式对话从发起请求到收到首个字节的耗时（毫秒）
+  SSE_TOKENS_PER_SECOND: 'sse.tokens_per_second',  // 流式输出速率，后端每个SSE数据块对应一次模型输出
+  STORE_SET: 'store.set',                          // store的set()调用次数，标签为store名称
+  REACT_COMMIT: 'react.commit',                    // React提交耗时（毫秒），标签为Profiler id
+  BEACON_DROPPED: 'metrics.beacon_dropped'         // 上报失败被丢弃的批次
+} as const;
+
+// 分桶上界，1-2-5序列覆盖0.5毫秒到1分钟，同时适用于耗时和速率
+export const BUCKET_BOUNDS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000];
+
+const DEBUG_METRICS_STORAGE_KEY = 'debug_metrics';
+const OVERFLOW_LABEL = 'other';
+
+export interface HistogramSnapshot {
+  name: string;
+  label: string;
+  count: number;
+  sum: number;
+  min: number;
+  max: number;
+  avg: number;
+  p50: number;
+  p95: number;
+  p99: number;
+}
+
+export interface CounterSnapshot {
+  name: string;
+  label: string;
+  count: number;
+  ratePerSecond: number;
+}
+
+export interface MetricsSnapshot {
+  startedAt: number;
+  durationMs: number;
+  histograms: HistogramSnapshot[];
+  counters: CounterSnapshot[];
+}
+
+// 上报格式：每批包含上次上报以来的增量，采集端按分桶累加即可合并
+export interface MetricsBatch {
+  app: string;
+  version: string;
+  clientId: string;
+  page: string;
+  sentAt: number;
+  intervalMs: number;
+  bounds: number[];
+  histograms: Array<{ name: string; label: string; count: number; sum: number; min: number; max: number; buckets: number[] }>;
+  counters: Array<{ name: string; label: string; count: number }>;
+}
+
+class Histogram {
+  count = 0;
+  sum = 0;
+  min = Infinity;
+  max = 0;
+  // 最后一个桶存放超过最大上界的值
+  buckets: number[] = new Array(BUCKET_BOUNDS.length + 1).fill(0);
+
+  observe(value: number) {
+    this.count++;
+    this.sum += value;
+    if (value < this.min) this.min = value;
+    if (value > this.max) this.max = value;
+
+    let index = 0;
+    while (index < BUCKET_BOUNDS.length && value > BUCKET_BOUNDS[index]) {
+      index++;
+    }
+    this.buckets[index]++;
+  }
+
+  /**
+   * 按分桶估算分位数，在桶内线性插值并限制在实际最小值和最大值之间
+   */
+  percentile(q: number): number {
+    if (this.count === 0) return 0;
+    const target = q * this.count;
+    let cumulative = 0;
+    for (let i = 0; i < this.buckets.length; i++) {
+      const bucketCount = this.buckets[i];
+      if (bucketCount > 0 && cumulative + bucketCount >= target) {
+        const lower = i === 0 ? 0 : BUCKET_BOUNDS[i - 1];
+        const upper = i < BUCKET_BOUNDS.length ? BUCKET_BOUNDS[i] : this.max;
+        const estimate = lower + (upper - lower) * ((target - cumulative) / bucketCount);
+        return Math.min(this.max, Math.max(this.min, estimate));
+      }
+      cumulative += bucketCount;
+    }
+    return this.max;
+  }
+}
+
+interface Series<T> {
+  name: string;
+  label: string;
+  value: T;
+}
+
+// 指标名 -> 标签 -> 数据，同时限制每个指标的标签数量
+class SeriesMap<T> {
+  private series = new Map<string, Map<string, Series<T>>>();
+
+  constructor(private create: () => T) {}
+
+  get(name: string, label: string): T {
+    let labels = this.series.get(name);
+    if (!labels) {
+      labels = new Map();
+      this.series.set(name, labels);
+    }
+    let entry = labels.get(label);
+    if (!entry) {
+      const key = labels.size >= METRICS_CONFIG.MAX_LABELS_PER_METRIC ? OVERFLOW_LABEL : label;
+      entry = labels.get(key);
+      if (!entry) {
+        entry = { name, label: key, value: this.create() };
+        labels.set(key, entry);
+      }
+    }
+    return entry.value;
+  }
+
+  forEach(callback: (entry: Series<T>) => void) {
+    this.series.forEach(labels => labels.forEach(callback));
+  }
+
+  get size() {
+    let size = 0;
+    this.series.forEach(labels => {
+      size += labels.size;
+    });
+    return size;
+  }
+
+  clear() {
+    this.series.clear();
+  }
+}
+
+const now = (): number =>
+  typeof performance !== 'undefined' && typeof performance.now === 'function'
+    ? performance.now()
+    : Date.now();
+
+const readEnabled = (): boolean => {
+  try {
+    const stored = typeof localStorage !== 'undefined' ? localStorage.getItem(DEBUG_METRICS_STORAGE_KEY) : null;
+    if (stored !== null) return stored === 'true';
+  } catch {
+    // 隐私模式下读取localStorage可能抛错，使用默认配置
+  }
+  return METRICS_CONFIG.ENABLED;
+};
+
+const createClientId = (): string =>
+  typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function'
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+
+export class MetricsRegistry {
+  // 累计数据，供调试面板查看
+  private histograms = new SeriesMap(() => new Histogram());
+  private counters = new SeriesMap(() => ({ count: 0 }));
+  // 上次上报以来的增量
+  private pendingHistograms = new SeriesMap(() => new Histogram());
+  private pendingCounters = new SeriesMap(() => ({ count: 0 }));
+  private startedAt = Date.now();
+  private lastFlushAt = Date.now();
+  private flushTimer: ReturnType<typeof setInterval> | null = null;
+  private readonly clientId = createClientId();
+
+  constructor(private enabled: boolean, private endpoint: string) {}
+
+  isEnabled(): boolean {
+    return this.enabled;
+  }
+
+  getEndpoint(): string {
+    return this.endpoint;
+  }
+
+  /**
+   * 开启或关闭采集并保存到localStorage；store和React Profiler的埋点在页面加载时决定，刷新后生效
+   */
+  setEnabled(enabled: boolean) {
+    this.enabled = enabled;
+    try {
+      localStorage.setItem(DEBUG_METRICS_STORAGE_KEY, String(enabled));
+    } catch {
+      // 忽略存储失败
+    }
+    if (enabled) {
+      this.start();
+    } else {
+      this.stop();
+    }
+  }
+
+  /**
+   * 记录一个数值样本，例如耗时或速率
+   */
+  observe(name: string, value: number, label = '') {
+    if (!this.enabled || !Number.isFinite(value)) return;
+    this.histograms.get(name, label).observe(value);
+    if (this.endpoint) {
+      this.pendingHistograms.get(name, label).observe(value);
+    }
+  }
+
+  /**
+   * 计数器加一
+   */
+  increment(name: string, label = '', by = 1) {
+    if (!this.enabled) return;
+    this.counters.get(name, label).count += by;
+    if (this.endpoint) {
+      this.pendingCounters.get(name, label).count += by;
+    }
+  }
+
+  /**
+   * 返回一个结束计时的函数，调用时记录从现在起经过的毫秒数
+   */
+  startTimer(name: string, label = ''): () => number {
+    const startTime = now();
+    return () => {
+      const duration = now() - startTime;
+      this.observe(name, duration, label);
+      return duration;
+    };
+  }
+
+  snapshot(): MetricsSnapshot {
+    const durationMs = Date.now() - this.startedAt;
+    const histograms: HistogramSnapshot[] = [];
+    this.histograms.forEach(({ name, label, value }) => {
+      histograms.push({
+        name,
+        label,
+        count: value.count,
+        sum: value.sum,
+        min: value.count > 0 ? value.min : 0,
+        max: value.max,
+        avg: value.count > 0 ? value.sum / value.count : 0,
+        p50: value.percentile(0.5),
+        p95: value.percentile(0.95),
+        p99: value.percentile(0.99)
+      });
+    });
+
+    const counters: CounterSnapshot[] = [];
+    this.counters.forEach(({ name, label, value }) => {
+      counters.push({
+        name,
+        label,
+        count: value.count,
+        ratePerSecond: durationMs > 0 ? (value.count / durationMs) * 1000 : 0
+      });
+    });
+
+    return { startedAt: this.startedAt, durationMs, histograms, counters };
+  }
+
+  /**
+   * 清空累计数据，待上报的增量不受影响
+   */
+  reset() {
+    this.histograms.clear();
+    this.counters.clear();
+    this.startedAt = Date.now();
+  }
+
+  /**
+   * 开始定时上报，页面隐藏或关闭前也会上报一次；未配置上报地址时不做任何事
+   */
+  start() {
+    if (!this.enabled || !this.endpoint || this.flushTimer || typeof window === 'undefined') return;
+    this.flushTimer = setInterval(() => this.flush(), METRICS_CONFIG.FLUSH_INTERVAL);
+    document.addEventListener('visibilitychange', this.handleVisibilityChange);
+    window.addEventListener('pagehide', this.handlePageHide);
+  }
+
+  stop() {
+    if (!this.flushTimer) return;
+    clearInterval(this.flushTimer);
+    this.flushTimer = null;
+    document.removeEventListener('visibilitychange', this.handleVisibilityChange);
+    window.removeEventListener('pagehide', this.handlePageHide);
+  }
+
+  /**
+   * 上报上次上报以来的增量，返回是否已发送
+   */
+  flush(): boolean {
+    if (!this.endpoint || (this.pendingHistograms.size === 0 && this.pendingCounters.size === 0)) {
+      return false;
+    }
+
+    const batch = this.buildBatch();
+    this.pendingHistograms.clear();
+    this.pendingCounters.clear();
+    this.lastFlushAt = batch.sentAt;
+
+    // text/plain不触发CORS预检，采集端可直接接收
+    const body = JSON.stringify(batch);
+    let sent = false;
+    try {
+      if (typeof navigator !== 'undefined' && typeof navigator.sendBeacon === 'function') {
+        sent = navigator.sendBeacon(this.endpoint, new Blob([body], { type: 'text/plain' }));
+      } else if (typeof fetch === 'function') {
+        fetch(this.endpoint, { method: 'POST', body, keepalive: true, mode: 'no-cors' }).catch(() => {});
+        sent = true;
+      }
+    } catch (error) {
+      logger.warn('⚠️ [metrics] 指标上报失败:', error);
+    }
+
+    if (!sent) {
+      this.counters.get(METRIC_NAMES.BEACON_DROPPED, '').count++;
+    }
+    return sent;
+  }
+
+  private buildBatch(): MetricsBatch {
+    const sentAt = Date.now();
+    const histograms: MetricsBatch['histograms'] = [];
+    this.pendingHistograms.forEach(({ name, label, value }) => {
+      histograms.push({
+        name,
+        label,
+        count: value.count,
+        sum: value.sum,
+        min: value.min,
+        max: value.max,
+        buckets: value.buckets
+      });
+    });
+
+    const counters: MetricsBatch['counters'] = [];
+    this.pendingCounters.forEach(({ name, label, value }) => {
+      counters.push({ name, label, count: value.count });
+    });
+
+    return {
+      app: APP_CONFIG.name,
+      version: APP_CONFIG.version,
+      clientId: this.clientId,
+      page: typeof window !== 'undefined' ? window.location.pathname : '',
+      sentAt,
+      intervalMs: sentAt - this.lastFlushAt,
+      bounds: BUCKET_BOUNDS,
+      histograms,
+      counters
+    };
+  }
+
+  private handleVisibilityChange = () => {
+    if (document.visibilityState === 'hidden') this.flush();
+  };
+
+  private handlePageHide = () => {
+    this.flush();
+  };
+}
+
+export const metrics = new MetricsRegistry(readEnabled(), METRICS_CONFIG.ENDPOINT);
+metrics.start();
+
+// 开发环境下可在浏览器控制台调用 getMetricsSnapshot() 查看聚合后的指标
+if (typeof window !== 'undefined' && process.env.NODE_ENV === 'development') {
+  (window as any).getMetricsSnapshot = () => metrics.snapshot();
+}
@@ -0,0 +1,98 @@
+import { RequestCache, buildCacheKey } from './requestCache';
+
+const flushPromises = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe('RequestCache', () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1000;
+    jest.spyOn(Date, 'now').mockImplementation(() => now);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('参数顺序不同时生成相同的缓存键，并忽略空参数', () => {
+    expect(buildCacheKey('/data', { b: 2, a: 1, c: '' })).toBe(buildCacheKey('/data', { a: 1, b: 2 }));
+    expect(buildCacheKey('/data', { keyword: undefined })).toBe('/data');
+  });
+
+  it('合并相同key的进行中请求', async () => {
+    const cache = new RequestCache();
+    let resolve: (value: string) => void = () => {};
+    const fetcher = jest.fn(() => new Promise<string>(r => { resolve = r; }));
+
+    const first = cache.get('key', fetcher);
+    const second = cache.get('key', fetcher);
+    resolve('数据');
+
+    await expect(first).resolves.toBe('数据');
+    await expect(second).resolves.toBe('数据');
+    expect(fetcher).toHaveBeenCalledTimes(1);
+    expect(cache.getMetrics().deduped).toBe(1);
+  });
+
+  it('新鲜期内直接返回缓存，过期后重新请求', async () => {
+    const cache = new RequestCache();
+    const fetcher = jest.fn().mockResolvedValueOnce('旧数据').mockResolvedValueOnce('新数据');
+
+    await cache.get('key', fetcher, { ttl: 100, staleTime: 0 });
+    now += 50;
+    await expect(cache.get('key', fetcher, { ttl: 100, staleTime: 0 })).resolves.toBe('旧数据');
+    expect(fetcher).toHaveBeenCalledTimes(1);
+
+    now += 100;
+    await expect(cache.get('key', fetcher, { ttl: 100, staleTime: 0 })).resolves.toBe('新数据');
+    expect(fetcher).toHaveBeenCalledTimes(2);
+  });
+
+  it('过期但仍在stale期内时先返回旧数据并在后台刷新', async () => {
+    const cache = new RequestCache();
+    const onRevalidated = jest.fn();
+    const fetcher = jest.fn().mockResolvedValueOnce('旧数据').mockResolvedValueOnce('新数据');
+    const options = { ttl: 100, staleTime: 1000, onRevalidated };
+
+    await cache.get('key', fetcher, options);
+    now += 200;
+    await expect(cache.get('key', fetcher, options)).resolves.toBe('旧数据');
+    await flushPromises();
+
+    expect(fetcher).toHaveBeenCalledTimes(2);
+    expect(onRevalidated).toHaveBeenCalledWith('新数据');
+    await expect(cache.get('key', fetcher, options)).resolves.toBe('新数据');
+    expect(cache.getMetrics()).toMatchObject({ staleHits: 1, revalidations: 1 });
+  });
+
+  it('按标签失效缓存，失效前发出的请求结果不再写入', async () => {
+    const cache = new RequestCache();
+    cache.set('list', [1], { tags: ['safety-data'] });
+    cache.set('stats', { total: 1 }, { tags: ['stats'] });
+
+    let resolve: (value: number[]) => void = () => {};
+    const pending = cache.get('detail', () => new Promise<number[]>(r => { resolve = r; }), { tags: ['safety-data'] });
+    cache.invalidate('safety-data');
+    resolve([2]);
+    await pending;
+
+    const fetcher = jest.fn().mockResolvedValue([3]);
+    await expect(cache.get('list', fetcher)).resolves.toEqual([3]);
+    await expect(cache.get('detail', fetcher)).resolves.toEqual([3]);
+    await expect(cache.get('stats', fetcher)).resolves.toEqual({ total: 1 });
+    expect(fetcher).toHaveBeenCalledTimes(2);
+  });
+
+  it('超过容量时淘汰最久未使用的缓存', async () => {
+    const cache = new RequestCache(2);
+    cache.set('a', 1);
+    cache.set('b', 2);
+    await cache.get('a', jest.fn());
+    cache.set('c', 3);
+    expect(cache.getMetrics().evictions).toBe(1);
+
+    const fetcher = jest.fn().mockResolvedValue(0);
+    await expect(cache.get('a', fetcher)).resolves.toBe(1);
+    await expect(cache.get('b', fetcher)).resolves.toBe(0);
+  });
+});
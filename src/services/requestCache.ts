@@ -0,0 +1,225 @@
+// 请求缓存层 - 合并相同的进行中GET请求，LRU缓存响应并支持stale-while-revalidate
+// 同时统计缓存命中率，供调试面板查看；接口耗时由metrics统一记录
+import { logger } from './logger';
+
+export interface CacheOptions<T = unknown> {
+  ttl?: number;          // 数据新鲜时间（毫秒），期间直接返回缓存
+  staleTime?: number;    // 过期后仍可返回旧数据的时间（毫秒），同时在后台重新请求
+  tags?: string[];       // 失效标签，写操作后按标签精确失效
+  force?: boolean;       // 跳过缓存直接请求
+  onRevalidated?: (data: T) => void;  // 后台重新请求成功后回调
+}
+
+interface CacheEntry {
+  data: unknown;
+  fetchedAt: number;
+  freshUntil: number;
+  staleUntil: number;
+  tags: string[];
+}
+
+interface InflightRequest {
+  promise: Promise<unknown>;
+  tags: string[];
+  cancelled: boolean;  // 请求期间缓存已失效，结果不再写入缓存
+}
+
+interface CacheCounters {
+  hits: number;
+  staleHits: number;
+  misses: number;
+  deduped: number;
+  revalidations: number;
+  invalidations: number;
+  evictions: number;
+}
+
+export interface CacheMetrics extends CacheCounters {
+  hitRate: number;
+  cacheSize: number;
+}
+
+const DEFAULT_TTL = 30 * 1000;
+const DEFAULT_STALE_TIME = 5 * 60 * 1000;
+const MAX_ENTRIES = 200;
+
+const createCounters = (): CacheCounters => ({
+  hits: 0,
+  staleHits: 0,
+  misses: 0,
+  deduped: 0,
+  revalidations: 0,
+  invalidations: 0,
+  evictions: 0
+});
+
+// 参数按键名排序后序列化，保证相同参数得到相同的缓存键
+export const buildCacheKey = (url: string, params?: Record<string, any>): string => {
+  if (!params) return url;
+  const query = Object.keys(params)
+    .filter(key => params[key] !== undefined && params[key] !== null && params[key] !== '')
+    .sort()
+    .map(key => `${key}=${encodeURIComponent(String(params[key]))}`)
+    .join('&');
+  return query ? `${url}?${query}` : url;
+};
+
+export class RequestCache {
+  private entries = new Map<string, CacheEntry>();
+  private inflight = new Map<string, InflightRequest>();
+  private counters = createCounters();
+
+  constructor(private maxEntries = MAX_ENTRIES) {}
+
+  /**
+   * 读取缓存，未命中时通过fetcher请求；相同key的进行中请求会被合并
+   */
+  async get<T>(key: string, fetcher: () => Promise<T>, options: CacheOptions<T> = {}): Promise<T> {
+    const now = Date.now();
+    const entry = options.force ? undefined : this.entries.get(key);
+
+    if (entry && now < entry.freshUntil) {
+      this.counters.hits++;
+      this.touch(key, entry);
+      return entry.data as T;
+    }
+
+    if (entry && now < entry.staleUntil) {
+      // 先返回旧数据，后台重新请求
+      this.counters.staleHits++;
+      this.touch(key, entry);
+      if (!this.inflight.has(key)) {
+        this.counters.revalidations++;
+        this.fetch(key, fetcher, options)
+          .then(data => options.onRevalidated?.(data))
+          .catch(error => logger.warn('⚠️ 后台刷新缓存失败:', key, error));
+      }
+      return entry.data as T;
+    }
+
+    const pending = this.inflight.get(key);
+    if (pending && !options.force) {
+      this.counters.deduped++;
+      return pending.promise as Promise<T>;
+    }
+
+    this.counters.misses++;
+    return this.fetch(key, fetcher, options);
+  }
+
+  private fetch<T>(key: string, fetcher: () => Promise<T>, options: CacheOptions<T>): Promise<T> {
+    const request: InflightRequest = { promise: Promise.resolve(), tags: options.tags || [], cancelled: false };
+    const promise = fetcher()
+      .then(data => {
+        if (!request.cancelled) {
+          this.set(key, data, options);
+        }
+        return data;
+      })
+      .finally(() => {
+        if (this.inflight.get(key) === request) {
+          this.inflight.delete(key);
+        }
+      });
+
+    request.promise = promise;
+    this.inflight.set(key, request);
+    return promise;
+  }
+
+  /**
+   * 写入缓存
+   */
+  set<T>(key: string, data: T, options: Pick<CacheOptions, 'ttl' | 'staleTime' | 'tags'> = {}) {
+    const now = Date.now();
+    const ttl = options.ttl ?? DEFAULT_TTL;
+    const staleTime = options.staleTime ?? DEFAULT_STALE_TIME;
+    this.entries.delete(key);
+    // ttl和staleTime都为0时只合并进行中的请求，不缓存结果
+    if (ttl <= 0 && staleTime <= 0) return;
+
+    this.entries.set(key, {
+      data,
+      fetchedAt: now,
+      freshUntil: now + ttl,
+      staleUntil: now + ttl + staleTime,
+      tags: options.tags || []
+    });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      if (oldestKey === undefined) break;
+      this.entries.delete(oldestKey);
+      this.counters.evictions++;
+    }
+  }
+
+  /**
+   * 原位修改带有指定标签的缓存数据，保留原有的过期时间
+   */
+  update<T>(tag: string, updater: (data: T) => T) {
+    this.entries.forEach(entry => {
+      if (entry.tags.includes(tag)) {
+        entry.data = updater(entry.data as T);
+      }
+    });
+  }
+
+  /**
+   * 使带有任一指定标签的缓存失效
+   */
+  invalidate(...tags: string[]) {
+    const matches = (entryTags: string[]) => entryTags.some(tag => tags.includes(tag));
+
+    this.entries.forEach((entry, key) => {
+      if (matches(entry.tags)) {
+        this.entries.delete(key);
+        this.counters.invalidations++;
+      }
+    });
+    // 失效前发出的请求可能返回旧数据，不再写入缓存也不再合并
+    this.inflight.forEach((request, key) => {
+      if (matches(request.tags)) {
+        request.cancelled = true;
+        this.inflight.delete(key);
+      }
+    });
+  }
+
+  /**
+   * 清空全部缓存，切换用户时调用
+   */
+  clear() {
+    this.entries.clear();
+    this.inflight.forEach(request => {
+      request.cancelled = true;
+    });
+    this.inflight.clear();
+  }
+
+  /**
+   * 获取缓存命中率等计数
+   */
+  getMetrics(): CacheMetrics {
+    const lookups = this.counters.hits + this.counters.staleHits + this.counters.misses + this.counters.deduped;
+    return {
+      ...this.counters,
+      hitRate: lookups > 0 ? (this.counters.hits + this.counters.staleHits + this.counters.deduped) / lookups : 0,
+      cacheSize: this.entries.size
+    };
+  }
+
+  /**
+   * 重置统计数据
+   */
+  resetMetrics() {
+    this.counters = createCounters();
+  }
+
+  private touch(key: string, entry: CacheEntry) {
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+  }
+}
+
+export const requestCache = new RequestCache();
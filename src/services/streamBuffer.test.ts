@@ -0,0 +1,102 @@
+import { StreamBuffer } from './streamBuffer';
+
+describe('StreamBuffer', () => {
+  let frames: FrameRequestCallback[];
+
+  const runFrame = () => {
+    const callbacks = frames;
+    frames = [];
+    callbacks.forEach(callback => callback(0));
+  };
+
+  beforeEach(() => {
+    frames = [];
+    jest.spyOn(window, 'requestAnimationFrame').mockImplementation(callback => frames.push(callback));
+    jest.spyOn(window, 'cancelAnimationFrame').mockImplementation(handle => {
+      frames[handle - 1] = () => {};
+    });
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('同一帧内的数据块合并为一次提交', () => {
+    const onFlush = jest.fn();
+    const buffer = new StreamBuffer(onFlush);
+
+    buffer.push('a', '你');
+    buffer.push('a', '好');
+    buffer.push('b', '世界');
+    expect(onFlush).not.toHaveBeenCalled();
+    expect(frames).toHaveLength(1);
+
+    runFrame();
+    expect(onFlush).toHaveBeenCalledTimes(2);
+    expect(onFlush).toHaveBeenCalledWith('a', '你好');
+    expect(onFlush).toHaveBeenCalledWith('b', '世界');
+  });
+
+  it('没有新数据的帧不提交', () => {
+    const onFlush = jest.fn();
+    const buffer = new StreamBuffer(onFlush);
+
+    buffer.push('a', '你');
+    runFrame();
+    runFrame();
+    buffer.push('a', '好');
+    runFrame();
+
+    expect(onFlush.mock.calls).toEqual([['a', '你'], ['a', '好']]);
+  });
+
+  it('结束时立即提交剩余数据并返回统计', () => {
+    const onFlush = jest.fn();
+    const buffer = new StreamBuffer(onFlush);
+
+    buffer.begin('a');
+    buffer.push('a', '你好');
+    runFrame();
+    buffer.push('a', '世界');
+    const stats = buffer.end('a');
+
+    expect(onFlush).toHaveBeenLastCalledWith('a', '世界');
+    expect(stats).toMatchObject({ messageId: 'a', chunkCount: 2, flushCount: 2, totalChars: 4 });
+    expect(stats?.timeToFirstTokenMs).not.toBeNull();
+    expect(buffer.getStats('a')).toBeNull();
+  });
+
+  it('丢弃时不提交未写入的数据', () => {
+    const onFlush = jest.fn();
+    const buffer = new StreamBuffer(onFlush);
+
+    buffer.push('a', '你好');
+    const stats = buffer.discard('a');
+    runFrame();
+
+    expect(onFlush).not.toHaveBeenCalled();
+    expect(stats).toMatchObject({ chunkCount: 1, flushCount: 0 });
+  });
+
+  it('没有收到数据时首字延迟为空', () => {
+    const buffer = new StreamBuffer(jest.fn());
+    buffer.begin('a');
+    expect(buffer.end('a')).toMatchObject({ chunkCount: 0, timeToFirstTokenMs: null, chunksPerSecond: 0 });
+  });
+
+  it('按首个到最后一个数据块的间隔计算速率，间隔为0时速率为0', () => {
+    let now = 1000;
+    jest.spyOn(performance, 'now').mockImplementation(() => now);
+    const buffer = new StreamBuffer(jest.fn());
+
+    buffer.begin('a');
+    now = 1100;
+    buffer.push('a', '你');
+    buffer.push('a', '好');
+    expect(buffer.getStats('a')).toMatchObject({ timeToFirstTokenMs: 100, chunksPerSecond: 0 });
+
+    now = 1600;
+    buffer.push('a', '世界');
+    expect(buffer.end('a')).toMatchObject({ durationMs: 600, chunksPerSecond: 6 });
+  });
+});
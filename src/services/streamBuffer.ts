@@ -0,0 +1,157 @@
+// 流式响应缓冲 - 按消息累积SSE数据块，每个动画帧最多向store提交一次
+
+// 流式统计数据
+export interface StreamStats {
+  messageId: string;
+  chunkCount: number;
+  flushCount: number;
+  totalChars: number;
+  timeToFirstTokenMs: number | null;  // 从开始请求到收到首个数据块的耗时
+  durationMs: number;                  // 从开始请求到最后一个数据块的耗时
+  chunksPerSecond: number;           // 首个到最后一个数据块之间的速率，间隔无法测量时为0
+}
+
+// 单条消息的缓冲状态
+interface MessageBuffer {
+  pending: string;
+  chunkCount: number;
+  flushCount: number;
+  totalChars: number;
+  startedAt: number;
+  firstChunkAt: number | null;
+  lastChunkAt: number | null;
+}
+
+type FlushHandler = (messageId: string, appended: string) => void;
+
+const now = (): number =>
+  typeof performance !== 'undefined' && typeof performance.now === 'function'
+    ? performance.now()
+    : Date.now();
+
+// 页面在后台时requestAnimationFrame会暂停，此时退回到定时器
+const scheduleFrame = (callback: () => void): (() => void) => {
+  const hidden = typeof document !== 'undefined' && document.hidden;
+  if (!hidden && typeof requestAnimationFrame === 'function') {
+    const handle = requestAnimationFrame(callback);
+    return () => cancelAnimationFrame(handle);
+  }
+  const handle = setTimeout(callback, 16);
+  return () => clearTimeout(handle);
+};
+
+export class StreamBuffer {
+  private buffers = new Map<string, MessageBuffer>();
+  private cancelScheduled: (() => void) | null = null;
+  private onFlush: FlushHandler;
+
+  constructor(onFlush: FlushHandler) {
+    this.onFlush = onFlush;
+  }
+
+  /**
+   * 开始追踪一条流式消息，记录请求发起时间用于计算首字延迟
+   */
+  begin(messageId: string): void {
+    this.buffers.set(messageId, {
+      pending: '',
+      chunkCount: 0,
+      flushCount: 0,
+      totalChars: 0,
+      startedAt: now(),
+      firstChunkAt: null,
+      lastChunkAt: null
+    });
+  }
+
+  /**
+   * 追加数据块，只写入缓冲区并安排下一帧提交
+   */
+  push(messageId: string, chunk: string): void {
+    let buffer = this.buffers.get(messageId);
+    if (!buffer) {
+      this.begin(messageId);
+      buffer = this.buffers.get(messageId)!;
+    }
+
+    const timestamp = now();
+    if (buffer.firstChunkAt === null) {
+      buffer.firstChunkAt = timestamp;
+    }
+    buffer.lastChunkAt = timestamp;
+    buffer.chunkCount++;
+    buffer.totalChars += chunk.length;
+    buffer.pending += chunk;
+
+    if (!this.cancelScheduled) {
+      this.cancelScheduled = scheduleFrame(() => {
+        this.cancelScheduled = null;
+        this.flush();
+      });
+    }
+  }
+
+  /**
+   * 立即提交所有待写入的数据块
+   */
+  flush(): void {
+    if (this.cancelScheduled) {
+      this.cancelScheduled();
+      this.cancelScheduled = null;
+    }
+
+    this.buffers.forEach((buffer, messageId) => {
+      if (!buffer.pending) return;
+      const appended = buffer.pending;
+      buffer.pending = '';
+      buffer.flushCount++;
+      this.onFlush(messageId, appended);
+    });
+  }
+
+  /**
+   * 结束追踪：提交剩余数据并返回统计信息
+   */
+  end(messageId: string): StreamStats | null {
+    this.flush();
+    const stats = this.getStats(messageId);
+    this.buffers.delete(messageId);
+    return stats;
+  }
+
+  /**
+   * 丢弃尚未提交的数据（用于错误回滚）
+   */
+  discard(messageId: string): StreamStats | null {
+    const buffer = this.buffers.get(messageId);
+    if (buffer) {
+      buffer.pending = '';
+    }
+    const stats = this.getStats(messageId);
+    this.buffers.delete(messageId);
+    if (this.buffers.size === 0 && this.cancelScheduled) {
+      this.cancelScheduled();
+      this.cancelScheduled = null;
+    }
+    return stats;
+  }
+
+  getStats(messageId: string): StreamStats | null {
+    const buffer = this.buffers.get(messageId);
+    if (!buffer) return null;
+
+    const endAt = buffer.lastChunkAt ?? now();
+    const durationMs = endAt - buffer.startedAt;
+    const streamingMs = buffer.firstChunkAt !== null ? endAt - buffer.firstChunkAt : 0;
+
+    return {
+      messageId,
+      chunkCount: buffer.chunkCount,
+      flushCount: buffer.flushCount,
+      totalChars: buffer.totalChars,
+      timeToFirstTokenMs: buffer.firstChunkAt !== null ? buffer.firstChunkAt - buffer.startedAt : null,
+      durationMs,
+      chunksPerSecond: streamingMs > 0 ? (buffer.chunkCount / streamingMs) * 1000 : 0
+    };
+  }
+}
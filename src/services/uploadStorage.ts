@@ -0,0 +1,138 @@
+// 上传进度本地存储 - 基于IndexedDB，按文件哈希记录分片上传进度和已完成文件的URL
+// 页面刷新后重新选择同一文件即可从断点继续；已上传过的文件直接复用URL
+import { logger } from './logger';
+
+const DB_NAME = 'mining-safety-upload';
+const DB_VERSION = 1;
+
+const UPLOAD_STORE = 'uploads';
+
+// 未完成的上传记录保留时间，超过后后端的分片通常已被清理
+const INCOMPLETE_TTL = 7 * 24 * 3600 * 1000;
+// 最多保留的已完成文件记录数量
+const MAX_COMPLETED = 500;
+
+export interface UploadRecord {
+  fileHash: string;
+  fileName: string;
+  fileSize: number;
+  chunkSize: number;
+  chunkCount: number;
+  uploadId?: string;
+  uploadedChunks: number[];
+  url?: string;           // 上传完成后的文件URL
+  updatedAt: number;
+}
+
+const promisifyRequest = <T>(request: IDBRequest<T>): Promise<T> =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+export class UploadStorage {
+  private dbPromise: Promise<IDBDatabase | null> | null = null;
+  private pruned = false;
+
+  private openDB(): Promise<IDBDatabase | null> {
+    if (this.dbPromise) {
+      return this.dbPromise;
+    }
+
+    if (typeof indexedDB === 'undefined') {
+      logger.warn('⚠️ [uploadStorage] 当前环境不支持IndexedDB，上传进度不会保存');
+      this.dbPromise = Promise.resolve(null);
+      return this.dbPromise;
+    }
+
+    this.dbPromise = new Promise<IDBDatabase | null>((resolve) => {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+      request.onupgradeneeded = () => {
+        const uploads = request.result.createObjectStore(UPLOAD_STORE, { keyPath: 'fileHash' });
+        uploads.createIndex('updatedAt', 'updatedAt');
+      };
+
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        logger.error('❌ [uploadStorage] 打开IndexedDB失败:', request.error);
+        resolve(null);
+      };
+    });
+
+    return this.dbPromise;
+  }
+
+  /**
+   * 按文件哈希读取上传记录
+   */
+  async get(fileHash: string): Promise<UploadRecord | null> {
+    const db = await this.openDB();
+    if (!db) return null;
+
+    try {
+      const store = db.transaction(UPLOAD_STORE, 'readonly').objectStore(UPLOAD_STORE);
+      return (await promisifyRequest<UploadRecord | undefined>(store.get(fileHash))) || null;
+    } catch (error) {
+      logger.error('❌ [uploadStorage] 读取上传记录失败:', error);
+      return null;
+    }
+  }
+
+  /**
+   * 保存上传记录
+   */
+  async put(record: UploadRecord): Promise<void> {
+    const db = await this.openDB();
+    if (!db) return;
+
+    try {
+      const store = db.transaction(UPLOAD_STORE, 'readwrite').objectStore(UPLOAD_STORE);
+      await promisifyRequest(store.put({ ...record, updatedAt: Date.now() }));
+    } catch (error) {
+      logger.error('❌ [uploadStorage] 保存上传记录失败:', error);
+    }
+
+    if (!this.pruned) {
+      this.pruned = true;
+      this.prune().catch(error => logger.warn('⚠️ [uploadStorage] 清理上传记录失败:', error));
+    }
+  }
+
+  /**
+   * 删除上传记录
+   */
+  async delete(fileHash: string): Promise<void> {
+    const db = await this.openDB();
+    if (!db) return;
+
+    const store = db.transaction(UPLOAD_STORE, 'readwrite').objectStore(UPLOAD_STORE);
+    await promisifyRequest(store.delete(fileHash));
+  }
+
+  // 清理过期的未完成记录，并限制已完成记录的数量（按更新时间从旧到新淘汰）
+  private async prune(): Promise<void> {
+    const db = await this.openDB();
+    if (!db) return;
+
+    const store = db.transaction(UPLOAD_STORE, 'readonly').objectStore(UPLOAD_STORE);
+    const records = await promisifyRequest<UploadRecord[]>(store.index('updatedAt').getAll());
+
+    const now = Date.now();
+    const completed = records.filter(record => record.url);
+    const expired = [
+      ...records.filter(record => !record.url && now - record.updatedAt > INCOMPLETE_TTL),
+      ...completed.slice(0, Math.max(0, completed.length - MAX_COMPLETED))
+    ];
+    if (expired.length === 0) return;
+
+    const tx = db.transaction(UPLOAD_STORE, 'readwrite');
+    expired.forEach(record => tx.objectStore(UPLOAD_STORE).delete(record.fileHash));
+    await new Promise<void>((resolve, reject) => {
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+    });
+  }
+}
+
+export const uploadStorage = new UploadStorage();
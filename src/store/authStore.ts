@@ -1,8 +1,11 @@
 // 认证状态管理
 import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
+import { instrumentStore } from './instrumentStore';
 import { User, RegisterRequest } from '../types/database';
 import { apiService } from '../services/api';
+import { chatStorage } from '../services/chatStorage';
+import { logger } from '../services/logger';
 
 // JWT token解析工具函数
 const parseJwt = (token: string): any => {
@@ -21,7 +24,7 @@ const parseJwt = (token: string): any => {
     }).join(''));
     return JSON.parse(jsonPayload);
   } catch (error) {
-    console.error('JWT token解析失败:', error);
+    logger.error('JWT token解析失败:', error);
     return null;
   }
 };
@@ -64,7 +67,7 @@ interface AuthState {
 
 export const useAuthStore = create<AuthState>()(
   persist(
-    (set, get) => ({
+    instrumentStore('auth', (set, get) => ({
       // 初始状态
       user: null,
       token: null,
@@ -119,9 +122,9 @@ export const useAuthStore = create<AuthState>()(
             error: null
           });
 
-          console.log('登录成功，用户信息已保存:', user);
+          logger.debug('登录成功，用户信息已保存:', user);
         } catch (error) {
-          console.error('登录失败:', error);
+          logger.error('登录失败:', error);
           
           // 清理可能的半状态
           localStorage.removeItem('auth_token');
@@ -142,7 +145,7 @@ export const useAuthStore = create<AuthState>()(
         set({ isRegistering: true, registerError: null });
 
         try {
-          console.log('开始注册，用户名:', registerData.username);
+          logger.debug('开始注册，用户名:', registerData.username);
           
           // 调用注册API
           const registerResponse = await apiService.signup(
@@ -151,7 +154,7 @@ export const useAuthStore = create<AuthState>()(
             registerData.realName
           );
           
-          console.log('✅ 注册成功，准备自动登录');
+          logger.debug('✅ 注册成功，准备自动登录');
           
           // 注册成功后自动登录
           const loginCredentials = {
@@ -165,10 +168,10 @@ export const useAuthStore = create<AuthState>()(
           // 调用login方法实现自动登录
           await get().login(loginCredentials);
           
-          console.log('✅ 注册并自动登录成功');
+          logger.debug('✅ 注册并自动登录成功');
           
         } catch (error) {
-          console.error('❌ 注册失败:', error);
+          logger.error('❌ 注册失败:', error);
           
           set({
             isRegistering: false,
@@ -187,7 +190,7 @@ export const useAuthStore = create<AuthState>()(
         try {
           apiService.logout();
         } catch (error) {
-          console.error('登出API调用失败:', error);
+          logger.error('登出API调用失败:', error);
         }
         
         // 清除本地状态
@@ -278,7 +281,7 @@ export const useAuthStore = create<AuthState>()(
             error: null
           });
         } catch (error: any) {
-          console.error('认证检查失败:', error);
+          logger.error('认证检查失败:', error);
           
           // 在认证错误或token相关错误时清除认证状态
           const isAuthError = error?.response?.status === 401 || 
@@ -330,15 +333,20 @@ export const useAuthStore = create<AuthState>()(
             localStorage.removeItem(key);
           });
 
+          // 清理IndexedDB中的聊天记录缓存
+          chatStorage.clearUser(targetUserId).catch(error => {
+            logger.error('清理聊天记录缓存失败:', error);
+          });
+
           // 清理临时存储（如果存在）
           localStorage.removeItem('chat-store-temp');
           
-          console.log(`已清理用户 ${targetUserId} 的本地数据`);
+          logger.debug(`已清理用户 ${targetUserId} 的本地数据`);
         } catch (error) {
-          console.error('清理用户数据时出错:', error);
+          logger.error('清理用户数据时出错:', error);
         }
       }
-    }),
+    })),
     {
       name: 'auth-storage',
       partialize: (state) => ({
@@ -347,7 +355,7 @@ export const useAuthStore = create<AuthState>()(
         isAuthenticated: state.isAuthenticated
       }),
       onRehydrateStorage: () => (state) => {
-        console.log('🔄 认证状态恢复完成');
+        logger.debug('🔄 认证状态恢复完成');
         state?.setHasHydrated?.(true);
       }
     }
@@ -1,10 +1,19 @@
 // AI聊天状态管理 - 集成后端存储
 import { create } from 'zustand';
-import { persist } from 'zustand/middleware';
 import { ChatMessage, ChatSession } from '../types/ai';
 import { aiApi } from '../services/ai';
-import { chatHistoryService, ChatSession as BackendChatSession, ChatMessage as BackendChatMessage } from '../services/chatHistory';
+import {
+  chatHistoryService,
+  ChatSession as BackendChatSession,
+  ChatMessage as BackendChatMessage,
+  MessagePage
+} from '../services/chatHistory';
+import { StreamBuffer, StreamStats } from '../services/streamBuffer';
+import { chatStorage } from '../services/chatStorage';
 import { useAuthStore } from './authStore';
+import { instrumentStore } from './instrumentStore';
+import { logger } from '../services/logger';
+import { metrics, METRIC_NAMES } from '../services/metrics';
 
 // 规范化后端返回的消息内容，处理\n序列并统一换行
 const normalizeMessageContent = (content: string): string => {
@@ -32,22 +41,24 @@ interface ChatState {
   isStreaming: boolean;
   error: string | null;
   isInitialized: boolean;
-  // 消息加载状态
+  // 消息加载状态（当前会话）
   isLoadingMoreMessages: boolean;
   messagesHasMore: boolean;
-  messagesCurrentPage: number;
+  // 会话列表增量加载状态
+  isLoadingMoreSessions: boolean;
+  sessionsHasMore: boolean;
+  // 最近一次流式响应的统计（数据块速率、首字延迟）
+  lastStreamStats: StreamStats | null;
 
   // 操作
   createSession: (title?: string) => Promise<string>;
   setCurrentSession: (sessionId: string) => Promise<void>;
   sendMessage: (content: string) => Promise<void>;
   loadSessions: () => Promise<void>;
-  loadSessionsPaginated: (page: number, pageSize: number) => Promise<{
-    sessions: ChatSession[];
-    total: number;
-    hasMore: boolean;
-  }>;
+  loadMoreSessions: () => Promise<void>;
+  prefetchSession: (sessionId: string) => void;
   loadMoreMessages: (sessionId: string) => Promise<void>;
+  prefetchOlderMessages: (sessionId: string) => void;
   deleteSession: (sessionId: string) => Promise<void>;
   updateSessionTitle: (sessionId: string, title: string) => Promise<void>;
   clearError: () => void;
@@ -90,86 +101,247 @@ const convertBackendMessage = (backendMessage: BackendChatMessage, sessionId: st
   responseTime: undefined  // 后端没有responseTime字段
 });
 
-// 用户数据隔离工具函数
-const loadUserData = (userId: number): Partial<ChatState> => {
-  try {
-    const key = `chat-store-user-${userId}`;
-    console.log('🔍 [loadUserData] 尝试加载localStorage数据，key:', key);
-    const stored = localStorage.getItem(key);
-    console.log('🔍 [loadUserData] localStorage原始数据:', stored ? stored.substring(0, 200) + '...' : 'null');
-    
-    if (stored) {
-      const data = JSON.parse(stored);
-      console.log('🔍 [loadUserData] 解析后的数据结构:', {
-        hasData: !!data,
-        hasSessions: !!data.sessions,
-        sessionsCount: data.sessions?.length || 0,
-        hasCurrentSession: !!data.currentSession,
-        currentSessionId: data.currentSession?.id,
-        dataKeys: Object.keys(data)
-      });
-      
-      // 恢复Date对象
-      if (data.sessions) {
-        data.sessions = data.sessions.map((session: any) => ({
-          ...session,
-          createdAt: new Date(session.createdAt),
-          updatedAt: new Date(session.updatedAt),
-          messages: session.messages?.map((msg: any) => ({
-            ...msg,
-            content: normalizeMessageContent(msg.content),
-            timestamp: new Date(msg.timestamp)
-          })) || []
-        }));
-      }
-      if (data.currentSession) {
-        data.currentSession = {
-          ...data.currentSession,
-          createdAt: new Date(data.currentSession.createdAt),
-          updatedAt: new Date(data.currentSession.updatedAt),
-          messages: data.currentSession.messages?.map((msg: any) => ({
-            ...msg,
-            content: normalizeMessageContent(msg.content),
-            timestamp: new Date(msg.timestamp)
-          })) || []
-        };
-      }
-      
-      return {
-        sessions: data.sessions || [],
-        currentSession: data.currentSession || null
-      };
+// 替换指定消息；流式消息总在末尾，从后往前查找只需一次比较
+const replaceMessage = (
+  messages: ChatMessage[],
+  messageId: string,
+  patch: Partial<ChatMessage>
+): ChatMessage[] => {
+  for (let i = messages.length - 1; i >= 0; i--) {
+    if (messages[i].id === messageId) {
+      const next = messages.slice();
+      next[i] = { ...messages[i], ...patch };
+      return next;
     }
-  } catch (error) {
-    console.error('❌ [loadUserData] 加载用户聊天数据失败:', error);
   }
-  console.log('📭 [loadUserData] 返回空数据');
-  return { sessions: [], currentSession: null };
+  return messages;
 };
 
-const saveUserData = (userId: number, data: { sessions: ChatSession[]; currentSession: ChatSession | null }) => {
+// 替换会话列表中某个会话的指定消息
+const replaceSessionMessage = (
+  sessions: ChatSession[],
+  sessionId: string,
+  messageId: string,
+  patch: Partial<ChatMessage>
+): ChatSession[] => {
+  const index = sessions.findIndex(s => s.id === sessionId);
+  if (index === -1) {
+    return sessions;
+  }
+  const next = sessions.slice();
+  next[index] = {
+    ...sessions[index],
+    messages: replaceMessage(sessions[index].messages, messageId, patch)
+  };
+  return next;
+};
+
+// 每次向后端请求的消息数量（后端上限20）
+const MESSAGE_PAGE_SIZE = 20;
+// 非当前会话在内存中保留的最新消息数量，超出部分在离开会话时丢弃，再次向上滚动时按游标重新加载
+const MESSAGE_WINDOW_SIZE = 60;
+// 内存中保留消息的会话数量，按最近打开顺序淘汰（当前会话和正在接收回复的会话除外）
+const MAX_SESSIONS_IN_MEMORY = 5;
+// 会话列表每页数量（后端上限20）
+const SESSION_PAGE_SIZE = 20;
+
+// 各会话是否还有更早的消息
+const messageHasMore = new Map<string, boolean>();
+// 各会话进行中或已预取的更早一页，按游标区分
+const olderPageRequests = new Map<string, { beforeId: string; promise: Promise<MessagePage> }>();
+// 各会话进行中的最新一页加载，悬停预取和打开会话共用
+const latestPageRequests = new Map<string, Promise<{ messages: ChatMessage[]; hasMore: boolean }>>();
+// 最近打开的会话ID，越靠前越新
+let recentSessionIds: string[] = [];
+// 正在接收流式回复的会话，不参与淘汰
+let streamingSessionId: string | null = null;
+// 会话列表已加载的页数，以及本轮加载中已由后端确认的会话
+let sessionsPage = 0;
+const confirmedSessionIds = new Set<string>();
+
+const resetPagingState = () => {
+  messageHasMore.clear();
+  olderPageRequests.clear();
+  latestPageRequests.clear();
+  recentSessionIds = [];
+  sessionsPage = 0;
+  confirmedSessionIds.clear();
+};
+
+const touchSession = (sessionId: string) => {
+  recentSessionIds = [sessionId, ...recentSessionIds.filter(id => id !== sessionId)];
+};
+
+// 后端消息ID是雪花ID，可能超过2^53，按字符串形式判断和传递；本地发送的消息ID以msg_开头，不是纯数字
+const isBackendMessageId = (id: string): boolean => /^\d+$/.test(id);
+
+// 会话中最早一条来自后端的消息ID，作为加载更早消息的游标
+const getOldestBackendId = (messages: ChatMessage[]): string | undefined =>
+  messages.find(message => isBackendMessageId(message.id))?.id;
+
+const toBackendSessionId = (sessionId: string): number => {
+  const id = parseInt(sessionId, 10);
+  if (isNaN(id)) {
+    throw new Error(`无效的会话ID: ${sessionId}`);
+  }
+  return id;
+};
+
+// 网络请求失败时重试，每次间隔1秒
+const withRetry = async <T>(request: () => Promise<T>, retries = 2): Promise<T> => {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await request();
+    } catch (error) {
+      if (attempt >= retries) throw error;
+      logger.warn(`⚠️ [chatStore] 请求失败，1秒后重试 (${attempt + 1}/${retries}):`, error);
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  }
+};
+
+// 加载会话最新的一页消息：优先读取本地缓存，没有缓存时向后端请求最新一页
+const loadLatestMessages = (sessionId: string, messageCount: number) => {
+  const pending = latestPageRequests.get(sessionId);
+  if (pending) {
+    return pending;
+  }
+
+  const request = (async () => {
+    const cached = await chatStorage.loadMessages(getCurrentUserId(), sessionId);
+    if (cached && cached.length > 0) {
+      logger.debug('✨ [chatStore] 使用本地缓存消息，消息数量:', cached.length);
+      return { messages: cached, hasMore: messageCount > cached.length };
+    }
+
+    const page = await withRetry(() =>
+      chatHistoryService.getMessagesBefore(toBackendSessionId(sessionId), { pageSize: MESSAGE_PAGE_SIZE })
+    );
+    return {
+      messages: page.list.map(msg => convertBackendMessage(msg, sessionId)),
+      hasMore: page.hasMore
+    };
+  })();
+
+  latestPageRequests.set(sessionId, request);
+  request
+    .then(({ hasMore }) => messageHasMore.set(sessionId, hasMore))
+    .catch(() => undefined)
+    .finally(() => latestPageRequests.delete(sessionId));
+  return request;
+};
+
+// 请求比当前最早消息更早的一页；同一游标的请求（包括滚动时的预取）只发一次
+const fetchOlderPage = (sessionId: string, messages: ChatMessage[]): Promise<MessagePage> => {
+  const beforeId = getOldestBackendId(messages);
+  if (beforeId === undefined) {
+    return Promise.resolve({ list: [], total: messages.length, hasMore: false });
+  }
+
+  const existing = olderPageRequests.get(sessionId);
+  if (existing && existing.beforeId === beforeId) {
+    return existing.promise;
+  }
+
+  const promise = chatHistoryService.getMessagesBefore(toBackendSessionId(sessionId), {
+    beforeId,
+    loadedCount: messages.filter(message => isBackendMessageId(message.id)).length,
+    pageSize: MESSAGE_PAGE_SIZE
+  });
+  olderPageRequests.set(sessionId, { beforeId, promise });
+  promise.catch(() => {
+    if (olderPageRequests.get(sessionId)?.promise === promise) {
+      olderPageRequests.delete(sessionId);
+    }
+  });
+  return promise;
+};
+
+// 约束内存中的消息：非当前会话只保留最新的一段，超出数量上限的会话释放全部消息
+// 裁剪只影响内存，chatStorage把裁掉的部分视为未变化，IndexedDB中的完整缓存保留
+const applyMessageWindows = (sessions: ChatSession[], activeSessionId: string | null): ChatSession[] => {
+  let changed = false;
+  const result = sessions.map(session => {
+    if (session.messages.length === 0 || session.id === activeSessionId || session.id === streamingSessionId) {
+      return session;
+    }
+
+    const rank = recentSessionIds.indexOf(session.id);
+    if (rank === -1 || rank >= MAX_SESSIONS_IN_MEMORY) {
+      changed = true;
+      messageHasMore.delete(session.id);
+      olderPageRequests.delete(session.id);
+      try {
+        chatStorage.releaseMessages(getCurrentUserId(), session.id);
+      } catch {
+        // 未登录时没有快照需要释放
+      }
+      return { ...session, messages: [] };
+    }
+
+    if (session.messages.length > MESSAGE_WINDOW_SIZE) {
+      changed = true;
+      messageHasMore.set(session.id, true);
+      olderPageRequests.delete(session.id);
+      return { ...session, messages: session.messages.slice(-MESSAGE_WINDOW_SIZE) };
+    }
+    return session;
+  });
+
+  recentSessionIds = recentSessionIds.slice(0, MAX_SESSIONS_IN_MEMORY);
+  return changed ? result : sessions;
+};
+
+// 合并一页后端会话：更新元数据并保留已加载的消息；尚未确认的本地会话在后续页返回前暂时保留
+const mergeSessionPage = (existing: ChatSession[], incoming: ChatSession[], hasMore: boolean): ChatSession[] => {
+  const previous = new Map(existing.map(session => [session.id, session]));
+  const incomingIds = new Set(incoming.map(session => session.id));
+
+  const confirmed = existing.filter(session => confirmedSessionIds.has(session.id) && !incomingIds.has(session.id));
+  const page = incoming.map(session => {
+    const loaded = previous.get(session.id);
+    return loaded ? { ...session, messages: loaded.messages } : session;
+  });
+  incoming.forEach(session => confirmedSessionIds.add(session.id));
+
+  // 比本页最后一条更新的本地会话若未出现在本页，说明已在其他地方被删除
+  const oldest = incoming.length > 0 ? incoming[incoming.length - 1].updatedAt.getTime() : Infinity;
+  const pending = hasMore
+    ? existing.filter(session => !confirmedSessionIds.has(session.id) && session.updatedAt.getTime() <= oldest)
+    : [];
+
+  return [...confirmed, ...page, ...pending];
+};
+
+// 用户数据隔离工具函数 - 本地缓存存放在IndexedDB中，会话列表只加载元数据，消息在打开会话时按需加载
+const loadUserData = async (userId: number): Promise<{ sessions: ChatSession[]; currentSession: ChatSession | null }> => {
   try {
-    const key = `chat-store-user-${userId}`;
-    console.log('💾 [saveUserData] 保存用户数据，key:', key);
-    console.log('💾 [saveUserData] 保存数据结构:', {
-      sessionsCount: data.sessions?.length || 0,
-      hasCurrentSession: !!data.currentSession,
-      currentSessionId: data.currentSession?.id,
-      currentSessionMessageCount: data.currentSession?.messages?.length || 0
+    const { sessions, currentSessionId } = await chatStorage.loadSessions(userId);
+    logger.debug('🔍 [loadUserData] 本地会话加载完成:', {
+      sessionsCount: sessions.length,
+      currentSessionId
     });
-    
-    const serialized = JSON.stringify(data);
-    console.log('💾 [saveUserData] 序列化数据大小:', serialized.length, '字符');
-    localStorage.setItem(key, serialized);
-    console.log('✅ [saveUserData] 数据保存成功');
+    return {
+      sessions,
+      currentSession: sessions.find(s => s.id === currentSessionId) || null
+    };
   } catch (error) {
-    console.error('❌ [saveUserData] 保存用户聊天数据失败:', error);
+    logger.error('❌ [loadUserData] 加载用户聊天数据失败:', error);
   }
+  return { sessions: [], currentSession: null };
+};
+
+// 保存只登记最新状态，由chatStorage合并写入并只落盘发生变化的会话和消息页
+const saveUserData = (userId: number, data: { sessions: ChatSession[]; currentSession: ChatSession | null }) => {
+  const { currentSession } = data;
+  const sessions = currentSession
+    ? data.sessions.map(s => s.id === currentSession.id ? currentSession : s)
+    : data.sessions;
+  chatStorage.saveSessions(userId, sessions, currentSession?.id ?? null);
 };
 
 export const useChatStore = create<ChatState>()(
-  persist(
-    (set, get) => ({
+    instrumentStore('chat', (set, get) => ({
       // 初始状态
       sessions: [],
       currentSession: null,
@@ -179,13 +351,15 @@ export const useChatStore = create<ChatState>()(
       isInitialized: false,
       // 消息加载状态
       isLoadingMoreMessages: false,
-      messagesHasMore: true,
-      messagesCurrentPage: 1,
+      messagesHasMore: false,
+      isLoadingMoreSessions: false,
+      sessionsHasMore: false,
+      lastStreamStats: null,
 
       // 初始化 - 从后端加载会话列表
       initialize: async () => {
         const currentState = get();
-        console.log('🎯 [chatStore] initialize方法被调用，当前状态:', {
+        logger.debug('🎯 [chatStore] initialize方法被调用，当前状态:', {
           isInitialized: currentState.isInitialized,
           isLoading: currentState.isLoading,
           sessionsCount: currentState.sessions.length,
@@ -194,11 +368,11 @@ export const useChatStore = create<ChatState>()(
         
         // 防止重复初始化
         if (currentState.isInitialized && !currentState.isLoading) {
-          console.log('⚠️ [chatStore] 已经初始化过，跳过重复初始化');
+          logger.debug('⚠️ [chatStore] 已经初始化过，跳过重复初始化');
           return;
         }
 
-        console.log('🚀 [chatStore] 开始初始化聊天存储');
+        logger.debug('🚀 [chatStore] 开始初始化聊天存储');
 
         try {
           set({ isLoading: true, error: null });
@@ -207,12 +381,12 @@ export const useChatStore = create<ChatState>()(
           let currentUserId: number;
           try {
             currentUserId = getCurrentUserId();
-            console.log('🚀 [chatStore] 当前用户ID:', currentUserId);
-            console.log('🚀 [chatStore] 用户认证状态:', useAuthStore.getState().isAuthenticated);
-            console.log('🚀 [chatStore] 用户信息:', JSON.stringify(useAuthStore.getState().user, null, 2));
+            logger.debug('🚀 [chatStore] 当前用户ID:', currentUserId);
+            logger.debug('🚀 [chatStore] 用户认证状态:', useAuthStore.getState().isAuthenticated);
+            logger.debug('🚀 [chatStore] 用户信息:', useAuthStore.getState().user);
           } catch (userError) {
-            console.error('❌ [chatStore] 获取用户ID失败:', userError);
-            console.error('❌ [chatStore] authStore状态:', JSON.stringify(useAuthStore.getState(), null, 2));
+            logger.error('❌ [chatStore] 获取用户ID失败:', userError);
+            logger.error('❌ [chatStore] authStore状态:', useAuthStore.getState());
             set({ 
               error: '用户未登录或登录过期',
               isLoading: false,
@@ -222,78 +396,27 @@ export const useChatStore = create<ChatState>()(
           }
 
           // 首先加载用户的本地数据（用于快速显示）
-          const userData = loadUserData(currentUserId);
-          console.log('🔍 [chatStore] 本地数据加载结果:', {
-            hasUserData: !!userData,
-            sessionsCount: userData.sessions?.length || 0,
-            currentSessionId: userData.currentSession?.id,
-            localStorageKey: `chat-store-user-${currentUserId}`
-          });
+          resetPagingState();
+          const userData = await loadUserData(currentUserId);
           
           if (userData.sessions && userData.sessions.length > 0) {
-            console.log('🚀 [chatStore] 加载本地用户数据，会话数量:', userData.sessions.length);
-            console.log('🚀 [chatStore] 本地会话列表:', userData.sessions.map(s => ({
-              id: s.id,
-              title: s.title,
-              messageCount: s.messages?.length || 0
-            })));
+            logger.debug('🚀 [chatStore] 加载本地用户数据，会话数量:', userData.sessions.length);
             set(state => ({
               ...state,
               sessions: userData.sessions || [],
               currentSession: userData.currentSession || null
             }));
           } else {
-            console.log('📭 [chatStore] 没有找到本地用户数据');
+            logger.debug('📭 [chatStore] 没有找到本地用户数据');
           }
 
-          // 然后从后端加载最新数据并合并
-          console.log('🚀 [chatStore] 开始从后端加载会话列表');
+          // 然后从后端加载第一页会话并合并，后续页在用户滚动会话列表时增量加载
+          logger.debug('🚀 [chatStore] 开始从后端加载会话列表');
           try {
-            console.log('📡 [chatStore] 调用getSessions API，参数:', { page: 1, pageSize: 20, order: 'desc' });
-            const sessionsData = await chatHistoryService.getSessions({
-              page: 1,
-              pageSize: 20,
-              order: 'desc'
-            });
-            
-            console.log('📡 [chatStore] getSessions API原始响应:', JSON.stringify(sessionsData, null, 2));
-            console.log('🔍 [chatStore] 响应数据分析:', {
-              hasData: !!sessionsData,
-              hasListField: !!sessionsData?.list,
-              listLength: sessionsData?.list?.length || 0,
-              totalCount: sessionsData?.total || 0,
-              responseFields: Object.keys(sessionsData || {})
-            });
-            
-            const backendSessions = sessionsData.list.map(convertBackendSession);
-            console.log('✅ [chatStore] 后端会话加载成功，数量:', backendSessions.length);
-            console.log('🔍 [chatStore] 转换后的会话列表:', backendSessions.map(s => ({
-              id: s.id,
-              title: s.title,
-              userId: s.userId,
-              messageCount: s.messageCount,
-              messagesLength: s.messages?.length || 0
-            })));
-            
-            // 合并本地和后端数据，优先使用后端数据
-            const mergedSessions = backendSessions.length > 0 ? backendSessions : userData.sessions || [];
-            
-            set(state => ({
-              ...state,
-              sessions: mergedSessions,
-              // 如果当前会话不在新的会话列表中，清除当前会话
-              currentSession: mergedSessions.find(s => s.id === state.currentSession?.id) || null
-            }));
-            
-            // 保存更新后的数据到localStorage
-            const finalState = get();
-            saveUserData(currentUserId, {
-              sessions: finalState.sessions,
-              currentSession: finalState.currentSession
-            });
-            
+            await get().loadMoreSessions();
+            logger.debug('✅ [chatStore] 后端会话加载成功，数量:', get().sessions.length);
           } catch (loadError) {
-            console.error('❌ [chatStore] 从后端加载会话失败:', loadError);
+            logger.error('❌ [chatStore] 从后端加载会话失败:', loadError);
             
             // 分析错误类型
             let errorMessage = '加载会话历史失败';
@@ -310,11 +433,11 @@ export const useChatStore = create<ChatState>()(
               }
             }
             
-            console.warn('⚠️ [chatStore] 使用本地数据，错误类型:', errorMessage);
+            logger.warn('⚠️ [chatStore] 使用本地数据，错误类型:', errorMessage);
             
             // 如果后端加载失败，保留本地数据
             if (!userData.sessions || userData.sessions.length === 0) {
-              console.log('📝 [chatStore] 无本地数据，创建空状态');
+              logger.debug('📝 [chatStore] 无本地数据，创建空状态');
               set(state => ({
                 ...state,
                 sessions: [],
@@ -322,7 +445,7 @@ export const useChatStore = create<ChatState>()(
                 error: `${errorMessage}（将在网络恢复后自动重试）`
               }));
             } else {
-              console.log('📝 [chatStore] 使用本地缓存数据');
+              logger.debug('📝 [chatStore] 使用本地缓存数据');
               set(state => ({
                 ...state,
                 error: `${errorMessage}（使用本地缓存数据）`
@@ -332,37 +455,37 @@ export const useChatStore = create<ChatState>()(
 
           // 如果有当前会话，为其加载消息内容
           const currentState = get();
-          console.log('🔄 [chatStore] 检查是否需要加载当前会话消息:', {
+          logger.debug('🔄 [chatStore] 检查是否需要加载当前会话消息:', {
             hasCurrentSession: !!currentState.currentSession,
             currentSessionId: currentState.currentSession?.id,
             currentSessionMessageCount: currentState.currentSession?.messages?.length || 0
           });
           
           if (currentState.currentSession) {
-            console.log('🔄 [chatStore] 检测到当前会话，开始加载其消息:', currentState.currentSession.id);
+            logger.debug('🔄 [chatStore] 检测到当前会话，开始加载其消息:', currentState.currentSession.id);
             try {
-              console.log('📡 [chatStore] 调用setCurrentSession加载消息');
+              logger.debug('📡 [chatStore] 调用setCurrentSession加载消息');
               await get().setCurrentSession(currentState.currentSession.id);
               const updatedState = get();
-              console.log('✅ [chatStore] 当前会话消息加载完成，消息数量:', updatedState.currentSession?.messages?.length || 0);
+              logger.debug('✅ [chatStore] 当前会话消息加载完成，消息数量:', updatedState.currentSession?.messages?.length || 0);
             } catch (messageLoadError) {
-              console.error('❌ [chatStore] 加载当前会话消息失败:', messageLoadError);
-              console.error('❌ [chatStore] 错误详情:', messageLoadError instanceof Error ? messageLoadError.stack : 'Unknown error');
+              logger.error('❌ [chatStore] 加载当前会话消息失败:', messageLoadError);
+              logger.error('❌ [chatStore] 错误详情:', messageLoadError instanceof Error ? messageLoadError.stack : 'Unknown error');
               // 即使消息加载失败，也要继续初始化
             }
           } else {
-            console.log('📭 [chatStore] 无当前会话，跳过消息加载');
+            logger.debug('📭 [chatStore] 无当前会话，跳过消息加载');
           }
 
           set({ isInitialized: true });
           const finalState = get();
-          console.log('✅ [chatStore] 初始化完成，会话数量:', finalState.sessions.length);
+          logger.debug('✅ [chatStore] 初始化完成，会话数量:', finalState.sessions.length);
           if (finalState.currentSession) {
-            console.log('✅ [chatStore] 当前会话消息数量:', finalState.currentSession.messages.length);
+            logger.debug('✅ [chatStore] 当前会话消息数量:', finalState.currentSession.messages.length);
           }
 
         } catch (error) {
-          console.error('❌ [chatStore] 初始化聊天存储失败:', error);
+          logger.error('❌ [chatStore] 初始化聊天存储失败:', error);
           const errorMessage = error instanceof Error ? error.message : '初始化失败';
           set({ 
             error: errorMessage,
@@ -394,9 +517,14 @@ export const useChatStore = create<ChatState>()(
             messages: []
           };
 
+          confirmedSessionIds.add(sessionId);
+          messageHasMore.set(sessionId, false);
+          touchSession(sessionId);
+
           set(state => ({
-            sessions: [newSession, ...state.sessions],
+            sessions: applyMessageWindows([newSession, ...state.sessions], sessionId),
             currentSession: newSession,
+            messagesHasMore: false,
             isLoading: false
           }));
 
@@ -408,22 +536,20 @@ export const useChatStore = create<ChatState>()(
 
           return sessionId;
         } catch (error) {
-          console.error('创建会话失败:', error);
+          logger.error('创建会话失败:', error);
           set({ error: '创建会话失败', isLoading: false });
           throw error;
         }
       },
 
-      // 设置当前会话并加载消息
+      // 设置当前会话并加载消息 - 已在内存中的消息立即显示，否则加载最新一页
       setCurrentSession: async (sessionId: string) => {
-        console.log('🔄 [chatStore] 开始切换到会话:', sessionId);
+        logger.debug('🔄 [chatStore] 开始切换到会话:', sessionId);
         
         try {
-          set({ isLoading: true, error: null });
-
           let session = get().sessions.find(s => s.id === sessionId);
           if (!session) {
-            console.log('🔄 [chatStore] 本地未找到会话，重新加载会话列表');
+            logger.debug('🔄 [chatStore] 本地未找到会话，重新加载会话列表');
             // 如果本地没有会话，先从会话列表重新加载
             await get().loadSessions();
             session = get().sessions.find(s => s.id === sessionId);
@@ -432,94 +558,44 @@ export const useChatStore = create<ChatState>()(
             }
           }
 
-          // 检查是否已经有缓存的消息，避免重复API调用
-          if (session.messages && session.messages.length > 0) {
-            console.log('✨ [chatStore] 使用缓存消息，跳过API调用，消息数量:', session.messages.length);
-            set({
-              currentSession: session,
-              isLoading: false
-            });
-            return; // 直接返回，不需要API调用
-          }
+          touchSession(sessionId);
+          const hasMessages = session.messages.length > 0;
+          set(state => ({
+            currentSession: session!,
+            sessions: applyMessageWindows(state.sessions, sessionId),
+            messagesHasMore: messageHasMore.get(sessionId) ?? session!.messageCount > session!.messages.length,
+            isLoadingMoreMessages: false,
+            isLoading: !hasMessages,
+            error: null
+          }));
 
-          console.log('🔄 [chatStore] 开始加载会话消息，sessionId:', sessionId);
-          
-          // 重试机制：尝试加载会话消息
-          let messagesData: Awaited<ReturnType<typeof chatHistoryService.getMessages>>;
-          let retryCount = 0;
-          const maxRetries = 2;
-          
-          while (retryCount <= maxRetries) {
-            try {
-              const sessionIdNum = parseInt(sessionId);
-              if (isNaN(sessionIdNum)) {
-                throw new Error(`无效的会话ID: ${sessionId}`);
-              }
-              
-              // 检查sessionId是否超出安全范围
-              if (sessionIdNum > Number.MAX_SAFE_INTEGER) {
-                console.warn('⚠️ [chatStore] sessionId超出JavaScript安全整数范围:', sessionIdNum);
-              }
-              
-              console.log('🔍 [chatStore] sessionId验证通过:', sessionId);
-              
-              messagesData = await chatHistoryService.getMessages(sessionIdNum, {
-                page: 1,
-                pageSize: 20,
-                order: 'asc'
-              });
-              
-              // 🔍 调试：检查API响应格式（简化版）
-              console.log('🔍 [chatStore] API响应:', {
-                hasData: !!messagesData,
-                messageCount: messagesData?.list?.length || 0,
-                total: messagesData?.total || 0
-              });
-              
-              // 验证响应格式 - 修复data为null的情况
-              if (!messagesData || messagesData === null) {
-                console.warn('⚠️ [chatStore] API返回data为null，可能是会话没有消息或后端查询失败');
-                messagesData = { list: [], total: 0, page: 1, pageSize: 100 };
-              } else if (typeof messagesData !== 'object') {
-                throw new Error('API响应格式错误：响应不是对象');
-              } else if (!messagesData.list) {
-                console.warn('⚠️ [chatStore] API响应缺少list字段，尝试兼容处理');
-                // 尝试兼容不同的响应格式
-                if (Array.isArray(messagesData)) {
-                  messagesData = { list: messagesData, total: messagesData.length, page: 1, pageSize: 100 };
-                } else {
-                  // 如果没有消息，创建空的响应
-                  messagesData = { list: [], total: 0, page: 1, pageSize: 100 };
-                }
-              }
-              
-              break; // 成功则跳出重试循环
-            } catch (apiError) {
-              retryCount++;
-              console.warn(`⚠️ [chatStore] 加载消息失败 (尝试 ${retryCount}/${maxRetries + 1}):`, apiError);
-              
-              if (retryCount > maxRetries) {
-                throw apiError; // 超过重试次数则抛出错误
-              }
-              
-              // 等待1秒后重试
-              await new Promise(resolve => setTimeout(resolve, 1000));
-            }
+          if (hasMessages) {
+            logger.debug('✨ [chatStore] 使用内存中的消息，消息数量:', session.messages.length);
+            return;
           }
 
-          const messages = messagesData!.list.map((msg: BackendChatMessage) => convertBackendMessage(msg, sessionId));
-          const updatedSession = { ...session, messages };
-
-          console.log('✅ [chatStore] 会话切换成功，消息数量:', messages.length);
+          const { messages, hasMore } = await loadLatestMessages(sessionId, session.messageCount);
+          logger.debug('✅ [chatStore] 会话消息加载完成，消息数量:', messages.length);
 
-          set(state => ({
-            currentSession: updatedSession,
-            sessions: state.sessions.map(s => s.id === sessionId ? updatedSession : s),
-            isLoading: false,
-            // 重置消息分页状态
-            messagesCurrentPage: 1,
-            messagesHasMore: messagesData!.list.length >= 20 || messagesData!.total > 20
-          }));
+          set(state => {
+            const loaded = state.sessions.find(s => s.id === sessionId);
+            if (!loaded) {
+              return { isLoading: false };
+            }
+            // 加载期间可能已有新消息（例如刚发送的消息），保留在末尾
+            const known = new Set(messages.map(m => m.id));
+            const updatedSession = {
+              ...loaded,
+              messages: [...messages, ...loaded.messages.filter(m => !known.has(m.id))]
+            };
+            const isCurrent = state.currentSession?.id === sessionId;
+            return {
+              sessions: state.sessions.map(s => s.id === sessionId ? updatedSession : s),
+              currentSession: isCurrent ? updatedSession : state.currentSession,
+              messagesHasMore: isCurrent ? hasMore : state.messagesHasMore,
+              isLoading: isCurrent ? false : state.isLoading
+            };
+          });
 
           // 保存用户数据
           try {
@@ -529,11 +605,11 @@ export const useChatStore = create<ChatState>()(
               currentSession: currentState.currentSession
             });
           } catch (saveError) {
-            console.warn('⚠️ [chatStore] 保存用户数据失败:', saveError);
+            logger.warn('⚠️ [chatStore] 保存用户数据失败:', saveError);
           }
 
         } catch (error) {
-          console.error('❌ [chatStore] 设置当前会话失败:', error);
+          logger.error('❌ [chatStore] 设置当前会话失败:', error);
           const errorMessage = error instanceof Error ? error.message : '加载会话失败';
           set({ 
             error: errorMessage,
@@ -543,6 +619,32 @@ export const useChatStore = create<ChatState>()(
         }
       },
 
+      // 预取会话最新的一页消息（例如鼠标悬停在会话上时），打开会话时可直接显示
+      prefetchSession: (sessionId: string) => {
+        const session = get().sessions.find(s => s.id === sessionId);
+        if (!session || session.messages.length > 0 || latestPageRequests.has(sessionId)) {
+          return;
+        }
+
+        loadLatestMessages(sessionId, session.messageCount)
+          .then(({ messages }) => {
+            set(state => {
+              const target = state.sessions.find(s => s.id === sessionId);
+              // 已被打开的会话由setCurrentSession写入
+              if (!target || target.messages.length > 0 || state.currentSession?.id === sessionId) {
+                return {};
+              }
+              recentSessionIds = [
+                ...recentSessionIds.filter(id => id !== sessionId).slice(0, MAX_SESSIONS_IN_MEMORY - 1),
+                sessionId
+              ];
+              const sessions = state.sessions.map(s => s.id === sessionId ? { ...s, messages } : s);
+              return { sessions: applyMessageWindows(sessions, state.currentSession?.id ?? null) };
+            });
+          })
+          .catch(error => logger.warn('⚠️ [chatStore] 预取会话消息失败:', error));
+      },
+
   // 发送消息
   sendMessage: async (content: string) => {
     const { currentSession } = get();
@@ -581,16 +683,53 @@ export const useChatStore = create<ChatState>()(
       error: null
     }));
 
-    try {
-      // 创建AI消息占位符
-      const aiMessage: ChatMessage = {
-        id: `msg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-        sessionId: currentSession.id,
-        role: 'assistant',
-        content: '',
-        timestamp: new Date()
-      };
+    // 创建AI消息占位符
+    const aiMessage: ChatMessage = {
+      id: `msg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+      sessionId: currentSession.id,
+      role: 'assistant',
+      content: '',
+      timestamp: new Date()
+    };
 
+    streamingSessionId = currentSession.id;
+
+    // 已提交到store的AI回复内容，每帧整体写入，切换会话后也不会丢失已接收的内容
+    let streamedContent = '';
+
+    // 数据块先进入缓冲区，每个动画帧最多提交一次，且只更新正在接收的这条消息
+    const streamBuffer = new StreamBuffer((messageId, appended) => {
+      streamedContent += appended;
+      set(state => {
+        if (state.currentSession?.id === currentSession.id) {
+          return {
+            currentSession: {
+              ...state.currentSession,
+              messages: replaceMessage(state.currentSession.messages, messageId, { content: streamedContent })
+            }
+          };
+        }
+        // 流式过程中用户切换了会话，只更新会话列表中的对应条目
+        return {
+          sessions: replaceSessionMessage(state.sessions, currentSession.id, messageId, { content: streamedContent })
+        };
+      });
+    });
+
+    // 流结束后把最终内容同步回会话列表
+    const commitStreamedMessage = (patch: Partial<ChatMessage>) => {
+      set(state => ({
+        sessions: replaceSessionMessage(state.sessions, currentSession.id, aiMessage.id, patch),
+        currentSession: state.currentSession?.id === currentSession.id
+          ? {
+              ...state.currentSession,
+              messages: replaceMessage(state.currentSession.messages, aiMessage.id, patch)
+            }
+          : state.currentSession
+      }));
+    };
+
+    try {
       // 添加AI消息占位符
       set(state => ({
         sessions: state.sessions.map(session =>
@@ -609,113 +748,59 @@ export const useChatStore = create<ChatState>()(
 
       // 获取所有消息用于AI对话（暂时不需要历史消息，直接使用单条消息）
       
-      console.log('🎯 [chatStore] 开始调用aiApi.chatStream');
+      logger.debug('🎯 [chatStore] 开始调用aiApi.chatStream');
+      streamBuffer.begin(aiMessage.id);
       
       // 使用流式响应
       await aiApi.chatStream(
         content, // 用户消息内容
         currentSession.id,
-        // onChunk - 处理流式数据
+        // onChunk - 处理流式数据，仅写入缓冲区
         (chunk: string) => {
-          console.log('📝 [chatStore] 收到AI chunk:', chunk.length, '字符');
-          set(state => {
-            // 使用当前state中的最新数据，而不是闭包变量
-            const currentSessionId = state.currentSession?.id;
-            if (!currentSessionId || !state.currentSession) {
-              console.warn('⚠️ [chatStore] 当前没有活动会话，跳过chunk更新');
-              return state;
-            }
-
-            // 找到最新的AI消息（最后一条消息且role为assistant）
-            const currentSessionMessages = state.currentSession.messages;
-            const lastMessage = currentSessionMessages[currentSessionMessages.length - 1];
-            
-            if (!lastMessage || lastMessage.role !== 'assistant') {
-              console.warn('⚠️ [chatStore] 找不到最新的AI消息，跳过chunk更新');
-              return state;
-            }
-
-            console.log('📝 [chatStore] 更新AI消息，当前长度:', lastMessage.content.length, '添加chunk:', chunk.length);
-            const normalizedChunk = normalizeMessageContent(chunk);
-
-            return {
-              sessions: state.sessions.map(session =>
-                session.id === currentSessionId
-                  ? {
-                      ...session,
-                      messages: session.messages.map(msg =>
-                        msg.id === lastMessage.id
-                          ? { ...msg, content: msg.content + normalizedChunk }
-                          : msg
-                      )
-                    }
-                  : session
-              ),
-              currentSession: {
-                ...state.currentSession,
-                messages: state.currentSession.messages.map(msg =>
-                  msg.id === lastMessage.id
-                    ? { ...msg, content: msg.content + normalizedChunk }
-                    : msg
-                )
-              },
-              isLoading: state.isLoading,
-              isStreaming: state.isStreaming,
-              error: state.error,
-              isInitialized: state.isInitialized,
-              createSession: state.createSession,
-              setCurrentSession: state.setCurrentSession,
-              sendMessage: state.sendMessage,
-              loadSessions: state.loadSessions,
-              deleteSession: state.deleteSession,
-              updateSessionTitle: state.updateSessionTitle,
-              clearError: state.clearError,
-              initialize: state.initialize,
-              switchUser: state.switchUser
-            };
-          });
+          streamBuffer.push(aiMessage.id, normalizeMessageContent(chunk));
         },
         // onComplete - 完成回调（后端已自动保存消息）
         async () => {
-          console.log('🎯 [chatStore] AI响应完成');
-          console.log('🎯 [chatStore] 后端已自动保存消息，前端无需手动保存');
+          const stats = streamBuffer.end(aiMessage.id);
+          commitStreamedMessage({ content: streamedContent });
+          if (stats && stats.chunksPerSecond > 0) {
+            metrics.observe(METRIC_NAMES.SSE_TOKENS_PER_SECOND, stats.chunksPerSecond);
+          }
+
+          logger.debug('🎯 [chatStore] AI响应完成', stats && {
+            chunks: stats.chunkCount,
+            flushes: stats.flushCount,
+            timeToFirstTokenMs: stats.timeToFirstTokenMs !== null ? Math.round(stats.timeToFirstTokenMs) : null,
+            chunksPerSecond: Math.round(stats.chunksPerSecond * 10) / 10
+          });
           
           // 仅更新前端状态，无需调用保存API
-          set({ isStreaming: false });
+          set({ isStreaming: false, lastStreamStats: stats });
+
+          // 写入本地缓存（只会重写最后一页消息）
+          try {
+            const finalState = get();
+            saveUserData(getCurrentUserId(), {
+              sessions: finalState.sessions,
+              currentSession: finalState.currentSession
+            });
+          } catch (saveError) {
+            logger.warn('⚠️ [chatStore] 保存用户数据失败:', saveError);
+          }
         },
         // onError - 错误处理
         (error: string) => {
-          console.error('AI响应错误:', error);
-          set(state => ({
-            sessions: state.sessions.map(session =>
-              session.id === currentSession.id
-                ? {
-                    ...session,
-                    messages: session.messages.map(msg =>
-                      msg.id === aiMessage.id
-                        ? { ...msg, content: '抱歉，AI服务暂时不可用，请稍后再试。' }
-                        : msg
-                    )
-                  }
-                : session
-            ),
-            currentSession: state.currentSession
-              ? {
-                  ...state.currentSession,
-                  messages: state.currentSession.messages.map(msg =>
-                    msg.id === aiMessage.id
-                      ? { ...msg, content: '抱歉，AI服务暂时不可用，请稍后再试。' }
-                      : msg
-                  )
-                }
-              : null
-          }));
+          logger.error('AI响应错误:', error);
+          const stats = streamBuffer.discard(aiMessage.id);
+          commitStreamedMessage({ content: '抱歉，AI服务暂时不可用，请稍后再试。' });
+          set({ lastStreamStats: stats });
         }
       );
 
       // 后端在流式响应的同时已自动保存消息，前端无需额外处理
 
     } catch (error) {
+      streamBuffer.discard(aiMessage.id);
       set({
         error: error instanceof Error ? error.message : 'AI对话失败',
         isStreaming: false
@@ -727,60 +812,36 @@ export const useChatStore = create<ChatState>()(
           session.id === currentSession.id
             ? {
                 ...session,
-                messages: session.messages.slice(0, -1)
+                messages: session.messages.filter(msg => msg.id !== aiMessage.id)
               }
             : session
         ),
         currentSession: state.currentSession
           ? {
               ...state.currentSession,
-              messages: state.currentSession.messages.slice(0, -1)
+              messages: state.currentSession.messages.filter(msg => msg.id !== aiMessage.id)
             }
           : null
       }));
     } finally {
+      if (streamingSessionId === currentSession.id) {
+        streamingSessionId = null;
+      }
       set({ isStreaming: false });
     }
   },
 
 
 
-  // 加载消息历史（简化实现）
-  loadMessages: async (sessionId: string, page: number = 1, pageSize: number = 50) => {
-    try {
-      // 这里可以从API加载消息，暂时返回当前会话的消息
-      const currentSession = get().currentSession;
-      if (currentSession && currentSession.id === sessionId) {
-        return currentSession.messages;
-      }
-      return [];
-    } catch (error) {
-      set({
-        error: error instanceof Error ? error.message : '加载消息失败'
-      });
-      return [];
-    }
-  },
-
-      // 加载会话列表
+      // 重新加载会话列表的第一页
       loadSessions: async () => {
         try {
           set({ isLoading: true, error: null });
-
-          const sessionsData = await chatHistoryService.getSessions({
-            page: 1,
-            pageSize: 20,
-            order: 'desc'
-          });
-
-          const sessions = sessionsData.list.map(convertBackendSession);
-
-          set({
-            sessions,
-            isLoading: false
-          });
+          sessionsPage = 0;
+          await get().loadMoreSessions();
+          set({ isLoading: false });
         } catch (error) {
-          console.error('加载会话列表失败:', error);
+          logger.error('加载会话列表失败:', error);
           set({
             error: error instanceof Error ? error.message : '加载会话失败',
             isLoading: false
@@ -788,95 +849,71 @@ export const useChatStore = create<ChatState>()(
         }
       },
 
-      // 分页加载会话列表
-      loadSessionsPaginated: async (page: number = 1, pageSize: number = 20) => {
-        try {
-          // 验证pageSize范围，确保符合后端API限制(1-20)
-          if (pageSize < 1 || pageSize > 20) {
-            console.warn('⚠️ [chatStore] pageSize超出范围(1-20)，使用默认值20:', pageSize);
-            pageSize = 20;
-          }
-          
-          // 如果是第一页，设置isLoading状态
-          if (page === 1) {
-            set({ isLoading: true, error: null });
-          }
+      // 增量加载下一页会话，合并到现有列表
+      loadMoreSessions: async () => {
+        const { isLoadingMoreSessions, sessionsHasMore } = get();
+        if (isLoadingMoreSessions || (sessionsPage > 0 && !sessionsHasMore)) {
+          return;
+        }
 
+        const page = sessionsPage + 1;
+        set({ isLoadingMoreSessions: true });
+
+        try {
           const sessionsData = await chatHistoryService.getSessions({
             page,
-            pageSize,
+            pageSize: SESSION_PAGE_SIZE,
             order: 'desc'
           });
-
-          const sessions = sessionsData.list.map(convertBackendSession);
+          const incoming = (sessionsData?.list || []).map(convertBackendSession);
+          const hasMore = page * SESSION_PAGE_SIZE < (sessionsData?.total || 0);
 
           if (page === 1) {
-            // 第一页，替换现有会话列表
-            set({
-              sessions,
-              isLoading: false
-            });
-          } else {
-            // 后续页，追加到现有会话列表
-            set(state => ({
-              sessions: [...state.sessions, ...sessions],
-              isLoading: false
-            }));
+            confirmedSessionIds.clear();
           }
-          
-          return {
-            sessions,
-            total: sessionsData.total,
-            hasMore: page * pageSize < sessionsData.total
-          };
-        } catch (error) {
-          console.error('加载会话列表失败:', error);
-          set({
-            error: error instanceof Error ? error.message : '加载会话失败',
-            isLoading: false
+          sessionsPage = page;
+
+          set(state => {
+            const sessions = mergeSessionPage(state.sessions, incoming, hasMore);
+            const currentId = state.currentSession?.id;
+            return {
+              sessions,
+              // 当前会话已被删除时清除
+              currentSession: currentId && sessions.some(s => s.id === currentId) ? state.currentSession : null,
+              sessionsHasMore: hasMore,
+              isLoadingMoreSessions: false
+            };
+          });
+          logger.debug(`✅ [chatStore] 会话列表第${page}页加载完成:`, incoming.length, '个');
+
+          const currentState = get();
+          saveUserData(getCurrentUserId(), {
+            sessions: currentState.sessions,
+            currentSession: currentState.currentSession
           });
+        } catch (error) {
+          set({ isLoadingMoreSessions: false });
           throw error;
         }
       },
 
-      // 加载更多消息
+      // 加载更早的消息 - 以当前最早的消息为游标，优先使用滚动时已预取的结果
       loadMoreMessages: async (sessionId: string) => {
-        try {
-          const state = get();
-          if (state.isLoadingMoreMessages || !state.messagesHasMore) {
-            console.log('🔄 [chatStore] 跳过加载更多消息:', { 
-              isLoading: state.isLoadingMoreMessages, 
-              hasMore: state.messagesHasMore 
-            });
-            return;
-          }
-
-          set({ isLoadingMoreMessages: true, error: null });
-          console.log('🔄 [chatStore] 加载更多消息，会话:', sessionId, '页码:', state.messagesCurrentPage + 1);
-
-          const nextPage = state.messagesCurrentPage + 1;
-          const sessionIdNum = parseInt(sessionId);
-          
-          // 确保pageSize符合后端API限制(1-20)
-          const safePageSize = 20;
+        const state = get();
+        const session = state.currentSession;
+        if (!session || session.id !== sessionId || state.isLoadingMoreMessages || !state.messagesHasMore) {
+          return;
+        }
 
-          const messagesData = await chatHistoryService.getMessages(sessionIdNum, {
-            page: nextPage,
-            pageSize: safePageSize,
-            order: 'asc'
-          });
+        set({ isLoadingMoreMessages: true, error: null });
 
-          if (!messagesData || !messagesData.list) {
-            console.warn('⚠️ [chatStore] 加载更多消息失败：响应为空');
-            set({ isLoadingMoreMessages: false });
-            return;
-          }
-
-          const newMessages = messagesData.list.map((msg: BackendChatMessage) => 
-            convertBackendMessage(msg, sessionId)
-          );
+        try {
+          const page = await fetchOlderPage(sessionId, session.messages);
+          olderPageRequests.delete(sessionId);
+          messageHasMore.set(sessionId, page.hasMore);
 
-          console.log('✅ [chatStore] 成功加载更多消息:', newMessages.length, '条');
+          const olderMessages = page.list.map((msg: BackendChatMessage) => convertBackendMessage(msg, sessionId));
+          logger.debug('✅ [chatStore] 成功加载更早的消息:', olderMessages.length, '条');
 
           set(state => {
             const currentSession = state.currentSession;
@@ -884,18 +921,18 @@ export const useChatStore = create<ChatState>()(
               return { isLoadingMoreMessages: false };
             }
 
+            const known = new Set(currentSession.messages.map(m => m.id));
             const updatedSession = {
               ...currentSession,
-              // 将新消息插入到开头（因为是历史消息）
-              messages: [...newMessages, ...currentSession.messages]
+              // 历史消息插入到开头
+              messages: [...olderMessages.filter(m => !known.has(m.id)), ...currentSession.messages]
             };
 
             return {
               currentSession: updatedSession,
               sessions: state.sessions.map(s => s.id === sessionId ? updatedSession : s),
               isLoadingMoreMessages: false,
-              messagesCurrentPage: nextPage,
-              messagesHasMore: newMessages.length >= safePageSize || (nextPage * safePageSize) < messagesData.total
+              messagesHasMore: page.hasMore
             };
           });
 
@@ -907,17 +944,28 @@ export const useChatStore = create<ChatState>()(
               currentSession: currentState.currentSession
             });
           } catch (saveError) {
-            console.warn('⚠️ [chatStore] 保存用户数据失败:', saveError);
+            logger.warn('⚠️ [chatStore] 保存用户数据失败:', saveError);
           }
 
         } catch (error) {
-          console.error('❌ [chatStore] 加载更多消息失败:', error);
+          logger.error('❌ [chatStore] 加载更多消息失败:', error);
           set({ 
             isLoadingMoreMessages: false, 
             error: error instanceof Error ? error.message : '加载更多消息失败' 
           });
         }
       },
+
+      // 预取更早的一页消息，用户继续向上滚动时loadMoreMessages直接使用结果
+      prefetchOlderMessages: (sessionId: string) => {
+        const { currentSession, messagesHasMore } = get();
+        if (!currentSession || currentSession.id !== sessionId || !messagesHasMore) {
+          return;
+        }
+        fetchOlderPage(sessionId, currentSession.messages).catch(error => {
+          logger.warn('⚠️ [chatStore] 预取历史消息失败:', error);
+        });
+      },
       
       // 删除会话
       deleteSession: async (sessionId: string) => {
@@ -925,6 +973,10 @@ export const useChatStore = create<ChatState>()(
           set({ isLoading: true, error: null });
 
           await chatHistoryService.deleteSession(parseInt(sessionId));
+          messageHasMore.delete(sessionId);
+          olderPageRequests.delete(sessionId);
+          confirmedSessionIds.delete(sessionId);
+          recentSessionIds = recentSessionIds.filter(id => id !== sessionId);
 
           const newState = {
             sessions: get().sessions.filter(s => s.id !== sessionId),
@@ -937,9 +989,13 @@ export const useChatStore = create<ChatState>()(
           });
 
           // 保存用户数据
-          saveUserData(getCurrentUserId(), newState);
+          const userId = getCurrentUserId();
+          chatStorage.deleteSession(userId, sessionId).catch(error => {
+            logger.warn('⚠️ [chatStore] 删除本地会话缓存失败:', error);
+          });
+          saveUserData(userId, newState);
         } catch (error) {
-          console.error('删除会话失败:', error);
+          logger.error('删除会话失败:', error);
           set({
             error: error instanceof Error ? error.message : '删除会话失败',
             isLoading: false
@@ -977,7 +1033,7 @@ export const useChatStore = create<ChatState>()(
           // 保存用户数据
           saveUserData(getCurrentUserId(), newState);
         } catch (error) {
-          console.error('更新会话标题失败:', error);
+          logger.error('更新会话标题失败:', error);
           set({
             error: error instanceof Error ? error.message : '更新会话失败',
             isLoading: false
@@ -1004,31 +1060,24 @@ export const useChatStore = create<ChatState>()(
                 currentSession: currentState.currentSession
               });
             } catch (error) {
-              console.warn('保存当前用户数据失败，可能是因为用户未登录:', error);
+              logger.warn('保存当前用户数据失败，可能是因为用户未登录:', error);
             }
           }
 
           // 加载新用户的数据
-          const userData = loadUserData(userId);
-          set({
-            sessions: userData.sessions || [],
-            currentSession: userData.currentSession || null,
-            error: null
+          resetPagingState();
+          set({ sessions: [], currentSession: null, error: null, messagesHasMore: false, sessionsHasMore: false });
+          loadUserData(userId).then(userData => {
+            set({
+              sessions: userData.sessions || [],
+              currentSession: userData.currentSession || null
+            });
+            logger.debug(`已切换到用户 ${userId} 的聊天数据`);
           });
-
-          console.log(`已切换到用户 ${userId} 的聊天数据`);
         } catch (error) {
-          console.error('用户切换失败:', error);
+          logger.error('用户切换失败:', error);
           set({ error: '用户切换失败' });
         }
       }
-    }),
-    {
-      name: 'chat-store-global',
-      // 不保存isInitialized状态，每次刷新都重新初始化以确保数据加载
-      partialize: (state) => ({
-        // 不持久化任何状态，让每次刷新都重新初始化
-      })
-    }
-  )
+    }))
 );
@@ -1,7 +1,9 @@
 // 用户建议状态管理
 import { create } from 'zustand';
+import { instrumentStore } from './instrumentStore';
 import { UserFeedback, FeedbackFormData, FeedbackFilters, FeedbackStats } from '../types/feedback';
 import { apiService } from '../services/api';
+import { logger } from '../services/logger';
 
 interface FeedbackState {
   feedbacks: UserFeedback[];
@@ -32,7 +34,7 @@ interface FeedbackState {
   clearFilters: () => void;
 }
 
-export const useFeedbackStore = create<FeedbackState>((set, get) => ({
+export const useFeedbackStore = create<FeedbackState>()(instrumentStore('feedback', (set, get) => ({
   // 初始状态
   feedbacks: [],
   filteredFeedbacks: [],
@@ -124,7 +126,7 @@ export const useFeedbackStore = create<FeedbackState>((set, get) => ({
   // 反馈投票（占位符 - 如果后端支持则实现）
   voteFeedback: async (id, type) => {
     // TODO: 如果后端支持投票则实现
-    console.log(`Vote ${type} for feedback ${id}`);
+    logger.debug(`Vote ${type} for feedback ${id}`);
   },
 
   // 获取统计数据
@@ -205,4 +207,4 @@ export const useFeedbackStore = create<FeedbackState>((set, get) => ({
     set({ filters: {} });
     get().applyFilters();
   }
-}));
\ No newline at end of file
+})));
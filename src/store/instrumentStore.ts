@@ -0,0 +1,37 @@
+// store埋点中间件 - 统计每个store的set()调用次数，用于发现高频更新
+import type { StateCreator, StoreMutatorIdentifier } from 'zustand';
+import { metrics, METRIC_NAMES } from '../services/metrics';
+
+type InstrumentStore = <
+  T,
+  Mps extends [StoreMutatorIdentifier, unknown][] = [],
+  Mcs extends [StoreMutatorIdentifier, unknown][] = []
+>(
+  name: string,
+  initializer: StateCreator<T, Mps, Mcs>
+) => StateCreator<T, Mps, Mcs>;
+
+type InstrumentStoreImpl = <T>(name: string, initializer: StateCreator<T, [], []>) => StateCreator<T, [], []>;
+
+const instrumentStoreImpl: InstrumentStoreImpl = (name, initializer) => (set, get, api) => {
+  // 未开启采集时不包装，不增加任何开销
+  if (!metrics.isEnabled()) {
+    return initializer(set, get, api);
+  }
+
+  const countedSet: typeof set = (...args) => {
+    metrics.increment(METRIC_NAMES.STORE_SET, name);
+    return set(...(args as Parameters<typeof set>));
+  };
+
+  // 组件外直接调用 useXxxStore.setState 也计入
+  const setState = api.setState;
+  api.setState = (...args) => {
+    metrics.increment(METRIC_NAMES.STORE_SET, name);
+    return setState(...(args as Parameters<typeof setState>));
+  };
+
+  return initializer(countedSet, get, api);
+};
+
+export const instrumentStore = instrumentStoreImpl as unknown as InstrumentStore;
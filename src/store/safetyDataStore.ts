@@ -1,11 +1,54 @@
 // 安全数据状态管理
 import { create } from 'zustand';
+import { instrumentStore } from './instrumentStore';
 import { SafetyData, SafetyLevel, MineType, SafetyCategory, UploadSafetyDataRequest } from '../types/safety';
 import { apiService } from '../services/api';
+import type { PaginatedResponse, DashboardStats } from '../services/api';
+import { logger } from '../services/logger';
+
+// 将一条资料的增删改折算到统计计数上：removed为变更前的记录，added为变更后的记录
+const applyStatsDelta = (stats: DashboardStats, removed?: SafetyData, added?: SafetyData): DashboardStats => {
+  const next: DashboardStats = {
+    ...stats,
+    safetyLevelCounts: { ...stats.safetyLevelCounts },
+    mineTypeCounts: { ...stats.mineTypeCounts },
+    categoryCounts: { ...stats.categoryCounts }
+  };
+  const adjust = <K extends string>(counts: Record<K, number>, key: K, delta: number) => {
+    counts[key] = Math.max(0, (counts[key] || 0) + delta);
+  };
+  const apply = (item: SafetyData, delta: number) => {
+    adjust(next.safetyLevelCounts, item.safetyLevel, delta);
+    adjust(next.mineTypeCounts, item.mineType, delta);
+    adjust(next.categoryCounts, item.category, delta);
+  };
+
+  if (removed) apply(removed, -1);
+  if (added) apply(added, 1);
+  if (removed && !added) {
+    next.totalItems = Math.max(0, next.totalItems - 1);
+  } else if (added && !removed) {
+    next.totalItems += 1;
+    if (next.recentActivity) {
+      next.recentActivity = {
+        ...next.recentActivity,
+        newItemsThisWeek: next.recentActivity.newItemsThisWeek + 1
+      };
+    }
+  }
+  return next;
+};
+
+// 统计数据的本地修正次数，请求期间发生过修正时返回的结果可能已过时
+let statsVersion = 0;
+
+// 最近一次列表请求的参数，后台刷新返回时用于判断结果是否仍然对应当前页
+let lastListQuery = '';
 
 interface SafetyDataState {
   data: SafetyData[];
-  filteredData: SafetyData[];
+  stats: DashboardStats | null;
+  statsLoading: boolean;
   loading: boolean;
   error: string | null;
   searchTerm: string;
@@ -27,21 +70,23 @@ interface SafetyDataState {
   setSearchTerm: (term: string) => void;
   setFilters: (filters: Partial<SafetyDataState['filters']>) => void;
   setPagination: (pagination: Partial<SafetyDataState['pagination']>) => void;
-  applyFilters: () => void;
   clearFilters: () => void;
   
   // 数据管理操作
-  fetchData: (params?: any) => Promise<void>;
+  fetchData: (params?: any, options?: { force?: boolean }) => Promise<void>;
   fetchDataById: (id: string) => Promise<SafetyData | null>;
+  fetchStats: (options?: { force?: boolean }) => Promise<void>;
+  applyStatsChange: (removed?: SafetyData, added?: SafetyData) => void;
   addData: (newData: UploadSafetyDataRequest | Omit<SafetyData, 'id'>) => Promise<void>;
   updateData: (id: string, updatedData: Partial<SafetyData>) => Promise<void>;
   deleteData: (id: string) => Promise<void>;
 }
 
-export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
+export const useSafetyDataStore = create<SafetyDataState>()(instrumentStore('safetyData', (set, get) => ({
   // 初始状态
   data: [],
-  filteredData: [],
+  stats: null,
+  statsLoading: false,
   loading: false,
   error: null,
   searchTerm: '',
@@ -56,20 +101,24 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
   setData: (data) => set({ data }),
   setLoading: (loading) => set({ loading }),
   setError: (error) => set({ error }),
+  // 关键词和分面过滤由后端在全部数据上完成，条件变化后从第一页重新查询
   setSearchTerm: (searchTerm) => {
-    set({ searchTerm });
-    get().applyFilters();
+    set(state => ({ searchTerm, pagination: { ...state.pagination, current: 1 } }));
+    get().fetchData();
   },
   setFilters: (filters) => {
-    set(state => ({ filters: { ...state.filters, ...filters } }));
-    get().applyFilters();
+    set(state => ({
+      filters: { ...state.filters, ...filters },
+      pagination: { ...state.pagination, current: 1 }
+    }));
+    get().fetchData();
   },
   setPagination: (pagination) => set(state => ({
     pagination: { ...state.pagination, ...pagination }
   })),
 
-  // 从真实API获取数据
-  fetchData: async (params = {}) => {
+  // 从真实API获取数据 - 相同参数的请求由缓存层合并，缓存未过期时不访问后端
+  fetchData: async (params = {}, options = {}) => {
     set({ loading: true, error: null });
     
     try {
@@ -85,30 +134,45 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
         ...params
       };
       
-      console.log('🔄 获取安全资料数据，查询参数:', queryParams);
-      const response = await apiService.getSafetyData(queryParams);
-      console.log('✅ 获取到安全资料数据:', {
+      const queryKey = JSON.stringify(queryParams);
+      lastListQuery = queryKey;
+
+      const applyPage = (response: PaginatedResponse<SafetyData>) => {
+        set({
+          data: response.list || [],
+          pagination: {
+            current: response.page,
+            pageSize: response.pageSize,
+            total: response.total
+          },
+          loading: false
+        });
+      };
+
+      logger.debug('🔄 获取安全资料数据，查询参数:', queryParams);
+      const response = await apiService.getSafetyData(queryParams, {
+        force: options.force,
+        // 返回的是过期缓存时，后台刷新完成后再更新一次
+        onRevalidated: (fresh) => {
+          if (lastListQuery === queryKey) {
+            applyPage(fresh);
+          }
+        }
+      });
+      // 连续修改查询条件时只采用最后一次请求的结果
+      if (lastListQuery !== queryKey) {
+        return;
+      }
+      logger.debug('✅ 获取到安全资料数据:', {
         total: response.total,
         listLength: response.list?.length || 0,
-        currentPage: response.page,
-        hasToken: !!localStorage.getItem('auth_token')
+        currentPage: response.page
       });
       
-      set({
-        data: response.list || [],
-        pagination: {
-          current: response.page,
-          pageSize: response.pageSize,
-          total: response.total
-        },
-        loading: false
-      });
-      
-      // 应用过滤器设置filteredData
-      get().applyFilters();
+      applyPage(response);
       
     } catch (error) {
-      console.error('❌ 获取安全资料数据失败:', {
+      logger.error('❌ 获取安全资料数据失败:', {
         error: error,
         hasToken: !!localStorage.getItem('auth_token'),
         params: params
@@ -120,11 +184,16 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
     }
   },
 
-  // 根据ID获取单个项目
+  // 根据ID获取单个项目 - 优先使用已加载的列表数据
   fetchDataById: async (id: string) => {
+    const numericId = parseInt(id, 10);
+    const localItem = get().data.find(item => item.id === numericId);
+    if (localItem) {
+      return localItem;
+    }
+
     try {
       set({ loading: true, error: null });
-      const numericId = parseInt(id, 10);
       const data = await apiService.getSafetyDataById(numericId);
       set({ loading: false });
       return data;
@@ -137,23 +206,80 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
     }
   },
 
+  // 获取统计汇总 - 由后端聚合并按TTL缓存，与当前加载的分页无关
+  fetchStats: async (options = {}) => {
+    const version = statsVersion;
+    set({ statsLoading: true });
+
+    try {
+      const stats = await apiService.getDashboardStats({
+        force: options.force,
+        onRevalidated: (fresh) => {
+          if (version === statsVersion) {
+            set({ stats: fresh });
+          }
+        }
+      });
+
+      if (version !== statsVersion) {
+        // 请求期间有增删改，返回的计数可能不包含这些变更，重新获取
+        logger.debug('🔄 统计数据在请求期间发生变化，重新获取');
+        return get().fetchStats({ force: true });
+      }
+      set({ stats, statsLoading: false });
+    } catch (error) {
+      logger.error('❌ 获取统计数据失败:', error);
+      set({ statsLoading: false });
+    }
+  },
+
+  // 将增删改折算到统计计数上，同时修正缓存，避免重新获取统计数据
+  applyStatsChange: (removed, added) => {
+    statsVersion++;
+    apiService.patchDashboardStats(stats => applyStatsDelta(stats, removed, added));
+    const { stats } = get();
+    if (stats) {
+      set({ stats: applyStatsDelta(stats, removed, added) });
+    }
+  },
+
   // 通过API添加新数据
   addData: async (newData) => {
     set({ loading: true, error: null });
     
     try {
-      console.log('🔄 开始添加安全资料:', newData);
-      await apiService.createSafetyData(newData);
-      console.log('✅ 安全资料添加成功，开始刷新数据');
+      logger.debug('🔄 开始添加安全资料:', newData);
+      const created = await apiService.createSafetyData(newData);
+      logger.debug('✅ 安全资料添加成功');
       
-      // 添加后刷新数据
-      await get().fetchData();
-      console.log('✅ 数据刷新完成');
-      
-      set({ loading: false });
+      if (created && typeof created.id === 'number') {
+        get().applyStatsChange(undefined, created);
+
+        // 后端返回了完整数据，新记录排在第一页最前面：当前在第一页时直接插入，无需重新获取整页
+        const { pagination } = get();
+        if (pagination.current === 1) {
+          const data = [created, ...get().data.filter(item => item.id !== created.id)];
+          set(state => ({
+            data: data.slice(0, pagination.pageSize),
+            pagination: { ...state.pagination, total: state.pagination.total + 1 },
+            loading: false
+          }));
+        } else {
+          // 其他页的内容整体后移一条，只更新总数，翻页时再从后端获取
+          set(state => ({
+            pagination: { ...state.pagination, total: state.pagination.total + 1 },
+            loading: false
+          }));
+        }
+      } else {
+        // 后端未返回新数据时才重新获取，列表缓存已在写入时失效
+        statsVersion++;
+        await Promise.all([get().fetchData(), get().fetchStats({ force: true })]);
+        set({ loading: false });
+      }
       
     } catch (error) {
-      console.error('❌ 添加安全资料失败:', error);
+      logger.error('❌ 添加安全资料失败:', error);
       set({
         error: error instanceof Error ? error.message : '添加安全资料失败',
         loading: false
@@ -184,7 +310,7 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
         id: numericId // 确保ID不变
       };
       
-      console.log('🔄 更新安全资料:', {
+      logger.debug('🔄 更新安全资料:', {
         id: numericId,
         updatedFields: Object.keys(updatedData),
         hasTitle: !!fullData.title,
@@ -192,14 +318,17 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
       });
       
       await apiService.updateSafetyData(fullData);
-      console.log('✅ 安全资料更新成功');
+      logger.debug('✅ 安全资料更新成功');
+      get().applyStatsChange(currentData, fullData);
       
-      // 更新后刷新数据
-      await get().fetchData();
-      set({ loading: false });
+      // 原位替换本地数据，无需重新获取整页
+      set(state => ({
+        data: state.data.map(item => (item.id === numericId ? fullData : item)),
+        loading: false
+      }));
       
     } catch (error) {
-      console.error('❌ 更新安全资料失败:', error);
+      logger.error('❌ 更新安全资料失败:', error);
       set({
         error: error instanceof Error ? error.message : '更新安全资料失败',
         loading: false
@@ -218,6 +347,14 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
       
       // 立即从本地状态中移除
       const { data } = get();
+      const removed = data.find(item => item.id === numericId);
+      if (removed) {
+        get().applyStatsChange(removed);
+      } else {
+        // 不在当前页的记录无法得知其分类，重新获取统计
+        statsVersion++;
+        get().fetchStats({ force: true });
+      }
       const updatedData = data.filter(item => item.id !== numericId);
       
       set({
@@ -225,9 +362,6 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
         loading: false
       });
       
-      // 应用过滤器更新filteredData
-      get().applyFilters();
-      
     } catch (error) {
       set({
         error: error instanceof Error ? error.message : '删除安全资料失败',
@@ -236,44 +370,13 @@ export const useSafetyDataStore = create<SafetyDataState>((set, get) => ({
     }
   },
 
-  // 应用过滤器和搜索
-  applyFilters: () => {
-    const { data, filters, searchTerm } = get();
-    let filtered = [...data];
-
-    // 应用搜索关键词
-    if (searchTerm) {
-      const term = searchTerm.toLowerCase();
-      filtered = filtered.filter(item =>
-        item.title.toLowerCase().includes(term) ||
-        item.description.toLowerCase().includes(term)
-      );
-    }
-
-    // 应用安全等级过滤器
-    if (filters.safetyLevel) {
-      filtered = filtered.filter(item => item.safetyLevel === filters.safetyLevel);
-    }
-
-    // 应用矿区类型过滤器
-    if (filters.mineType) {
-      filtered = filtered.filter(item => item.mineType === filters.mineType);
-    }
-
-    // 应用类别过滤器
-    if (filters.category) {
-      filtered = filtered.filter(item => item.category === filters.category);
-    }
-
-    set({ filteredData: filtered });
-  },
-
   // 清除所有过滤器
   clearFilters: () => {
-    set({
+    set(state => ({
       searchTerm: '',
-      filters: {}
-    });
-    get().applyFilters();
+      filters: {},
+      pagination: { ...state.pagination, current: 1 }
+    }));
+    get().fetchData();
   }
-}));
\ No newline at end of file
+})));
@@ -0,0 +1,181 @@
+// 聊天记录存储性能对比脚本
+// 对比旧版localStorage整库JSON与IndexedDB分页存储在100会话×200消息下的启动耗时
+
+import { ChatStorage } from './services/chatStorage';
+import { ChatMessage, ChatSession } from './types/ai';
+
+// 测试配置
+const SESSION_COUNT = 100;
+const MESSAGES_PER_SESSION = 200;
+const BENCHMARK_USER_ID = -1; // 使用负数ID，避免与真实用户数据冲突
+const LEGACY_KEY = 'chat-store-benchmark-legacy';
+
+interface BenchmarkResult {
+  name: string;
+  legacyMs: number | null;
+  indexedDBMs: number | null;
+  note: string;
+}
+
+const SAMPLE_CONTENT = '根据《煤矿安全规程》，采掘工作面风流中瓦斯浓度达到1.0%时必须停止用电钻打眼；' +
+  '爆破地点附近20m以内风流中瓦斯浓度达到1.0%时严禁爆破。请定期校验便携式甲烷检测报警仪。';
+
+class ChatStorageBenchmark {
+  private results: BenchmarkResult[] = [];
+
+  private addResult(result: BenchmarkResult) {
+    this.results.push(result);
+    const format = (ms: number | null) => (ms === null ? '-' : `${ms.toFixed(1)}ms`);
+    console.log(`⏱️ ${result.name}: localStorage ${format(result.legacyMs)} / IndexedDB ${format(result.indexedDBMs)} ${result.note}`);
+  }
+
+  // 生成测试数据
+  private generateSessions(): ChatSession[] {
+    const baseTime = Date.now() - SESSION_COUNT * 3600 * 1000;
+
+    return Array.from<unknown, ChatSession>({ length: SESSION_COUNT }, (_, sessionIndex) => {
+      const sessionId = `${100000 + sessionIndex}`;
+      const messages = Array.from<unknown, ChatMessage>({ length: MESSAGES_PER_SESSION }, (_, messageIndex) => ({
+        id: `${sessionId}_${messageIndex}`,
+        sessionId,
+        role: messageIndex % 2 === 0 ? 'user' : 'assistant',
+        content: `${messageIndex}. ${SAMPLE_CONTENT}`,
+        timestamp: new Date(baseTime + sessionIndex * 3600 * 1000 + messageIndex * 1000)
+      }));
+
+      return {
+        id: sessionId,
+        userId: BENCHMARK_USER_ID,
+        title: `测试会话 ${sessionIndex + 1}`,
+        status: 'active',
+        messageCount: MESSAGES_PER_SESSION,
+        totalTokens: 0,
+        createdAt: new Date(baseTime + sessionIndex * 3600 * 1000),
+        updatedAt: new Date(baseTime + sessionIndex * 3600 * 1000),
+        messages
+      };
+    });
+  }
+
+  // 旧版启动流程：读取整库JSON并为每条消息重建Date对象
+  private legacyStartup(serialized: string): void {
+    const data = JSON.parse(serialized);
+    data.sessions = data.sessions.map((session: any) => ({
+      ...session,
+      createdAt: new Date(session.createdAt),
+      updatedAt: new Date(session.updatedAt),
+      messages: session.messages?.map((msg: any) => ({
+        ...msg,
+        timestamp: new Date(msg.timestamp)
+      })) || []
+    }));
+  }
+
+  async runAllTests(): Promise<BenchmarkResult[]> {
+    this.results = [];
+    console.log(`🚀 开始聊天存储性能测试（${SESSION_COUNT}会话 × ${MESSAGES_PER_SESSION}消息）`);
+
+    const sessions = this.generateSessions();
+    const currentSession = sessions[sessions.length - 1];
+
+    // 1. 完整写入
+    let start = performance.now();
+    const serialized = JSON.stringify({ sessions, currentSession });
+    let legacyWriteMs: number | null = null;
+    let legacyNote = `JSON大小 ${(serialized.length / 1024 / 1024).toFixed(2)}M字符`;
+    try {
+      localStorage.setItem(LEGACY_KEY, serialized);
+      legacyWriteMs = performance.now() - start;
+    } catch (error) {
+      legacyNote += '，localStorage写入失败（超出配额）';
+    }
+
+    const writer = new ChatStorage();
+    start = performance.now();
+    writer.saveSessions(BENCHMARK_USER_ID, sessions, currentSession.id);
+    await writer.flush();
+    this.addResult({
+      name: '首次完整写入',
+      legacyMs: legacyWriteMs,
+      indexedDBMs: performance.now() - start,
+      note: legacyNote
+    });
+
+    // 2. 启动加载：旧版需要解析全部数据，新版只加载会话列表和当前会话的消息
+    start = performance.now();
+    const stored = legacyWriteMs !== null ? localStorage.getItem(LEGACY_KEY) : null;
+    this.legacyStartup(stored || serialized);
+    const legacyStartupMs = performance.now() - start;
+
+    const reader = new ChatStorage();
+    start = performance.now();
+    const loaded = await reader.loadSessions(BENCHMARK_USER_ID);
+    const currentMessages = loaded.currentSessionId
+      ? await reader.loadMessages(BENCHMARK_USER_ID, loaded.currentSessionId)
+      : null;
+    this.addResult({
+      name: '启动加载',
+      legacyMs: legacyStartupMs,
+      indexedDBMs: performance.now() - start,
+      note: `IndexedDB加载会话 ${loaded.sessions.length} 个，当前会话消息 ${currentMessages?.length || 0} 条`
+    });
+
+    // 3. 增量写入：当前会话追加一条消息
+    const appended: ChatSession = {
+      ...currentSession,
+      messages: [
+        ...(currentMessages || currentSession.messages),
+        {
+          id: `${currentSession.id}_appended`,
+          sessionId: currentSession.id,
+          role: 'assistant',
+          content: SAMPLE_CONTENT,
+          timestamp: new Date()
+        }
+      ],
+      updatedAt: new Date()
+    };
+    const updatedSessions = loaded.sessions.map(s => (s.id === appended.id ? appended : s));
+
+    start = performance.now();
+    let legacyAppendMs: number | null = null;
+    try {
+      localStorage.setItem(LEGACY_KEY, JSON.stringify({
+        sessions: sessions.map(s => (s.id === appended.id ? appended : s)),
+        currentSession: appended
+      }));
+      legacyAppendMs = performance.now() - start;
+    } catch {
+      legacyAppendMs = null;
+    }
+
+    start = performance.now();
+    reader.saveSessions(BENCHMARK_USER_ID, updatedSessions, appended.id);
+    await reader.flush();
+    this.addResult({
+      name: '追加一条消息',
+      legacyMs: legacyAppendMs,
+      indexedDBMs: performance.now() - start,
+      note: 'IndexedDB只重写最后一页消息'
+    });
+
+    // 清理测试数据
+    localStorage.removeItem(LEGACY_KEY);
+    await reader.clearUser(BENCHMARK_USER_ID);
+
+    console.table(this.results);
+    return this.results;
+  }
+}
+
+// 导出测试器
+export const chatStorageBenchmark = new ChatStorageBenchmark();
+
+// 在浏览器控制台中可以直接调用
+if (typeof window !== 'undefined') {
+  (window as any).runChatStorageBenchmark = () => {
+    return chatStorageBenchmark.runAllTests();
+  };
+
+  console.log('聊天存储性能测试已准备就绪。在浏览器控制台运行 await runChatStorageBenchmark() 开始测试。');
+}